@@ -0,0 +1,160 @@
+# Seeded synthetic corpus for the benchmark suite (benchmarks/run.py).
+#
+# Produces form payloads (what main.py / the Save button build, including the
+# empty fields clean_json strips), JDs, generated resumes and raw model
+# output, from small to very large. The same seed and size always give the
+# same corpus, so timings are comparable across runs and machines.
+#
+#   from corpus import make_corpus
+#   case = make_corpus("large", seed=7)   # payload, jd, resume, raw
+
+import json
+import random
+
+# roles / bullets per role / projects / JD words
+SIZES = {
+    "small": {"roles": 1, "bullets": 2, "projects": 2, "jd_words": 120},
+    "medium": {"roles": 4, "bullets": 4, "projects": 3, "jd_words": 400},
+    "large": {"roles": 12, "bullets": 8, "projects": 8, "jd_words": 1500},
+    "xlarge": {"roles": 40, "bullets": 12, "projects": 24, "jd_words": 6000},
+}
+
+SKILLS = [
+    "Python", "Java", "Go", "Rust", "C++", "SQL", "PostgreSQL", "Redis", "Kafka", "Docker",
+    "Kubernetes", "AWS", "GCP", "Terraform", "PyTorch", "TensorFlow", "scikit-learn", "NLP",
+    "Computer Vision", "React", "TypeScript", "FastAPI", "Django", "Spark", "Airflow", "LangChain",
+    "RAG", "Statistics", "Linux", "GraphQL", "gRPC", "Elasticsearch", "Snowflake", "MLflow", "CUDA",
+]
+CATEGORIES = ["Machine Learning", "Languages", "Cloud", "Data Engineering", "Web", "Tools"]
+COURSES = ["Data Structures", "DBMS", "Operating Systems", "Computer Networks", "Deep Learning", "Statistics", "Compilers"]
+ROLES = ["Software Engineer", "ML Engineer", "Data Scientist", "Backend Developer", "Intern", "DevOps Engineer"]
+COMPANIES = ["Averybit", "Northwind", "Globex", "Initech", "Umbrella Labs", "Hooli", "Stark Analytics"]
+VERBS = ["Built", "Designed", "Deployed", "Optimized", "Automated", "Migrated", "Trained", "Engineered", "Scaled", "Reduced"]
+OBJECTS = ["retrieval service", "feature pipeline", "billing API", "recommendation model", "CI workflow", "data warehouse"]
+FILLER = [
+    "collaborate", "with", "cross-functional", "teams", "to", "deliver", "reliable", "systems", "at", "scale",
+    "ownership", "of", "production", "services", "and", "mentoring", "engineers", "in", "a", "fast-paced", "environment",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+def _date(rng):
+    return f"{rng.choice(MONTHS)} {rng.randint(2015, 2025)}"
+
+
+def _sentence(rng, bold=True):
+    skill = rng.choice(SKILLS)
+    metric = f"{rng.randint(5, 60)}%"
+    if bold:
+        skill, metric = f"**{skill}**", f"**{metric} latency**"
+    return (
+        f"{rng.choice(VERBS)} a {skill} {rng.choice(OBJECTS)} serving {rng.randint(2, 500)}k users, "
+        f"cutting {metric} across {rng.randint(2, 40)} services."
+    )
+
+
+# ================= FORM PAYLOAD =================
+def make_payload(rng, size):
+    spec = SIZES[size]
+    return {
+        "contacts": {
+            "f_name": "Bench",
+            "m_name": "",
+            "l_name": f"Candidate{rng.randint(1, 9999)}",
+            "email": "bench@example.com",
+            "phone": "+91 98254 70580",
+            "linked_in": "linkedin.com/in/bench",
+            "github": "",
+        },
+        "education": [
+            {"degree": "Bachelor's", "institute": "Medicaps University", "start": _date(rng), "end": _date(rng)},
+            {"degree": "", "institute": "", "start": None, "end": None},
+        ],
+        "experience": [
+            {
+                "company": rng.choice(COMPANIES),
+                "role": rng.choice(ROLES),
+                "start": _date(rng),
+                "end": "Present" if i == 0 else _date(rng),
+                "desc": " ".join(_sentence(rng, bold=False) for _ in range(spec["bullets"])),
+            }
+            for i in range(spec["roles"])
+        ],
+        "projects": [
+            {
+                "name": f"{rng.choice(OBJECTS).title()} {i}",
+                "url": "" if i % 2 else f"github.com/bench/project-{i}",
+                "mem": "" if i % 3 else str(rng.randint(1, 6)),
+                "desc": " ".join(_sentence(rng, bold=False) for _ in range(2)),
+            }
+            for i in range(spec["projects"])
+        ],
+        "skills": rng.sample(SKILLS, min(len(SKILLS), 5 + spec["roles"])),
+        "coursework": rng.sample(COURSES, 5),
+    }
+
+
+def make_jd(rng, size):
+    words = SIZES[size]["jd_words"]
+    description = []
+    while len(description) < words:
+        description += rng.sample(FILLER, 8) + [rng.choice(SKILLS) + "."]
+    return {
+        "job_title": rng.choice(ROLES),
+        "description": " ".join(description[:words]),
+        "skills_required": ", ".join(rng.sample(SKILLS, 8)),
+    }
+
+
+# ================= MODEL SIDE =================
+def make_resume(rng, size):
+    # A generated resume in the response schema (what the renderers take)
+    spec = SIZES[size]
+    return {
+        "header": {
+            "name": "Bench Candidate",
+            "phone": "+91 98254 70580",
+            "email": "bench@example.com",
+            "linkedin": "linkedin.com/in/bench",
+            "github": "github.com/bench",
+        },
+        "summary": " ".join(_sentence(rng) for _ in range(4)),
+        "education": [
+            {"degree": "Bachelor's", "institution": "Medicaps University", "grade": "8.4 CGPA",
+             "duration": f"{_date(rng)} – {_date(rng)}"}
+        ],
+        "experience": [
+            {
+                "role": rng.choice(ROLES),
+                "company": rng.choice(COMPANIES),
+                "duration": f"{_date(rng)} – Present",
+                "bullets": [_sentence(rng) for _ in range(spec["bullets"])],
+            }
+            for _ in range(spec["roles"])
+        ],
+        "projects": [
+            {"title": f"{rng.choice(OBJECTS).title()} {i}", "bullets": [_sentence(rng) for _ in range(2)]}
+            for i in range(spec["projects"])
+        ],
+        "coursework": rng.sample(COURSES, 5),
+        "skills": {f"**{c}**": rng.sample(SKILLS, 5) for c in CATEGORIES},
+    }
+
+
+def make_raw(resume):
+    # Model output as it often arrives: pretty-printed, fenced and with one
+    # trailing comma, so every size goes through the same repair path
+    text = json.dumps(resume, indent=2, ensure_ascii=False)
+    text = text.replace('"\n  ]', '",\n  ]', 1)
+    return "```json\n" + text + "\n```"
+
+
+def make_corpus(size, seed=7):
+    rng = random.Random(f"{seed}:{size}")
+    resume = make_resume(rng, size)
+    return {
+        "payload": make_payload(rng, size),
+        "jd": make_jd(rng, size),
+        "resume": resume,
+        "raw": make_raw(resume),
+    }
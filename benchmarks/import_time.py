@@ -0,0 +1,62 @@
+# Cold-start import benchmark.
+#
+# Every case runs in a fresh interpreter so nothing is already in
+# sys.modules. "eager" cases reproduce what importing used to cost before
+# the openai client and python-docx were deferred to first use.
+#
+#   python benchmarks/import_time.py [--runs 15]
+
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CASES = [
+    ("import llm (lazy)", "import llm"),
+    ("import llm + client (eager)", "import llm; llm.get_client()"),
+    ("import preview", "import preview"),
+    ("import doc_gen (docx stack)", "import doc_gen"),
+]
+
+TIMER = (
+    "import time; _t = time.perf_counter(); {stmt}; "
+    "print(time.perf_counter() - _t)"
+)
+
+
+def time_case(stmt, runs):
+    env = dict(os.environ)
+    env.setdefault("OPENROUTER_API_KEY", "benchmark-dummy-key")
+
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", TIMER.format(stmt=stmt)],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            return None, out.stderr.strip().splitlines()[-1]
+        samples.append(float(out.stdout.strip()) * 1000)
+
+    return samples, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of ResumeGenie modules")
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'case':<32} {'median ms':>10} {'min ms':>10}")
+    for name, stmt in CASES:
+        samples, error = time_case(stmt, args.runs)
+        if error:
+            print(f"{name:<32} skipped: {error}")
+            continue
+        print(f"{name:<32} {statistics.median(samples):>10.1f} {min(samples):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# Fuzz / benchmark corpus for json_repair.
+#
+# Damages a generated-resume JSON in the ways models actually get it wrong
+# and compares the old regex + json.loads parser with repair_json:
+# success rate per damage kind, exact-recovery rate, and parse time.
+#
+#   python benchmarks/json_repair_corpus.py [--seed 7] [--per-kind 200]
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from json_repair import repair_json
+
+SAMPLE_RESUME = {
+    "header": {
+        "name": "Vishwas Bhargav",
+        "phone": "+91 982547058",
+        "email": "vishwas@example.com",
+        "linkedin": "linkedin.com/in/vishwas",
+        "github": "github.com/vishwas",
+    },
+    "summary": "Machine learning engineer focused on **RAG pipelines** and **NLP**. "
+               "Built production retrieval systems that cut support load by **30%**.",
+    "education": [
+        {"degree": "Bachelor's", "institution": "Medicaps University", "grade": "8.4 CGPA", "duration": "Aug 2021 – May 2025"}
+    ],
+    "experience": [
+        {
+            "role": "AI Intern",
+            "company": "Averybit",
+            "duration": "Jan 2025 – Present",
+            "bullets": [
+                "Engineered a **RAG** service over 40k documents, improving answer accuracy by **18%**.",
+                "Automated evaluation with **LangChain** and **pytest**, reducing regression triage time by half.",
+            ],
+        }
+    ],
+    "projects": [
+        {"title": "Number Prediction", "bullets": [
+            "Trained a **CNN** digit classifier reaching **98.7% accuracy** on MNIST.",
+            "Deployed the model behind a **FastAPI** endpoint serving 200 req/s.",
+        ]},
+        {"title": "Resume Parser", "bullets": [
+            "Extracted entities with **spaCy** NER across 5k resumes at **92% F1**.",
+            "Designed a **PostgreSQL** schema for parsed profiles with full-text search.",
+        ]},
+    ],
+    "coursework": ["Deep Learning", "Data Structures", "DBMS", "Operating Systems", "Statistics"],
+    "skills": {
+        "**Machine Learning**": ["PyTorch", "scikit-learn", "CNN"],
+        "**Languages**": ["Python", "SQL"],
+    },
+}
+
+
+# ================= DAMAGE KINDS =================
+def fenced(text, rng):
+    return "```json\n" + text + "\n```"
+
+
+def prose(text, rng):
+    return "Here is the optimized resume:\n" + text + "\nLet me know if you want changes!"
+
+
+def trailing_commas(text, rng):
+    return re.sub(r'(["\]}])(\s*\n\s*[\]}])', r"\1,\2", text)
+
+
+def smart_quotes(text, rng):
+    # Delimiter quotes only: key quotes become curly
+    return re.sub(r'"(\w+)":', "“\\1”:", text)
+
+
+def python_literals(text, rng):
+    return text[:-1].rstrip() + ',\n  "verified": True,\n  "extra": None\n}'
+
+
+def comments(text, rng):
+    return text.replace('"summary"', '// generated summary\n  "summary"', 1)
+
+
+def missing_comma(text, rng):
+    commas = [m.start() for m in re.finditer(r'",\n', text)]
+    pos = rng.choice(commas)
+    return text[:pos + 1] + text[pos + 2:]
+
+
+def raw_newline(text, rng):
+    return text.replace("NLP**. ", "NLP**.\n", 1)
+
+
+def truncated(text, rng):
+    return text[: rng.randint(len(text) // 3, len(text) - 2)]
+
+
+DAMAGE = {
+    "fenced": fenced,
+    "prose": prose,
+    "trailing_commas": trailing_commas,
+    "smart_quotes": smart_quotes,
+    "python_literals": python_literals,
+    "comments": comments,
+    "missing_comma": missing_comma,
+    "raw_newline": raw_newline,
+    "truncated": truncated,
+}
+
+# Kinds where the original object must come back exactly
+EXACT = {"fenced", "prose", "trailing_commas", "smart_quotes", "comments", "missing_comma"}
+
+
+# ================= PARSERS =================
+def legacy_parse(raw):
+    # safe_json_parse before the repair engine
+    raw = raw.strip()
+    raw = re.sub(r"^```(?:json)?", "", raw)
+    raw = re.sub(r"```$", "", raw)
+    match = re.search(r"\{.*\}", raw, re.DOTALL)
+    if not match:
+        raise ValueError("Model did not return JSON")
+    return json.loads(match.group(0))
+
+
+def repair_parse(raw):
+    return repair_json(raw)[0]
+
+
+def run(parser, samples):
+    ok = exact = 0
+    start = time.perf_counter()
+    for kind, text in samples:
+        try:
+            result = parser(text)
+        except ValueError:
+            continue
+        ok += isinstance(result, dict)
+        exact += kind in EXACT and result == SAMPLE_RESUME
+    elapsed = time.perf_counter() - start
+    return ok, exact, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fuzz and benchmark json_repair")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--per-kind", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    base = json.dumps(SAMPLE_RESUME, indent=2, ensure_ascii=False)
+
+    print(f"{'damage':<18} {'legacy ok':>10} {'repair ok':>10} {'exact':>8} {'legacy µs':>10} {'repair µs':>10}")
+    totals = [0, 0, 0]
+    for kind, damage in DAMAGE.items():
+        samples = [(kind, damage(base, rng)) for _ in range(args.per_kind)]
+        legacy_ok, _, legacy_t = run(legacy_parse, samples)
+        repair_ok, exact, repair_t = run(repair_parse, samples)
+        totals[0] += legacy_ok
+        totals[1] += repair_ok
+        totals[2] += len(samples)
+
+        n = len(samples)
+        exact_col = f"{exact / n:>7.0%}" if kind in EXACT else f"{'-':>8}"
+        print(
+            f"{kind:<18} {legacy_ok / n:>10.0%} {repair_ok / n:>10.0%} {exact_col} "
+            f"{legacy_t / n * 1e6:>10.1f} {repair_t / n * 1e6:>10.1f}"
+        )
+
+    print(f"\noverall: legacy {totals[0] / totals[2]:.0%}, repair {totals[1] / totals[2]:.0%} of {totals[2]} damaged outputs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# End-to-end load test against the local OpenRouter stand-in.
+#
+# Simulates N concurrent Streamlit sessions: each one submits a Generate job
+# through the same JobManager / GenerationPool the app uses, polls it like
+# the status fragment does, and sometimes follows up with a feedback
+# revision. Everything behind the UI runs for real (router, hedging, parsing,
+# rule fix-ups, PDF/DOCX render, version store); only the provider is local.
+# Reports throughput and latency percentiles per job kind.
+#
+#   python benchmarks/load_test.py --sessions 20 --duration 60
+#   python benchmarks/load_test.py --sessions 50 --latency 1.5 --rate-limit-rate 0.05 --max-concurrency 8
+#   python benchmarks/load_test.py --base-url http://127.0.0.1:8765/api/v1   # external mock
+#
+# Needs the app's own dependencies (openai, httpx); no API key is used.
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import SIZES, make_payload, make_jd
+from mock_openrouter import MockConfig, start_in_thread
+
+FEEDBACK = ["Make the summary shorter", "Emphasise cloud experience", "More metrics in project bullets"]
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class Results:
+
+    def __init__(self):
+        self.latency = {}           # kind -> [seconds]
+        self.first_section = []
+        self.failures = {}
+        self.lock = threading.Lock()
+
+    def add(self, kind, elapsed, first_section=None):
+        with self.lock:
+            self.latency.setdefault(kind, []).append(elapsed)
+            if first_section is not None:
+                self.first_section.append(first_section)
+
+    def fail(self, kind, error):
+        with self.lock:
+            self.failures.setdefault(kind, []).append(error)
+
+
+def wait_for(jobs, job_id, poll):
+    # Like the status fragment: look at the job every `poll` seconds
+    first_section = None
+    job = jobs.get(job_id)
+    while not job.finished:
+        if first_section is None and job.snapshot()["sections"]:
+            first_section = time.time() - job.created_at
+        time.sleep(poll)
+    return job, first_section
+
+
+def session(index, args, deadline, results):
+    from jobs import get_jobs, DONE
+
+    jobs = get_jobs()
+    rng = random.Random(f"{args.seed}:{index}")
+    session_id = f"load-{index}"
+
+    while time.monotonic() < deadline:
+        size = rng.choice(args.sizes)
+        payload, jd = make_payload(rng, size), make_jd(rng, size)
+
+        job_id = jobs.submit_generate(session_id, payload, jd, use_cache=False)
+        job, first_section = wait_for(jobs, job_id, args.poll)
+        if job.status != DONE:
+            results.fail("generate", job.error)
+            continue
+        results.add("generate", job.finished_at - job.created_at, first_section)
+
+        if rng.random() < args.revise_ratio and time.monotonic() < deadline:
+            job_id = jobs.submit_revise(
+                session_id, job.result, rng.choice(FEEDBACK), payload, jd, parent_id=job.version_id, use_cache=False
+            )
+            revised, _ = wait_for(jobs, job_id, args.poll)
+            if revised.status == DONE:
+                results.add("revise", revised.finished_at - revised.created_at)
+            else:
+                results.fail("revise", revised.error)
+
+        time.sleep(rng.uniform(0, 2 * args.think))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the generation pipeline against a mock provider")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep submitting")
+    parser.add_argument("--sizes", default="small,medium", help="corpus sizes to draw payloads from")
+    parser.add_argument("--revise-ratio", type=float, default=0.3, help="share of generations followed by feedback")
+    parser.add_argument("--think", type=float, default=1.0, help="mean seconds between a session's jobs")
+    parser.add_argument("--poll", type=float, default=0.1, help="status poll interval")
+    parser.add_argument("--max-concurrency", type=int, default=None, help="generation pool cap (RESUMEGENIE_MAX_CONCURRENCY)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--base-url", default=None, help="use an already running mock instead of starting one")
+    # forwarded to the in-process mock
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--max-inflight", type=int, default=0)
+    parser.add_argument("--cassettes", default=None)
+    args = parser.parse_args(argv)
+
+    args.sizes = [s.strip() for s in args.sizes.split(",") if s.strip() in SIZES]
+    if not args.sizes:
+        parser.error(f"--sizes must name at least one of {', '.join(SIZES)}")
+
+    base_url = args.base_url
+    if base_url is None:
+        _, base_url = start_in_thread(MockConfig(
+            latency=args.latency, tokens_per_sec=args.tokens_per_sec, error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate, max_inflight=args.max_inflight,
+            cassettes=args.cassettes, seed=args.seed,
+        ))
+
+    # Configuration is read at import time, so it has to be in place before
+    # the app modules load; versions go to a throwaway store
+    scratch = tempfile.mkdtemp(prefix="resumegenie-load-")
+    os.environ["OPENROUTER_BASE_URL"] = base_url
+    os.environ.setdefault("OPENROUTER_API_KEY", "mock")
+    os.environ["RESUMEGENIE_STORE"] = os.path.join(scratch, "resumes.sqlite3")
+    os.environ.setdefault("RESUMEGENIE_REQUEST_LOG", "0")
+    os.environ.setdefault("RESUMEGENIE_METRICS_PORT", "0")
+    if args.max_concurrency:
+        os.environ["RESUMEGENIE_MAX_CONCURRENCY"] = str(args.max_concurrency)
+
+    from generation_pool import get_pool
+
+    print(f"🧪 {args.sessions} session(s) for {args.duration:.0f}s against {base_url}")
+    results = Results()
+    started = time.monotonic()
+    deadline = started + args.duration
+    threads = [
+        threading.Thread(target=session, args=(i, args, deadline, results), daemon=True)
+        for i in range(args.sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.monotonic() - started
+
+    completed = sum(len(v) for v in results.latency.values())
+    failed = sum(len(v) for v in results.failures.values())
+    print(f"\n{completed} job(s) completed, {failed} failed in {wall:.1f}s -> {completed / wall:.2f} jobs/s")
+
+    print(f"\n{'kind':<10} {'n':>6} {'p50':>8} {'p90':>8} {'p95':>8} {'p99':>8} {'mean':>8}")
+    for kind, samples in sorted(results.latency.items()):
+        print(
+            f"{kind:<10} {len(samples):>6} {percentile(samples, 0.5):>7.2f}s {percentile(samples, 0.9):>7.2f}s "
+            f"{percentile(samples, 0.95):>7.2f}s {percentile(samples, 0.99):>7.2f}s {statistics.fmean(samples):>7.2f}s"
+        )
+    if results.first_section:
+        s = results.first_section
+        print(f"{'1st sect.':<10} {len(s):>6} {percentile(s, 0.5):>7.2f}s {percentile(s, 0.9):>7.2f}s "
+              f"{percentile(s, 0.95):>7.2f}s {percentile(s, 0.99):>7.2f}s {statistics.fmean(s):>7.2f}s")
+
+    pool = get_pool().metrics()
+    print(
+        f"\npool: cap {pool['max_concurrency']}, wait p50 {pool['wait_p50']:.2f}s / p95 {pool['wait_p95']:.2f}s, "
+        f"run p50 {pool['run_p50']:.2f}s / p95 {pool['run_p95']:.2f}s"
+    )
+
+    try:
+        with urllib.request.urlopen(base_url.rstrip("/") + "/stats", timeout=5) as response:
+            print("mock:", json.load(response))
+    except (OSError, ValueError):
+        pass
+
+    for kind, errors in sorted(results.failures.items()):
+        print(f"\n{kind} failures ({len(errors)}), first: {errors[0]}")
+
+    return 1 if failed and not completed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
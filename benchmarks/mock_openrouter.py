@@ -0,0 +1,431 @@
+# Local OpenAI-compatible stand-in for OpenRouter, for offline load tests.
+#
+# Serves POST .../chat/completions (plain and SSE streaming). Each answer is
+# replayed from a cassette recorded from a real run when one matches the
+# request, otherwise synthesized: a schema-valid resume that passes the
+# prompt rules, or the section / JSON patch / fix-up object the prompt asks
+# for. Latency, token rate, 5xx errors and 429s are injectable.
+#
+#   python benchmarks/mock_openrouter.py --port 8765 --latency 0.8 --tokens-per-sec 150 --rate-limit-rate 0.05
+#   OPENROUTER_BASE_URL=http://127.0.0.1:8765/api/v1 OPENROUTER_API_KEY=mock streamlit run main.py
+#
+#   # record cassettes through the real API, then replay them offline
+#   OPENROUTER_API_KEY=sk-... python benchmarks/mock_openrouter.py --cassettes cassettes/ --record
+#   python benchmarks/mock_openrouter.py --cassettes cassettes/
+#
+# GET /stats returns request / injected-error counters as JSON.
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from llm_cache import make_cache_key
+
+UPSTREAM_URL = "https://openrouter.ai/api/v1"
+CHARS_PER_TOKEN = 4
+
+VERBS = [
+    "Engineered", "Designed", "Deployed", "Optimized", "Automated", "Migrated", "Trained", "Scaled",
+    "Reduced", "Built", "Architected", "Implemented", "Streamlined", "Accelerated", "Refactored",
+    "Launched", "Integrated", "Instrumented", "Benchmarked", "Containerized", "Orchestrated",
+    "Modernized", "Profiled", "Hardened", "Parallelized", "Consolidated", "Prototyped", "Delivered",
+    "Standardized", "Secured", "Tuned", "Evaluated", "Shipped", "Rebuilt", "Extended", "Validated",
+]
+SKILLS = [
+    "Python", "PyTorch", "SQL", "Docker", "Kubernetes", "AWS", "FastAPI", "Spark", "Airflow", "Redis",
+    "Kafka", "React", "TypeScript", "LangChain", "scikit-learn", "PostgreSQL", "Terraform", "MLflow",
+]
+CATEGORIES = ["Machine Learning", "Languages", "Cloud", "Data Engineering", "Tools"]
+COURSES = ["Data Structures", "DBMS", "Operating Systems", "Computer Networks", "Deep Learning"]
+OBJECTS = ["retrieval service", "feature pipeline", "inference API", "ranking model", "CI workflow", "ETL job"]
+
+
+# ================= SYNTHESIS =================
+def _json_block(prompt, label):
+    # The JSON object printed under "LABEL (JSON):" in a prompt
+    match = re.search(re.escape(label) + r" \(JSON\):\n", prompt)
+    if not match:
+        return {}
+    try:
+        return json.JSONDecoder().raw_decode(prompt[match.end():])[0]
+    except ValueError:
+        return {}
+
+
+class Synthesizer:
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def bullet(self, verbs):
+        skill, metric = self.rng.choice(SKILLS), self.rng.randint(10, 60)
+        return (
+            f"{verbs.pop()} a **{skill}** {self.rng.choice(OBJECTS)} for "
+            f"{self.rng.randint(2, 90)}k users, cutting latency by **{metric}%**."
+        )
+
+    def resume(self, data):
+        verbs = self.rng.sample(VERBS, len(VERBS))
+        contacts = data.get("contacts", {})
+        name = " ".join(contacts.get(k, "") for k in ("f_name", "l_name")).strip() or "Mock Candidate"
+
+        jobs = data.get("experience") or []
+        projects = data.get("projects") or []
+        projects = projects + [{"name": f"Generated Project {i + 1}"} for i in range(max(0, 3 - len(projects)))]
+
+        return {
+            "header": {
+                "name": name,
+                "phone": contacts.get("phone", "+1 555 0100"),
+                "email": contacts.get("email", "mock@example.com"),
+                "linkedin": contacts.get("linked_in", "linkedin.com/in/mock"),
+                "github": contacts.get("github", "github.com/mock"),
+            },
+            "summary": (
+                f"Engineer focused on **{self.rng.choice(SKILLS)}** and **{self.rng.choice(SKILLS)}** systems. "
+                "Ships measurable improvements to production services. "
+                "Comfortable owning features from design to on-call."
+            ),
+            "education": [
+                {
+                    "degree": e.get("degree", "Bachelor's"),
+                    "institution": e.get("institute", "University"),
+                    "duration": f"{e.get('start', '')} – {e.get('end', '')}".strip(" –"),
+                }
+                for e in data.get("education") or [{}]
+            ],
+            "experience": [
+                {
+                    "role": job.get("role", "Engineer"),
+                    "company": job.get("company", "Company"),
+                    "duration": f"{job.get('start', '')} – {job.get('end', '')}".strip(" –"),
+                    "bullets": [self.bullet(verbs) for _ in range(2)],
+                }
+                for job in jobs[: len(VERBS) // 4]
+            ],
+            "projects": [
+                {"title": p.get("name", "Project"), "bullets": [self.bullet(verbs) for _ in range(2)]}
+                for p in projects[: len(VERBS) // 4]
+            ],
+            "coursework": list(COURSES),
+            "skills": {f"**{c}**": self.rng.sample(SKILLS, 4) for c in CATEGORIES},
+        }
+
+    def answer(self, prompt):
+
+        # -> JSON text shaped like what this prompt asks for
+        data = _json_block(prompt, "RESUME DATA") or _json_block(prompt, "CANDIDATE DATA")
+
+        if "JSON Patch" in prompt:
+            value = "Engineer with a track record of **measurable** production wins, tailored to this role."
+            return json.dumps({"patch": [{"op": "replace", "path": "/summary", "value": value}]})
+
+        if "fixing specific resume lines" in prompt:
+            request = _json_block(prompt, "FIX REQUEST")
+            verbs = self.rng.sample(VERBS, len(VERBS))
+            return json.dumps({
+                "bullets": {pid: self.bullet(verbs) for pid in (request.get("bullets") or {})},
+                "project_bullets": {pid: [self.bullet(verbs)] for pid in (request.get("project_bullets") or {})},
+            })
+
+        resume = self.resume(data)
+
+        match = re.search(r"must be rewritten: ([\w, ]+)", prompt)
+        if match:
+            return json.dumps({k: resume[k] for k in re.findall(r"\w+", match.group(1)) if k in resume})
+
+        for marker, keys in (
+            ("ONLY the experience section", ("experience",)),
+            ("ONLY the projects section", ("projects",)),
+            ("ONLY the skills and coursework", ("skills", "coursework")),
+            ("ONLY the professional summary", ("summary",)),
+        ):
+            if marker in prompt:
+                return json.dumps({k: resume[k] for k in keys})
+
+        return json.dumps(resume, indent=2, ensure_ascii=False)
+
+
+# ================= CASSETTES =================
+def cassette_key(body):
+    # Model is left out so routed / fallback models replay the same answer
+    return make_cache_key(body.get("messages"), bool(body.get("response_format")))
+
+
+class Cassettes:
+
+    def __init__(self, directory):
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, body):
+        if not self.directory:
+            return None
+        try:
+            with open(os.path.join(self.directory, cassette_key(body) + ".json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, body, answer):
+        path = os.path.join(self.directory, cassette_key(body) + ".json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"model": body.get("model"), "recorded_at": time.time(), **answer}, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+
+def fetch_upstream(body, upstream, api_key):
+    # One non-streaming call to the real API; the mock does its own streaming
+    request = urllib.request.Request(
+        upstream.rstrip("/") + "/chat/completions",
+        data=json.dumps({k: v for k, v in body.items() if k not in ("stream", "stream_options")}).encode("utf-8"),
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=120) as response:
+        data = json.load(response)
+    return {"content": data["choices"][0]["message"]["content"], "usage": data.get("usage")}
+
+
+# ================= SERVER =================
+class MockConfig:
+
+    def __init__(self, latency=0.5, jitter=0.3, tokens_per_sec=200.0, error_rate=0.0, rate_limit_rate=0.0,
+                 retry_after=1.0, max_inflight=0, cassettes=None, record=False, upstream=UPSTREAM_URL, seed=7):
+        self.latency = latency                  # seconds before the first token
+        self.jitter = jitter                    # +- share of latency
+        self.tokens_per_sec = tokens_per_sec    # completion token rate (0 = instant)
+        self.error_rate = error_rate            # share of requests answered with 500
+        self.rate_limit_rate = rate_limit_rate  # share of requests answered with 429
+        self.retry_after = retry_after
+        self.max_inflight = max_inflight        # > 0: 429 beyond this many concurrent requests
+        self.cassettes = Cassettes(cassettes)
+        self.record = record
+        self.upstream = upstream
+        self.seed = seed
+
+
+class MockState:
+
+    def __init__(self, config):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.inflight = 0
+        self.counters = {"requests": 0, "streamed": 0, "replayed": 0, "recorded": 0, "synthesized": 0,
+                         "errors_injected": 0, "rate_limited": 0}
+        self.lock = threading.Lock()
+
+    def count(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+    def roll(self):
+        with self.lock:
+            return self.rng.random()
+
+    def synthesizer(self):
+        with self.lock:
+            return Synthesizer(random.Random(self.rng.random()))
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    state = None                # set by make_server
+
+    def log_message(self, format, *args):
+        pass
+
+    def _json(self, status, obj, headers=()):
+        body = json.dumps(obj).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/stats"):
+            with self.state.lock:
+                self._json(200, {**self.state.counters, "inflight": self.state.inflight})
+        else:
+            self._json(404, {"error": {"message": "not found", "code": 404}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._json(400, {"error": {"message": "invalid JSON body", "code": 400}})
+            return
+
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": {"message": "not found", "code": 404}})
+            return
+
+        state, config = self.state, self.state.config
+        state.count("requests")
+
+        with state.lock:
+            state.inflight += 1
+            overloaded = config.max_inflight and state.inflight > config.max_inflight
+        try:
+            if overloaded or state.roll() < config.rate_limit_rate:
+                state.count("rate_limited")
+                self._json(429, {"error": {"message": "Rate limit exceeded (mock)", "code": 429}},
+                           headers=[("Retry-After", str(config.retry_after))])
+                return
+            if state.roll() < config.error_rate:
+                state.count("errors_injected")
+                time.sleep(self._delay())
+                self._json(500, {"error": {"message": "Upstream error (mock)", "code": 500}})
+                return
+            self._complete(body)
+        finally:
+            with state.lock:
+                state.inflight -= 1
+
+    def _delay(self):
+        config = self.state.config
+        return max(0.0, config.latency * (1 + config.jitter * (2 * self.state.roll() - 1)))
+
+    def _answer(self, body):
+        state, config = self.state, self.state.config
+
+        answer = config.cassettes.get(body)
+        if answer is not None:
+            state.count("replayed")
+            return answer
+
+        if config.record:
+            answer = fetch_upstream(body, config.upstream, os.getenv("OPENROUTER_API_KEY", ""))
+            config.cassettes.put(body, answer)
+            state.count("recorded")
+            return answer
+
+        prompt = "\n".join(m.get("content") or "" for m in body.get("messages", []) if isinstance(m, dict))
+        state.count("synthesized")
+        return {"content": state.synthesizer().answer(prompt), "usage": None}
+
+    def _complete(self, body):
+        started = time.monotonic()
+        answer = self._answer(body)
+        content = answer["content"]
+
+        prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []) if isinstance(m, dict))
+        usage = answer.get("usage") or {
+            "prompt_tokens": prompt_chars // CHARS_PER_TOKEN,
+            "completion_tokens": len(content) // CHARS_PER_TOKEN,
+        }
+        usage = {**usage, "total_tokens": usage["prompt_tokens"] + usage["completion_tokens"]}
+
+        rate = self.state.config.tokens_per_sec
+        generation = usage["completion_tokens"] / rate if rate > 0 else 0.0
+        time.sleep(max(0.0, self._delay() - (time.monotonic() - started)))
+
+        meta = {"id": f"gen-mock-{uuid.uuid4().hex[:16]}", "created": int(time.time()), "model": body.get("model", "mock")}
+
+        if not body.get("stream"):
+            time.sleep(generation)
+            self._json(200, {
+                **meta,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self.state.count("streamed")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def send(obj):
+            self.wfile.write(b"data: " + json.dumps(obj).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+
+        # ~8 tokens per event, paced at the configured token rate
+        step = 8 * CHARS_PER_TOKEN
+        pieces = [content[i:i + step] for i in range(0, len(content), step)] or [""]
+        pause = generation / len(pieces)
+        try:
+            for i, piece in enumerate(pieces):
+                delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+                send({**meta, "object": "chat.completion.chunk",
+                      "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                time.sleep(pause)
+            send({**meta, "object": "chat.completion.chunk",
+                  "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if (body.get("stream_options") or {}).get("include_usage"):
+                send({**meta, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass        # client closed a losing hedge
+
+
+def make_server(config, host="127.0.0.1", port=0):
+    # port=0 picks a free port: server.server_address[1]
+    handler = type("MockHandler", (Handler,), {"state": MockState(config)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(config, host="127.0.0.1", port=0):
+    server = make_server(config, host, port)
+    threading.Thread(target=server.serve_forever, name="mock-openrouter", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/api/v1"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="OpenAI-compatible OpenRouter stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds before the first token")
+    parser.add_argument("--jitter", type=float, default=0.3, help="+- share of latency")
+    parser.add_argument("--tokens-per-sec", type=float, default=200.0, help="completion token rate, 0 = instant")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds on 429")
+    parser.add_argument("--max-inflight", type=int, default=0, help="429 beyond this many concurrent requests")
+    parser.add_argument("--cassettes", default=None, help="cassette directory to replay from")
+    parser.add_argument("--record", action="store_true", help="fetch cassette misses from the real API and save them")
+    parser.add_argument("--upstream", default=UPSTREAM_URL)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    if args.record and not (args.cassettes and os.getenv("OPENROUTER_API_KEY")):
+        parser.error("--record needs --cassettes and OPENROUTER_API_KEY")
+
+    config = MockConfig(
+        latency=args.latency, jitter=args.jitter, tokens_per_sec=args.tokens_per_sec,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after,
+        max_inflight=args.max_inflight, cassettes=args.cassettes, record=args.record,
+        upstream=args.upstream, seed=args.seed,
+    )
+    server = make_server(config, args.host, args.port)
+    print(f"🧪 Mock OpenRouter on http://{args.host}:{args.port}/api/v1 (set OPENROUTER_BASE_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# PDF vs DOCX render benchmark.
+#
+# Renders the same synthetic resume to bytes with pdf_gen.render_pdf_bytes and
+# doc_gen.render_docx_bytes, reporting median latency, renders per second on
+# one core, and output size. The DOCX column is the cost before any external
+# DOCX-to-PDF conversion, which is not measured here.
+#
+#   python benchmarks/pdf_render.py [--entries 3] [--bullets 3] [--runs 200]
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pdf_gen
+from docx_render import synthetic_resume
+
+
+def measure(render, resume, runs):
+    timings, size = [], 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        size = len(render(resume))
+        timings.append(time.perf_counter() - start)
+    return timings, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering against the DOCX path")
+    parser.add_argument("--entries", type=int, default=3, help="experience and project entries")
+    parser.add_argument("--bullets", type=int, default=3, help="bullets per entry")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--no-docx", action="store_true", help="skip the DOCX side (python-docx not installed)")
+    args = parser.parse_args()
+
+    resume = synthetic_resume(args.entries, args.bullets)
+
+    backends = [("pdf", pdf_gen.render_pdf_bytes)]
+    if not args.no_docx:
+        from doc_gen import render_docx_bytes
+        backends.append(("docx", render_docx_bytes))
+
+    print(f"{'backend':<8} {'median ms':>10} {'p95 ms':>10} {'renders/s':>10} {'bytes':>10}")
+    for name, render in backends:
+        render(resume)    # warm-up
+        timings, size = measure(render, resume, args.runs)
+        median = statistics.median(timings)
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(f"{name:<8} {median * 1000:>10.2f} {p95 * 1000:>10.2f} {1 / median:>10.0f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
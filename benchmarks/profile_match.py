@@ -0,0 +1,107 @@
+# Profile matching benchmark for search.match_profiles.
+#
+# Fills a throwaway store with synthetic saved profiles (indexed through the
+# normal save hook), then times JD queries against it.
+#
+#   python benchmarks/profile_match.py [--profiles 20000] [--queries 200] [--seed 7]
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from store import ResumeStore
+from search import attach_index, match_profiles, build_query
+
+SKILLS = [
+    "Python", "Java", "Go", "Rust", "C++", "SQL", "PostgreSQL", "MongoDB", "Redis", "Kafka",
+    "Docker", "Kubernetes", "AWS", "GCP", "Terraform", "PyTorch", "TensorFlow", "scikit-learn",
+    "Machine Learning", "Deep Learning", "NLP", "Computer Vision", "React", "TypeScript", "Node.js",
+    "FastAPI", "Django", "Spark", "Airflow", "LangChain", "RAG", "Statistics", "Linux", "Git",
+    "Kotlin", "Swift", "Flutter", "Angular", "Vue", "GraphQL", "gRPC", "Elasticsearch", "Cassandra",
+    "Snowflake", "dbt", "Tableau", "Power BI", "Excel", "MATLAB", "R", "Scala", "Haskell", "Ruby",
+    "Rails", "PHP", "Laravel", "Spring Boot", "Hibernate", "Azure", "Ansible", "Jenkins", "GitHub Actions",
+    "Prometheus", "Grafana", "OpenCV", "YOLO", "Transformers", "Hugging Face", "XGBoost", "LightGBM",
+    "Pandas", "NumPy", "Polars", "Ray", "MLflow", "Kubeflow", "SageMaker", "Vertex AI", "BigQuery",
+    "Redshift", "DynamoDB", "Firebase", "Supabase", "Next.js", "Tailwind", "Figma", "Selenium",
+    "Playwright", "Cypress", "JUnit", "pytest", "Bash", "PowerShell", "Unity", "Unreal", "CUDA",
+    "Embedded C", "Verilog", "ROS", "Solidity", "Web3", "Blockchain", "Networking", "Security",
+]
+COURSES = ["Data Structures", "DBMS", "Operating Systems", "Computer Networks", "Deep Learning", "Statistics", "Compilers"]
+ROLES = ["Software Engineer", "ML Engineer", "Data Scientist", "Backend Developer", "Intern", "DevOps Engineer"]
+VERBS = ["Built", "Designed", "Deployed", "Optimized", "Automated", "Migrated", "Trained"]
+
+
+def synthetic_payload(rng, i):
+    skills = rng.sample(SKILLS, rng.randint(4, 10))
+    return {
+        "contacts": {"f_name": f"User{i}", "l_name": "Bench", "email": f"user{i}@example.com"},
+        "education": [],
+        "experience": [
+            {"company": f"Company {rng.randint(1, 500)}", "role": rng.choice(ROLES),
+             "desc": f"{rng.choice(VERBS)} services with {' and '.join(rng.sample(skills, 2))}"}
+            for _ in range(rng.randint(1, 3))
+        ],
+        "projects": [
+            {"name": f"Project {rng.randint(1, 9999)}",
+             "desc": f"{rng.choice(VERBS)} a {rng.choice(SKILLS)} pipeline using {rng.choice(skills)}"}
+            for _ in range(rng.randint(1, 3))
+        ],
+        "skills": skills,
+        "coursework": rng.sample(COURSES, 3),
+    }
+
+
+def synthetic_jd(rng):
+    required = rng.sample(SKILLS, 5)
+    return {
+        "job_title": rng.choice(ROLES),
+        "description": f"We are looking for an engineer to build {rng.choice(SKILLS)} systems "
+                       f"and ship {rng.choice(SKILLS)} features to production.",
+        "skills_required": ", ".join(required),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JD -> profile matching")
+    parser.add_argument("--profiles", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = attach_index(ResumeStore(os.path.join(tmp, "bench.sqlite3")))
+
+        start = time.perf_counter()
+        for i in range(args.profiles):
+            store.save(synthetic_payload(rng, i))
+        load = time.perf_counter() - start
+        print(f"indexed {args.profiles} profiles in {load:.1f}s ({load / args.profiles * 1000:.2f} ms/save)")
+
+        timings, hits = [], []
+        for _ in range(args.queries):
+            jd = synthetic_jd(rng)
+            start = time.perf_counter()
+            match_profiles(store, jd, limit=10)
+            timings.append(time.perf_counter() - start)
+            hits.append(store.conn().execute(
+                "SELECT count(*) FROM resume_fts WHERE resume_fts MATCH ?", (build_query(jd),)
+            ).fetchone()[0])
+
+        timings.sort()
+        print(
+            f"query: median {statistics.median(timings) * 1000:.2f} ms, "
+            f"p95 {timings[int(len(timings) * 0.95) - 1] * 1000:.2f} ms, max {timings[-1] * 1000:.2f} ms "
+            f"({statistics.mean(hits) / args.profiles:.0%} of profiles match a typical JD)"
+        )
+
+
+if __name__ == "__main__":
+    main()
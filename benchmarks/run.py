@@ -0,0 +1,235 @@
+# Benchmark suite for the hot local paths, on the seeded corpus in
+# benchmarks/corpus.py: clean_json, prompt construction, safe_json_parse,
+# DOCX rendering (generate_docx_from_template), PDF rendering and the
+# Streamlit preview, for every corpus size.
+#
+# Each case is timed in samples of several calls (calibrated to ~10 ms per
+# sample) and reported as median / mean / stdev / p95 per call. Results can
+# be saved as a baseline; later runs compare medians against it and exit 1
+# when a case got slower than the threshold allows.
+#
+#   python benchmarks/run.py --save-baseline               # write benchmarks/baseline.json
+#   python benchmarks/run.py                               # compare against it (20% threshold)
+#   python benchmarks/run.py --sizes small,xlarge --filter docx --threshold 0.1
+#
+# Cases whose dependencies are missing (python-docx, streamlit) are skipped.
+
+import os
+import atexit
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import SIZES, make_corpus
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SAMPLE_TARGET = 0.01      # seconds per timed sample
+
+
+# ================= CASES =================
+def case_clean_json():
+    from llm import clean_json
+    return lambda corpus: (clean_json(corpus["payload"]), clean_json(corpus["jd"]))
+
+
+def case_build_prompt():
+    from llm import clean_json, build_prompt
+
+    def run(corpus):
+        return build_prompt(clean_json(corpus["payload"]), clean_json(corpus["jd"]), "Keep it to one page")
+    return run
+
+
+def case_safe_json_parse():
+    from llm import safe_json_parse
+    return lambda corpus: safe_json_parse(corpus["raw"])
+
+
+def case_render_docx():
+    from doc_gen import generate_docx_from_template
+
+    spool = tempfile.mkdtemp(prefix="resumegenie-bench-")
+    atexit.register(shutil.rmtree, spool, True)
+
+    def run(corpus):
+        os.remove(generate_docx_from_template(corpus["resume"], spool_dir=spool))
+    return run
+
+
+def case_render_pdf():
+    from pdf_gen import render_pdf_bytes
+    return lambda corpus: render_pdf_bytes(corpus["resume"])
+
+
+def case_render_preview():
+    # Outside `streamlit run` the st.* calls execute in bare mode, which is
+    # the element-building cost without the browser round trip
+    import logging
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    from preview import render_resume_preview
+    return lambda corpus: render_resume_preview(corpus["resume"])
+
+
+CASES = {
+    "clean_json": case_clean_json,
+    "build_prompt": case_build_prompt,
+    "safe_json_parse": case_safe_json_parse,
+    "render_docx": case_render_docx,
+    "render_pdf": case_render_pdf,
+    "render_preview": case_render_preview,
+}
+
+
+# ================= TIMING =================
+def calibrate(fn, corpus):
+    # Calls per sample so one sample takes about SAMPLE_TARGET
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(corpus)
+        elapsed = time.perf_counter() - start
+        if elapsed >= SAMPLE_TARGET or number >= 10_000:
+            return number
+        number *= 2 if elapsed == 0 else max(2, min(10, int(SAMPLE_TARGET / elapsed) + 1))
+
+
+def measure(fn, corpus, samples, warmup):
+    for _ in range(warmup):
+        fn(corpus)
+    number = calibrate(fn, corpus)
+
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn(corpus)
+        times.append((time.perf_counter() - start) / number)
+
+    ordered = sorted(times)
+    return {
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "min": ordered[0],
+        "calls_per_sample": number,
+        "samples": samples,
+    }
+
+
+def fmt(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}µs"
+
+
+# ================= BASELINE =================
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(path, results, args):
+    baseline = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "seed": args.seed,
+        "results": {name: stats["median"] for name, stats in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the local resume pipeline")
+    parser.add_argument("--sizes", default=",".join(SIZES), help="comma-separated corpus sizes")
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--samples", type=int, default=15)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's medians as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--json", dest="json_out", default=None, help="also write full results to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    unknown = [s for s in sizes if s not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s): {', '.join(unknown)} (choose from {', '.join(SIZES)})")
+
+    corpora = {size: make_corpus(size, seed=args.seed) for size in sizes}
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    previous = (baseline or {}).get("results", {})
+
+    print(f"{'case':<28} {'median':>10} {'mean':>10} {'stdev':>10} {'p95':>10} {'vs base':>9}")
+
+    results = {}
+    regressions = []
+    for case, setup in CASES.items():
+        if args.filter and args.filter not in case:
+            continue
+        try:
+            fn = setup()
+        except ImportError as e:
+            print(f"{case:<28} skipped ({e})")
+            continue
+
+        for size in sizes:
+            name = f"{case}[{size}]"
+            stats = measure(fn, corpora[size], args.samples, args.warmup)
+            results[name] = stats
+
+            change = ""
+            if name in previous:
+                ratio = stats["median"] / previous[name] - 1
+                change = f"{ratio:+.0%}"
+                if ratio > args.threshold:
+                    regressions.append((name, ratio))
+                    change += " ❌"
+
+            print(
+                f"{name:<28} {fmt(stats['median']):>10} {fmt(stats['mean']):>10} "
+                f"{fmt(stats['stdev']):>10} {fmt(stats['p95']):>10} {change:>9}"
+            )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, args)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for name, ratio in regressions:
+            print(f"  {name}: {ratio:+.0%}")
+        return 1
+
+    print(f"\nNo regressions beyond {args.threshold:.0%} (baseline {baseline.get('created_at', '?')})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,295 @@
+# Headless batch generation: tailor saved profiles to one or more JDs and
+# render them, without a Streamlit session.
+#
+#   python cli.py --jd jds/ml_engineer.json --jd jds/data.txt --out out/
+#   python cli.py --tag ml --jd jd.json --concurrency 8 --render-workers 4 --format docx,pdf
+#   python cli.py --ids 12,15 --jd jd.json
+#   python cli.py exported/*.json --jd jd.json
+#
+# Profiles come from the resume store the Save button writes to (newest save
+# per person, optionally filtered by --tag, or exactly the rows in --ids);
+# --store points at another store file. Passing JSON files or directories
+# instead reads payloads in the same shape (contacts / education /
+# experience / projects / skills / coursework). A JD file is either JSON with
+# job_title / description / skills_required or plain text used as the
+# description. Each (profile, JD) pair produces <profile>__<jd>.json plus one
+# file per --format in --out. Reruns skip pairs whose outputs already exist,
+# and a pair whose JSON exists but whose documents don't is only re-rendered.
+
+import os
+import re
+import sys
+import json
+import time
+import glob
+import argparse
+import statistics
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+FORMATS = ("docx", "pdf")
+
+
+# ================= INPUTS =================
+def expand_paths(paths, patterns=("*.json",)):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in patterns:
+                files.extend(sorted(glob.glob(os.path.join(path, pattern))))
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+    return files
+
+
+def load_payload(path):
+    with open(path, "r", encoding="utf-8") as f:
+        payload = json.load(f)
+    if not isinstance(payload, dict) or "contacts" not in payload:
+        raise ValueError("not a saved profile (no contacts)")
+    return payload
+
+
+def load_jd(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if path.endswith(".json"):
+        jd = json.loads(text)
+        if not isinstance(jd, dict):
+            raise ValueError(f"{path}: JD JSON must be an object")
+        return {
+            "job_title": jd.get("job_title", ""),
+            "description": jd.get("description", ""),
+            "skills_required": jd.get("skills_required", ""),
+        }
+
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return {"job_title": stem.replace("_", " "), "description": text.strip(), "skills_required": ""}
+
+
+def stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def load_store_profiles(store, ids=None, tag=None):
+
+    # [(output stem, payload)]: the given rows, or the newest save per owner
+    from store import display_name
+
+    if ids:
+        records = []
+        for resume_id in ids:
+            record = store.get(resume_id)
+            if record is None:
+                print(f"⚠️  skipping id {resume_id}: not in {store.path}", file=sys.stderr)
+            else:
+                records.append(record)
+    else:
+        latest, cursor = {}, None
+        while True:
+            rows, cursor = store.list_resumes(limit=200, before=cursor, tag=tag)
+            for row in rows:
+                latest.setdefault(row["owner"], row["id"])
+            if cursor is None:
+                break
+        records = [store.get(resume_id) for resume_id in latest.values()]
+
+    profiles = []
+    for record in records:
+        payload = record["payload"]
+        if not isinstance(payload, dict) or "contacts" not in payload:
+            print(f"⚠️  skipping id {record['id']}: not a saved profile (no contacts)", file=sys.stderr)
+            continue
+        name = re.sub(r"[^\w-]+", "_", display_name(payload)).strip("_") or "User"
+        profiles.append((f"{name}_{record['id']}", payload))
+    return profiles
+
+
+def parse_ids(value):
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated ids, got {value!r}")
+
+
+# ================= OUTPUTS =================
+def write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def render_file(resume, path, fmt):
+
+    # Runs in a worker process; renderers are imported there, not in the parent
+    start = time.perf_counter()
+    if fmt == "pdf":
+        from pdf_gen import render_pdf_bytes
+        data = render_pdf_bytes(resume)
+    else:
+        from doc_gen import render_docx_bytes
+        data = render_docx_bytes(resume)
+    write_atomic(path, data)
+    return time.perf_counter() - start
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+# ================= RUNNER =================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tailor saved profiles to job descriptions in bulk")
+    parser.add_argument("payloads", nargs="*", help="profile JSON files or directories (default: read the resume store)")
+    parser.add_argument("--store", default=None, help="resume store file (default: RESUMEGENIE_STORE or dB/resumes.sqlite3)")
+    parser.add_argument("--ids", type=parse_ids, default=None, help="comma-separated store ids to use")
+    parser.add_argument("--tag", default=None, help="only store profiles with this tag")
+    parser.add_argument("--jd", action="append", required=True, help="JD file (.json or text); repeatable, directories allowed")
+    parser.add_argument("--out", default="out", help="output directory")
+    parser.add_argument("--concurrency", type=int, default=4, help="model requests in flight")
+    parser.add_argument("--render-workers", type=int, default=os.cpu_count() or 1, help="render processes (0 = render inline)")
+    parser.add_argument("--format", default="docx", help="comma-separated: docx,pdf")
+    parser.add_argument("--feedback", default=None, help="extra instruction applied to every resume")
+    parser.add_argument("--force", action="store_true", help="regenerate even if outputs exist")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the LLM response cache")
+    parser.add_argument("--metrics-port", type=int, default=0, help="serve Prometheus metrics on this port while running")
+    args = parser.parse_args(argv)
+
+    formats = [f.strip() for f in args.format.split(",") if f.strip()]
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+
+    if args.payloads and (args.store or args.ids or args.tag):
+        parser.error("--store / --ids / --tag select store profiles; don't combine them with payload files")
+    if args.store and not os.path.exists(args.store):
+        parser.error(f"no resume store at {args.store}")
+
+    os.makedirs(args.out, exist_ok=True)
+
+    profiles = []
+    if args.payloads:
+        for path in expand_paths(args.payloads):
+            try:
+                profiles.append((stem(path), load_payload(path)))
+            except (OSError, ValueError) as e:
+                print(f"⚠️  skipping {path}: {e}", file=sys.stderr)
+    else:
+        from store import ResumeStore, get_store
+
+        store = ResumeStore(args.store) if args.store else get_store()
+        profiles = load_store_profiles(store, args.ids, args.tag)
+
+    jds = [(stem(path), load_jd(path)) for path in expand_paths(args.jd, ("*.json", "*.txt", "*.md"))]
+
+    # ---------- plan ----------
+    to_generate, to_render = [], []
+    skipped = 0
+    for p_name, payload in profiles:
+        for jd_name, jd in jds:
+            base = os.path.join(args.out, f"{p_name}__{jd_name}")
+            missing = [fmt for fmt in formats if args.force or not os.path.exists(f"{base}.{fmt}")]
+            if not missing:
+                skipped += 1
+            elif os.path.exists(f"{base}.json") and not args.force:
+                with open(f"{base}.json", "r", encoding="utf-8") as f:
+                    to_render.append((base, json.load(f), missing))
+            else:
+                to_generate.append((base, payload, jd, missing))
+
+    total = len(profiles) * len(jds)
+    print(
+        f"🧞 {total} item(s): {len(to_generate)} to generate, {len(to_render)} to re-render, {skipped} already done"
+    )
+    if not to_generate and not to_render:
+        return 0
+
+    from llm import enhance_resume
+    from metrics import request, start_server
+
+    start_server(args.metrics_port)
+
+    started = time.perf_counter()
+    model_times, render_times = [], []
+    failures = 0
+
+    # spawn, not fork: the parent already has the upstream / metrics threads
+    # and open sockets, which a forked child would inherit mid-state
+    renderer = None
+    if args.render_workers > 0:
+        renderer = ProcessPoolExecutor(args.render_workers, mp_context=multiprocessing.get_context("spawn"))
+    render_futures = {}
+
+    def submit_render(base, resume, missing):
+        for fmt in missing:
+            path = f"{base}.{fmt}"
+            if renderer is None:
+                render_futures[path] = (resume, fmt)    # rendered in the collect loop
+            else:
+                render_futures[path] = renderer.submit(render_file, resume, path, fmt)
+
+    def generate(base, payload, jd):
+        start = time.perf_counter()
+        with request("generate", source="cli", output=os.path.basename(base)):
+            resume = enhance_resume(payload, jd, feedback=args.feedback, use_cache=not args.no_cache)
+        return resume, time.perf_counter() - start
+
+    try:
+        for base, resume, missing in to_render:
+            submit_render(base, resume, missing)
+
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            futures = {pool.submit(generate, base, payload, jd): (base, missing) for base, payload, jd, missing in to_generate}
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                base, missing = futures[future]
+                try:
+                    resume, elapsed = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"❌ [{done}/{len(futures)}] {os.path.basename(base)}: {e}", file=sys.stderr)
+                    continue
+
+                model_times.append(elapsed)
+                # JSON first, so an interrupted run only has to re-render
+                write_atomic(f"{base}.json", json.dumps(resume, indent=2, ensure_ascii=False).encode("utf-8"))
+                submit_render(base, resume, missing)
+                print(f"✅ [{done}/{len(futures)}] {os.path.basename(base)} ({elapsed:.1f}s)")
+
+        for path, result in render_futures.items():
+            try:
+                render_times.append(render_file(result[0], path, result[1]) if renderer is None else result.result())
+            except Exception as e:
+                failures += 1
+                print(f"❌ render {os.path.basename(path)}: {e}", file=sys.stderr)
+    finally:
+        if renderer is not None:
+            renderer.shutdown()
+
+    # ---------- stats ----------
+    wall = time.perf_counter() - started
+    generated = len(model_times)
+    print("\n📊 Throughput")
+    print(f"  wall time        {wall:.1f}s")
+    print(f"  generated        {generated} resume(s), {generated / wall * 60:.1f}/min")
+    if model_times:
+        print(
+            f"  model latency    p50 {statistics.median(model_times):.2f}s"
+            f"  p95 {percentile(model_times, 0.95):.2f}s  max {max(model_times):.2f}s"
+        )
+    print(f"  rendered         {len(render_times)} file(s), {len(render_times) / wall:.1f}/s")
+    if render_times:
+        print(f"  render time      p50 {statistics.median(render_times) * 1000:.1f}ms  p95 {percentile(render_times, 0.95) * 1000:.1f}ms")
+    print(f"  skipped          {skipped}")
+    print(f"  failed           {failures}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
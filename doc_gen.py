@@ -1,20 +1,109 @@
 import os
-import re
+import time
+import uuid
+import zipfile
+import tempfile
+from io import BytesIO
 from datetime import datetime
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_TAB_ALIGNMENT
+from docx.enum.style import WD_STYLE_TYPE
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
+from inline_markup import parse_inline
+from metrics import span
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# ================= FONT =================
-def set_font(run, size=11, bold=False, color=(0,0,0)):
-    run.font.name = "Calibri"
-    run.font.size = Pt(size)
-    run.bold = bold
-    run.font.color.rgb = RGBColor(*color)
+# Optional on-disk copies go to a spool dir outside the source tree
+SPOOL_DIR = os.getenv("RESUMEGENIE_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "resumegenie_spool"))
+SPOOL_TTL = int(float(os.getenv("RESUMEGENIE_SPOOL_TTL_HOURS", "24")) * 3600)
+
+# ================= STYLES =================
+# Every look in the resume is a named style defined once in the base
+# document; paragraphs and runs only reference a style name, so the output
+# carries no per-run rPr / per-paragraph pPr and no repeated border XML.
+FONT = "Calibri"
+BLACK = RGBColor(0, 0, 0)
+BLUE = RGBColor(0, 102, 204)
+GRAY = RGBColor(100, 100, 100)
+DIVIDER_GRAY = "B4B4B4"
+
+PARAGRAPH_STYLES = {
+    # name: (base, font size, bold, color, paragraph format)
+    "RG Name": ("Normal", 20, True, None, {"alignment": WD_ALIGN_PARAGRAPH.CENTER}),
+    "RG Contact": ("Normal", 10, None, None, {"alignment": WD_ALIGN_PARAGRAPH.CENTER}),
+    "RG Divider": ("Normal", None, None, None, {
+        "space_before": Pt(2), "space_after": Pt(6), "keep_with_next": True,
+    }),
+    "RG Section Title": ("Normal", 13, True, BLUE, {
+        "space_before": Pt(12), "space_after": Pt(6), "line_spacing": 1.0, "keep_with_next": True,
+    }),
+    "RG Line": ("Normal", 11, None, None, {
+        "space_before": Pt(0), "space_after": Pt(0), "line_spacing": 1.08,
+    }),
+    "RG Bullet": ("Normal", 11, None, None, {
+        "left_indent": Inches(0.25), "first_line_indent": Inches(-0.25),
+        "space_after": Pt(3), "line_spacing": 1.08, "keep_together": True,
+    }),
+    "RG Project Title": ("Normal", 11, True, None, {"space_after": Pt(0), "keep_with_next": True}),
+    "RG Summary": ("Normal", 10.5, None, None, {
+        "space_before": Pt(4), "space_after": Pt(8), "line_spacing": 1.08,
+    }),
+    "RG Body": ("Normal", 10.5, None, None, {"line_spacing": 1.08, "keep_together": True}),
+    "RG Body Keep": ("RG Body", None, None, None, {"keep_with_next": True}),
+}
+
+CHARACTER_STYLES = {
+    # name: (font size, bold, color)
+    "RG Strong": (None, True, None),
+    "RG Link": (None, None, BLUE),
+    "RG Muted": (10.5, None, GRAY),
+}
+
+
+def _apply_font(font, size, bold, color):
+    if size is not None:
+        font.size = Pt(size)
+    if bold is not None:
+        font.bold = bold
+    if color is not None:
+        font.color.rgb = color
+
+
+def add_styles(doc):
+
+    styles = doc.styles
+
+    normal = styles["Normal"]
+    normal.font.name = FONT
+    normal.font.size = Pt(11)
+    normal.font.color.rgb = BLACK
+
+    for name, (base, size, bold, color, fmt) in PARAGRAPH_STYLES.items():
+        style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = styles[base]
+        _apply_font(style.font, size, bold, color)
+        for attr, value in fmt.items():
+            setattr(style.paragraph_format, attr, value)
+
+    styles["RG Line"].paragraph_format.tab_stops.add_tab_stop(Inches(6.4), WD_TAB_ALIGNMENT.RIGHT)
+
+    # Divider border lives in the style, not in every divider paragraph
+    borders = OxmlElement("w:pBdr")
+    bottom = OxmlElement("w:bottom")
+    bottom.set(qn("w:val"), "single")
+    bottom.set(qn("w:sz"), "6")
+    bottom.set(qn("w:space"), "1")
+    bottom.set(qn("w:color"), DIVIDER_GRAY)
+    borders.append(bottom)
+    styles["RG Divider"].element.get_or_add_pPr().append(borders)
+
+    for name, (size, bold, color) in CHARACTER_STYLES.items():
+        style = styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+        _apply_font(style.font, size, bold, color)
+
 
 # ================= PAGE MARGINS =================
 def set_margins(doc):
@@ -28,154 +117,103 @@ def set_margins(doc):
     section.bottom_margin = Inches(1.0)
     section.footer_distance = Inches(0.3)
 
-# ================= SECTION DIVIDER =================
-def add_horizontal_line(doc):
-    p = doc.add_paragraph()
-    fmt = p.paragraph_format
 
-    fmt.space_before = Pt(2)
-    fmt.space_after = Pt(6)
-    fmt.keep_with_next = True 
+# ================= BASE TEMPLATE =================
+_base_template = None
+_style_ids = {}
 
-    p_pr = p._p.get_or_add_pPr()
-    borders = OxmlElement('w:pBdr')
-    bottom = OxmlElement('w:bottom')
 
-    bottom.set(qn('w:val'), 'single')
-    bottom.set(qn('w:sz'), '6')
-    bottom.set(qn('w:space'), '1')
-    bottom.set(qn('w:color'), 'B4B4B4')
+def base_template():
 
-    borders.append(bottom)
-    p_pr.append(borders)
+    # Built once per process; every render starts from these bytes
+    global _base_template
 
-# ================= SECTION TITLE =================
-def add_section_title(doc, title):
-    add_horizontal_line(doc)
-
-    p = doc.add_paragraph()
-    fmt = p.paragraph_format
+    if _base_template is None:
+        doc = Document()
+        set_margins(doc)
+        add_styles(doc)
 
-    fmt.space_before = Pt(12)
-    fmt.space_after = Pt(6)
-    fmt.line_spacing = 1.0
-    fmt.keep_with_next = True   # 🔥 prevents heading alone
+        # python-docx resolves a style name by scanning every style in the
+        # document on each assignment; resolve the ids once per template
+        for name in (*PARAGRAPH_STYLES, *CHARACTER_STYLES):
+            _style_ids[name] = doc.styles[name].style_id
 
-    run = p.add_run(title)
-    set_font(run, 13, bold=True, color=(0,102,204))
-
-# ================= LEFT-RIGHT ALIGN =================
-def add_left_right_line(doc, left_text, right_text, bold_left=False):
-    p = doc.add_paragraph()
-    fmt = p.paragraph_format
+        buffer = BytesIO()
+        doc.save(buffer)
+        _base_template = buffer.getvalue()
 
-    fmt.space_before = Pt(0)
-    fmt.space_after = Pt(0)
-    fmt.line_spacing = 1.08
+    return _base_template
 
-    tab_stops = fmt.tab_stops
-    tab_stops.add_tab_stop(Inches(6.4), WD_TAB_ALIGNMENT.RIGHT)
 
-    left_run = p.add_run(left_text)
-    set_font(left_run, 11, bold_left)
+def new_document():
+    return Document(BytesIO(base_template()))
 
-    p.add_run("\t")
 
-    right_run = p.add_run(right_text)
-    set_font(right_run, 10.5, color=(100,100,100))
+# ================= STYLED PARAGRAPHS / RUNS =================
+# Set w:pStyle / w:rStyle straight from the cached ids instead of going
+# through the name lookup behind paragraph.style / run.style
+def add_paragraph(doc, style, text=""):
+    p = doc.add_paragraph(text)
+    p._p.style = _style_ids[style]
+    return p
 
-# ================= CUSTOM BULLET =================
-def add_bullet(doc, text):
-    p = doc.add_paragraph()
-    fmt = p.paragraph_format
 
-    fmt.left_indent = Inches(0.25)
-    fmt.first_line_indent = Inches(-0.25)
-    fmt.space_after = Pt(3)
-    fmt.line_spacing = 1.08
-    fmt.keep_together = True    # 🔥 prevents bullet split
+def add_run(p, text, style=None):
+    r = p.add_run(text)
+    if style is not None:
+        r._r.style = _style_ids[style]
+    return r
 
-    bullet_run = p.add_run("• ")
-    set_font(bullet_run)
 
-    pattern = r"\*\*(.*?)\*\*"
-    last_end = 0
+# ================= SECTION DIVIDER =================
+def add_horizontal_line(doc):
+    add_paragraph(doc, "RG Divider")
 
-    for match in re.finditer(pattern, text):
-        start, end = match.span()
+# ================= SECTION TITLE =================
+def add_section_title(doc, title):
+    add_horizontal_line(doc)
+    add_paragraph(doc, "RG Section Title", title)
 
-        if start > last_end:
-            normal = text[last_end:start]
-            run = p.add_run(normal)
-            set_font(run)
+# ================= LEFT-RIGHT ALIGN =================
+def add_left_right_line(doc, left_text, right_text, bold_left=False):
+    p = add_paragraph(doc, "RG Line")
+    add_run(p, left_text, "RG Strong" if bold_left else None)
+    p.add_run("\t")
+    add_run(p, right_text, "RG Muted")
 
-        bold = match.group(1)
-        run = p.add_run(bold)
-        set_font(run, bold=True)
+# ================= INLINE BOLD =================
+def add_marked_text(p, text, prefix=""):
 
-        last_end = end
+    # Bold spans become RG Strong runs; plain text stays unstyled
+    if prefix:
+        p.add_run(prefix)
+    for run, bold in parse_inline(text):
+        add_run(p, run, "RG Strong" if bold else None)
 
-    if last_end < len(text):
-        run = p.add_run(text[last_end:])
-        set_font(run)
+# ================= CUSTOM BULLET =================
+def add_bullet(doc, text):
+    p = add_paragraph(doc, "RG Bullet")
+    add_marked_text(p, text, prefix="• ")
 
 # ================= PROJECT TITLE =================
 def add_project_title(doc, title):
-    p = doc.add_paragraph()
-    fmt = p.paragraph_format
-
-    fmt.space_after = Pt(0)
-    fmt.keep_with_next = True   # 🔥 title sticks to bullets
-
-    run = p.add_run(title)
-    set_font(run, 11, bold=True)
+    add_paragraph(doc, "RG Project Title", title)
 
 # ================= SUMMARY BLOCK =================
 def add_summary_block(doc, text):
-    p = doc.add_paragraph()
-    fmt = p.paragraph_format
-
-    fmt.space_before = Pt(4)
-    fmt.space_after = Pt(8)
-    fmt.line_spacing = 1.08
-
-    pattern = r"\*\*(.*?)\*\*"
-    last_end = 0
-
-    for match in re.finditer(pattern, text):
-        start, end = match.span()
-
-        if start > last_end:
-            normal = text[last_end:start]
-            run = p.add_run(normal)
-            set_font(run, 10.5)
-
-        bold = match.group(1)
-        run = p.add_run(bold)
-        set_font(run, 10.5, bold=True)
-
-        last_end = end
-
-    if last_end < len(text):
-        run = p.add_run(text[last_end:])
-        set_font(run, 10.5)
+    p = add_paragraph(doc, "RG Summary")
+    add_marked_text(p, text)
 
 # ================= HEADER =================
 def add_header(doc, header):
 
-    name_para = doc.add_paragraph()
-    name_run = name_para.add_run(header.get("name", ""))
-    set_font(name_run, 20, bold=True)
-    name_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    add_paragraph(doc, "RG Name", header.get("name", ""))
 
-    contact_para = doc.add_paragraph()
-    contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    contact_para = add_paragraph(doc, "RG Contact")
 
     def icon_run(p, icon, text):
-        r1 = p.add_run(icon + " ")
-        set_font(r1, 10)
-        r2 = p.add_run(text + "   ")
-        set_font(r2, 10, color=(0,102,204))
+        p.add_run(icon + " ")
+        add_run(p, text + "   ", "RG Link")
 
     if header.get("phone"):
         icon_run(contact_para, "☎", header.get("phone"))
@@ -187,10 +225,9 @@ def add_header(doc, header):
         icon_run(contact_para, "🐙", header.get("github"))
 
 # ================= MAIN GENERATOR =================
-def generate_docx_from_template(resume):
+def build_docx(resume):
 
-    doc = Document()
-    set_margins(doc)
+    doc = new_document()
 
     add_header(doc, resume.get("header", {}))
 
@@ -223,20 +260,10 @@ def generate_docx_from_template(resume):
             for bullet in proj.get("bullets", []):
                 add_bullet(doc, bullet)
 
-    coursework = resume.get("coursework", [])
     coursework = resume.get("coursework", [])
     if coursework:
         add_section_title(doc, "Relevant Coursework")
-
-        p = doc.add_paragraph()
-        fmt = p.paragraph_format
-
-        fmt.line_spacing = 1.08
-        fmt.keep_together = True
-        # no keep_with_next needed (single line)
-
-        run = p.add_run(" • ".join(coursework))
-        set_font(run, 10.5, bold=False)
+        add_paragraph(doc, "RG Body", " • ".join(coursework))
 
     skills = resume.get("skills", {})
     if skills:
@@ -245,22 +272,61 @@ def generate_docx_from_template(resume):
         skill_items = list(skills.items())
 
         for i, (category, items) in enumerate(skill_items):
+            # 🔥 glue all lines except last one
+            style = "RG Body Keep" if i != len(skill_items) - 1 else "RG Body"
+            add_marked_text(add_paragraph(doc, style), f"{category}: {', '.join(items)}")
 
-            p = doc.add_paragraph()
-            fmt = p.paragraph_format
+    return doc
 
-            fmt.line_spacing = 1.08
-            fmt.keep_together = True
 
-            # 🔥 glue all lines except last one
-            if i != len(skill_items) - 1:
-                fmt.keep_with_next = True
+def render_docx_bytes(resume):
+
+    # Whole document rendered in memory, no file round trip
+    with span("render_docx"):
+        buffer = BytesIO()
+        build_docx(resume).save(buffer)
+        return buffer.getvalue()
+
+
+# ================= SPOOL (OPTIONAL DISK COPY) =================
+def cleanup_spool(spool_dir=SPOOL_DIR, ttl=SPOOL_TTL):
+    try:
+        names = os.listdir(spool_dir)
+    except OSError:
+        return
+
+    cutoff = time.time() - ttl
+    for name in names:
+        path = os.path.join(spool_dir, name)
+        try:
+            if name.endswith(".docx") and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            continue
+
 
-            run = p.add_run(f"{category}: {', '.join(items)}")
-            set_font(run, 10.5, bold=False)
+def generate_docx_from_template(resume, spool_dir=SPOOL_DIR):
 
+    os.makedirs(spool_dir, exist_ok=True)
+    cleanup_spool(spool_dir)
+
+    # uuid suffix: two renders in the same second no longer collide
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output = os.path.join(BASE_DIR, f"Generated_Resume_{timestamp}.docx")
+    output = os.path.join(spool_dir, f"Generated_Resume_{timestamp}_{uuid.uuid4().hex[:8]}.docx")
+
+    with open(output, "wb") as f:
+        f.write(render_docx_bytes(resume))
+    return output
+
+
+# ================= BATCH ZIP =================
+def build_docx_zip(entries):
+
+    # entries: [(filename, resume), ...] -> bytes of a .zip with one DOCX each
+    buffer = BytesIO()
+
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for filename, resume in entries:
+            archive.writestr(filename, render_docx_bytes(resume))
 
-    doc.save(output)
-    return output
\ No newline at end of file
+    return buffer.getvalue()
@@ -0,0 +1,132 @@
+import os
+import time
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+# ================= GENERATION POOL =================
+# One pool per process caps how many generations hit the provider at once.
+# Work is queued per session and workers take sessions round-robin, so one
+# tab submitting ten batch JDs can't starve another user's single Generate.
+#
+#   future = get_pool().submit(session_id, fn, *args)
+#   get_pool().metrics()   # queue depth, running, wait / run percentiles
+
+MAX_CONCURRENCY = int(os.getenv("RESUMEGENIE_MAX_CONCURRENCY", "4"))
+METRIC_WINDOW = 500       # recent samples kept for percentiles
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+class GenerationPool:
+
+    def __init__(self, max_concurrency=MAX_CONCURRENCY):
+        self.max_concurrency = max(1, max_concurrency)
+        self._cond = threading.Condition()
+        self._queues = OrderedDict()          # session -> deque of tasks, in turn order
+        self._threads = []
+        self._running = 0
+
+        self.wait_times = deque(maxlen=METRIC_WINDOW)
+        self.run_times = deque(maxlen=METRIC_WINDOW)
+        self.counters = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0}
+
+    # ---------- submission ----------
+    def submit(self, session, fn, *args):
+        future = Future()
+        with self._cond:
+            self._queues.setdefault(session, deque()).append((future, fn, args, time.monotonic()))
+            self.counters["submitted"] += 1
+            self._ensure_workers()
+            self._cond.notify()
+        return future
+
+    def note_coalesced(self):
+        # Callers that attach to an in-flight request instead of submitting
+        with self._cond:
+            self.counters["coalesced"] += 1
+
+    def _ensure_workers(self):
+        # Started lazily, so importing the module costs nothing
+        while len(self._threads) < self.max_concurrency:
+            thread = threading.Thread(
+                target=self._worker, name=f"resumegenie-gen-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    # ---------- scheduling ----------
+    def _next_task(self):
+        # Round-robin: take the head of the first session's queue, then move
+        # that session to the back of the line
+        session, queue = next(iter(self._queues.items()))
+        task = queue.popleft()
+        del self._queues[session]
+        if queue:
+            self._queues[session] = queue
+        return task
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queues:
+                    self._cond.wait()
+                future, fn, args, enqueued = self._next_task()
+                self._running += 1
+
+            started = time.monotonic()
+            ok = False
+            try:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(fn(*args))
+                    ok = True
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self.wait_times.append(started - enqueued)
+                    self.run_times.append(time.monotonic() - started)
+                    self.counters["completed" if ok else "failed"] += 1
+
+    # ---------- metrics ----------
+    def queue_depth(self):
+        with self._cond:
+            return sum(len(q) for q in self._queues.values())
+
+    def metrics(self):
+        with self._cond:
+            waits = list(self.wait_times)
+            runs = list(self.run_times)
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": self._running,
+                "queue_depth": sum(len(q) for q in self._queues.values()),
+                "queued_sessions": len(self._queues),
+                "wait_p50": percentile(waits, 0.5),
+                "wait_p95": percentile(waits, 0.95),
+                "run_p50": percentile(runs, 0.5),
+                "run_p95": percentile(runs, 0.95),
+                **self.counters,
+            }
+
+
+# ================= SHARED POOL =================
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = GenerationPool()
+
+    return _pool
@@ -0,0 +1,80 @@
+import re
+from functools import lru_cache
+
+# ================= INLINE MARKUP =================
+# The generated resume uses one inline format: **bold**. Every backend (DOCX,
+# PDF, Streamlit preview) consumes the same run list from parse_inline, which
+# is memoized by content, so a bullet rendered to several outputs is tokenized
+# once.
+#
+#   "Built **RAG** at \*scale"  ->  (("Built ", False), ("RAG", True), (" at *scale", False))
+#
+# Recovery rules for model output:
+# - \* and \\ are literal characters, never markers
+# - an unclosed ** is dropped, the text after it stays plain
+# - empty spans (****) produce nothing
+
+_TOKEN = re.compile(r"\\([\\*])|\*\*")
+
+# Characters Streamlit markdown would otherwise interpret
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_$<>\[\]#|~])")
+
+CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_inline(text):
+
+    # -> tuple of (text, bold) runs; adjacent runs never share a weight
+    if "*" not in text and "\\" not in text:
+        return ((text, False),) if text else ()
+
+    pieces = []      # str for text, None for a ** marker
+    last = 0
+    for match in _TOKEN.finditer(text):
+        if match.start() > last:
+            pieces.append(text[last:match.start()])
+        pieces.append(match.group(1) if match.group(1) else None)
+        last = match.end()
+    if last < len(text):
+        pieces.append(text[last:])
+
+    markers = sum(1 for p in pieces if p is None)
+    if markers % 2:
+        # Unbalanced: the last opener never closes, drop it
+        drop = max(i for i, p in enumerate(pieces) if p is None)
+        del pieces[drop]
+
+    runs = []
+    bold = False
+    for piece in pieces:
+        if piece is None:
+            bold = not bold
+        elif runs and runs[-1][1] == bold:
+            runs[-1] = (runs[-1][0] + piece, bold)
+        else:
+            runs.append((piece, bold))
+
+    return tuple(run for run in runs if run[0])
+
+
+def plain_text(text):
+    return "".join(run for run, _ in parse_inline(text))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def to_markdown(text):
+
+    # Normalized markdown: literal characters escaped, bold re-emitted from
+    # the run list so stray markers can't leak into the preview
+    out = []
+    for run, bold in parse_inline(text):
+        escaped = _MARKDOWN_SPECIAL.sub(r"\\\1", run)
+        if bold and run.strip():
+            # Markdown bold can't start or end on whitespace
+            lead = escaped[: len(escaped) - len(escaped.lstrip())]
+            trail = escaped[len(escaped.rstrip()):]
+            out.append(f"{lead}**{escaped.strip()}**{trail}")
+        else:
+            out.append(escaped)
+    return "".join(out)
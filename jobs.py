@@ -0,0 +1,207 @@
+import os
+import time
+import uuid
+import threading
+from llm_cache import make_cache_key
+from generation_pool import get_pool
+from metrics import request, span
+
+# ================= BACKGROUND JOBS =================
+# Generation runs off the Streamlit script thread. A handler submits a job,
+# keeps only its id in session state, and a polling fragment reads status and
+# partial sections until the job finishes, so the page stays interactive and
+# reruns (or a second tab) don't lose in-flight work.
+#
+# Jobs run on the process-wide GenerationPool (concurrency cap, fair across
+# sessions). Submitting inputs identical to an unfinished job returns that
+# job's id instead of starting another upstream call, so a double click or
+# two tabs share one generation and its progress.
+#
+#   job_id = get_jobs().submit_generate(session_id, payload, jd)
+#   job = get_jobs().get(job_id)      # job.status, job.sections, job.result
+
+JOB_TTL = int(os.getenv("RESUMEGENIE_JOB_TTL", "1800"))     # seconds a finished job is kept
+
+QUEUED = "queued"
+CALLING_MODEL = "calling model"
+PARSING = "parsing"
+RENDERING = "rendering"
+DONE = "done"
+FAILED = "failed"
+
+FINISHED = (DONE, FAILED)
+
+
+class Job:
+
+    def __init__(self, kind, key, payload, jd, feedback=None, parent_id=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.key = key
+        self.payload = payload
+        self.jd = jd
+        self.feedback = feedback
+        self.parent_id = parent_id
+
+        self.status = QUEUED
+        self.sections = {}          # partial resume, filled as sections arrive
+        self.result = None
+        self.error = None
+        self.version_id = None
+        self.docx = None
+        self.pdf = None
+
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def set_status(self, status):
+        with self._lock:
+            self.status = status
+            if status == CALLING_MODEL and self.started_at is None:
+                self.started_at = time.time()
+            if status in FINISHED:
+                self.finished_at = time.time()
+
+    def add_section(self, key, value):
+        with self._lock:
+            self.sections[key] = value
+
+    def snapshot(self):
+        # Consistent copy for the UI thread
+        with self._lock:
+            return {"status": self.status, "sections": dict(self.sections), "error": self.error}
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    @property
+    def elapsed(self):
+        return (self.finished_at or time.time()) - self.created_at
+
+
+class JobManager:
+
+    def __init__(self, pool=None):
+        self.pool = pool or get_pool()
+        self.jobs = {}
+        self.inflight = {}          # input key -> unfinished job
+        self._lock = threading.Lock()
+
+    def get(self, job_id):
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def _start(self, session, kind, key_parts, payload, jd, feedback, parent_id, work, *args):
+
+        # Single flight: identical inputs attach to the job already running
+        key = make_cache_key(kind, payload, jd, feedback or "", parent_id, *key_parts)
+
+        with self._lock:
+            existing = self.inflight.get(key)
+            if existing is not None and not existing.finished:
+                self.pool.note_coalesced()
+                return existing.id
+
+            # Drop finished jobs nobody picked up
+            cutoff = time.time() - JOB_TTL
+            for stale in [j for j in self.jobs.values() if j.finished and j.finished_at < cutoff]:
+                del self.jobs[stale.id]
+
+            job = Job(kind, key, payload, jd, feedback, parent_id)
+            self.jobs[job.id] = job
+            self.inflight[key] = job
+
+        self.pool.submit(session, self._run, job, work, *args)
+        return job.id
+
+    # ---------- submission ----------
+    def submit_generate(self, session, payload, jd, feedback=None, parent_id=None, use_cache=True, parallel=None):
+        kind = "revise" if feedback else "generate"
+        return self._start(
+            session, kind, (use_cache, parallel), payload, jd, feedback, parent_id,
+            self._generate, use_cache, parallel
+        )
+
+    def submit_revise(self, session, current_resume, feedback, payload, jd, parent_id=None, use_cache=True):
+        return self._start(
+            session, "revise", (use_cache, current_resume), payload, jd, feedback, parent_id,
+            self._revise, current_resume, use_cache
+        )
+
+    # ---------- workers ----------
+    def _generate(self, job, use_cache, parallel):
+        from llm import enhance_resume, drain
+
+        job.set_status(CALLING_MODEL)
+        sections = enhance_resume(
+            job.payload, job.jd, feedback=job.feedback, use_cache=use_cache, stream=True, parallel=parallel
+        )
+
+        def on_section(key, value):
+            if job.status != PARSING:
+                job.set_status(PARSING)
+            job.add_section(key, value)
+
+        # The finalized resume, not the streamed events: finalize may drop
+        # keys or sections that were already shown
+        return drain(sections, on_section)
+
+    def _revise(self, job, current_resume, use_cache):
+        from llm import revise_resume
+
+        job.set_status(CALLING_MODEL)
+        result = revise_resume(current_resume, job.feedback, job.payload, job.jd, use_cache=use_cache)
+        job.set_status(PARSING)
+        for key, value in result.items():
+            job.add_section(key, value)
+        return result
+
+    def _run(self, job, work, *args):
+        try:
+            with request(job.kind, job_id=job.id):
+                result = work(job, *args)
+
+                job.set_status(RENDERING)
+                from pdf_gen import render_pdf_bytes
+                job.pdf = render_pdf_bytes(result)
+                try:
+                    from doc_gen import render_docx_bytes
+                    job.docx = render_docx_bytes(result)
+                except ImportError:
+                    job.docx = None
+
+                from versions import get_versions
+                with span("save_version"):
+                    job.version_id = get_versions().record(
+                        result, job.payload, job.jd, feedback=job.feedback, parent_id=job.parent_id
+                    )
+
+            job.result = result
+            job.set_status(DONE)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.set_status(FAILED)
+            raise               # counted as failed in the pool metrics
+        finally:
+            with self._lock:
+                if self.inflight.get(job.key) is job:
+                    del self.inflight[job.key]
+
+
+# ================= SHARED MANAGER =================
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_jobs():
+    global _manager
+
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+
+    return _manager
@@ -0,0 +1,144 @@
+import copy
+
+# ================= RFC 6902 JSON PATCH =================
+# Just enough of the spec to apply model-written edits to a generated resume:
+# add / remove / replace / move / copy / test with RFC 6901 pointers.
+
+OPS = ("add", "remove", "replace", "move", "copy", "test")
+
+
+class JsonPatchError(ValueError):
+    pass
+
+
+def parse_pointer(pointer):
+    if pointer == "":
+        return []
+    if not isinstance(pointer, str) or not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer: {pointer!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer[1:].split("/")]
+
+
+def _list_index(container, token, allow_end=False):
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise JsonPatchError(f"Invalid list index: {token!r}")
+    index = int(token)
+    limit = len(container) + (1 if allow_end else 0)
+    if index >= limit:
+        raise JsonPatchError(f"List index out of range: {index}")
+    return index
+
+
+def _resolve(doc, tokens):
+    # Returns the container holding the last token
+    target = doc
+    for token in tokens[:-1]:
+        if isinstance(target, dict):
+            if token not in target:
+                raise JsonPatchError(f"Path not found: {token!r}")
+            target = target[token]
+        elif isinstance(target, list):
+            target = target[_list_index(target, token)]
+        else:
+            raise JsonPatchError(f"Cannot descend into {type(target).__name__}")
+    return target
+
+
+def _get(doc, tokens):
+    if not tokens:
+        return doc
+    parent = _resolve(doc, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        return parent[token]
+    if isinstance(parent, list):
+        return parent[_list_index(parent, token)]
+    raise JsonPatchError(f"Cannot index into {type(parent).__name__}")
+
+
+def _add(doc, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_list_index(parent, token, allow_end=True), value)
+    else:
+        raise JsonPatchError(f"Cannot add into {type(parent).__name__}")
+    return doc
+
+
+def _remove(doc, tokens):
+    if not tokens:
+        raise JsonPatchError("Cannot remove the document root")
+    parent = _resolve(doc, tokens)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise JsonPatchError(f"Path not found: {token!r}")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_list_index(parent, token))
+    raise JsonPatchError(f"Cannot remove from {type(parent).__name__}")
+
+
+def validate_patch(patch):
+    if not isinstance(patch, list):
+        raise JsonPatchError("Patch must be a list of operations")
+
+    for op in patch:
+        if not isinstance(op, dict) or op.get("op") not in OPS:
+            raise JsonPatchError(f"Invalid operation: {op!r}")
+        if "path" not in op:
+            raise JsonPatchError(f"Operation missing path: {op!r}")
+        if op["op"] in ("add", "replace", "test") and "value" not in op:
+            raise JsonPatchError(f"Operation missing value: {op!r}")
+        if op["op"] in ("move", "copy") and "from" not in op:
+            raise JsonPatchError(f"Operation missing from: {op!r}")
+
+
+def apply_patch(doc, patch):
+
+    # Atomic: works on a deep copy, so a failing op leaves `doc` untouched
+    validate_patch(patch)
+    doc = copy.deepcopy(doc)
+
+    for op in patch:
+        tokens = parse_pointer(op["path"])
+        kind = op["op"]
+
+        if kind == "add":
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+
+        elif kind == "remove":
+            _remove(doc, tokens)
+
+        elif kind == "replace":
+            _get(doc, tokens)   # must already exist
+            if tokens:
+                _remove(doc, tokens)
+            doc = _add(doc, tokens, copy.deepcopy(op["value"]))
+
+        elif kind == "move":
+            source = parse_pointer(op["from"])
+            if tokens[:len(source)] == source and len(tokens) > len(source):
+                raise JsonPatchError("Cannot move a value into itself")
+            value = _get(doc, source)
+            _remove(doc, source)
+            doc = _add(doc, tokens, value)
+
+        elif kind == "copy":
+            value = copy.deepcopy(_get(doc, parse_pointer(op["from"])))
+            doc = _add(doc, tokens, value)
+
+        elif kind == "test":
+            if _get(doc, tokens) != op["value"]:
+                raise JsonPatchError(f"Test failed at {op['path']}")
+
+    return doc
@@ -0,0 +1,317 @@
+import re
+import json
+
+# ================= JSON REPAIR =================
+# Turns almost-valid model output into a dict without another model call.
+# Fast path is json's C decoder via raw_decode; only when that fails does the
+# lenient scanner below rebuild the text, recording each fix it applies.
+
+_decoder = json.JSONDecoder()
+
+OPEN_QUOTES = {'"': '"', "“": "”", "”": "”", "'": "'"}
+CLOSERS = {"{": "}", "[": "]"}
+LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+    "NaN": "null", "Infinity": "null",
+}
+VALID_ESCAPES = set('"\\/bfnrtu')
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?")
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_\-]*")
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_WS = " \t\r\n"
+_WS_RUN = re.compile(r"[ \t\r\n]+")
+
+# Runs of characters that need no attention inside a string, per opener
+_PLAIN = {
+    '"': re.compile(r'[^"\\\x00-\x1f]+'),
+    "“": re.compile(r'[^"”\\\x00-\x1f]+'),
+    "”": re.compile(r'[^"”\\\x00-\x1f]+'),
+    "'": re.compile(r"[^'\"\\\x00-\x1f]+"),
+}
+
+
+class _Scanner:
+
+    def __init__(self, text, start):
+        self.text = text
+        self.i = start
+        self.out = []
+        self.stack = []      # [opener, state]; state: key/colon/value/comma
+        self.repairs = []
+
+    def note(self, repair):
+        if repair not in self.repairs:
+            self.repairs.append(repair)
+
+    # ---------- helpers ----------
+    def state(self):
+        return self.stack[-1][1] if self.stack else None
+
+    def set_state(self, state):
+        if self.stack:
+            self.stack[-1][1] = state
+
+    def before_value(self):
+        # Called before a string / number / literal / container begins
+        if self.state() == "comma":
+            self.out.append(",")
+            self.note("missing_comma")
+            self.set_state("key" if self.stack[-1][0] == "{" else "value")
+
+    def after_value(self, is_key=False):
+        if is_key:
+            self.set_state("colon")
+        else:
+            self.set_state("comma")
+
+    def next_significant(self, j):
+        text = self.text
+        n = len(text)
+        while j < n:
+            if text[j] in _WS:
+                j += 1
+            elif text.startswith("//", j):
+                end = text.find("\n", j)
+                j = n if end == -1 else end + 1
+            elif text.startswith("/*", j):
+                end = text.find("*/", j + 2)
+                j = n if end == -1 else end + 2
+            else:
+                return text[j]
+        return None
+
+    # ---------- strings ----------
+    def read_string(self):
+        text = self.text
+        n = len(text)
+        opener = text[self.i]
+        closer = OPEN_QUOTES[opener]
+        if opener != '"':
+            self.note("smart_quotes" if opener != "'" else "single_quotes")
+
+        chars = ['"']
+        j = self.i + 1
+        plain = _PLAIN[opener]
+
+        while j < n:
+            run = plain.match(text, j)
+            if run:
+                chars.append(run.group(0))
+                j = run.end()
+                continue
+            c = text[j]
+            if c == "\\":
+                if j + 1 >= n:
+                    j += 1
+                    break
+                nxt = text[j + 1]
+                if nxt in VALID_ESCAPES and (nxt != "u" or _HEX4.match(text, j + 2)):
+                    chars.append(c + nxt)
+                elif nxt == "'" and opener == "'":
+                    chars.append("'")
+                else:
+                    chars.append("\\\\" + nxt)
+                    self.note("invalid_escape")
+                j += 2
+                continue
+            if c == closer or (opener != '"' and c == '"' and closer != "'"):
+                self.i = j + 1
+                chars.append('"')
+                return "".join(chars)
+            if c == '"':
+                chars.append('\\"')
+            elif ord(c) < 0x20:
+                chars.append(json.dumps(c)[1:-1])
+                self.note("control_characters")
+            else:
+                chars.append(c)
+            j += 1
+
+        # Ran off the end of the buffer mid-string (max_tokens truncation)
+        self.i = n
+        self.note("truncated_string")
+        chars.append('"')
+        return "".join(chars)
+
+    # ---------- main loop ----------
+    def scan(self):
+        text = self.text
+        n = len(text)
+
+        while self.i < n:
+            ch = text[self.i]
+
+            if ch in _WS:
+                run = _WS_RUN.match(text, self.i)
+                self.out.append(run.group(0))
+                self.i = run.end()
+
+            elif ch in OPEN_QUOTES:
+                is_key = self.state() == "key" or (self.state() == "comma" and self.stack[-1][0] == "{")
+                self.before_value()
+                self.out.append(self.read_string())
+                self.after_value(is_key=is_key)
+
+            elif ch in CLOSERS:
+                self.before_value()
+                if self.stack and self.stack[-1][0] == "{" and self.state() == "key":
+                    self.note("non_string_key")
+                self.after_value()     # parent's value is this container
+                self.stack.append([ch, "key" if ch == "{" else "value"])
+                self.out.append(ch)
+                self.i += 1
+
+            elif ch in "}]":
+                self.close_dangling()
+                expected = CLOSERS[self.stack[-1][0]]
+                if ch != expected:
+                    self.note("mismatched_bracket")
+                self.out.append(expected)
+                self.stack.pop()
+                self.i += 1
+                if not self.stack:
+                    return
+                self.after_value()
+
+            elif ch == ":":
+                if self.state() == "colon":
+                    self.out.append(":")
+                    self.set_state("value")
+                else:
+                    self.note("stray_text")
+                self.i += 1
+
+            elif ch == ",":
+                nxt = self.next_significant(self.i + 1)
+                if self.state() != "comma":
+                    self.note("extra_comma")
+                elif nxt in ("}", "]", None):
+                    self.note("trailing_comma")
+                else:
+                    self.out.append(",")
+                    self.set_state("key" if self.stack[-1][0] == "{" else "value")
+                self.i += 1
+
+            elif text.startswith("//", self.i) or text.startswith("/*", self.i):
+                end_marker = "\n" if text[self.i + 1] == "/" else "*/"
+                end = text.find(end_marker, self.i + 2)
+                self.i = n if end == -1 else end + len(end_marker)
+                self.note("comments")
+
+            else:
+                self.read_bare()
+
+        self.note("truncated")
+
+    def read_bare(self):
+        text = self.text
+
+        number = _NUMBER.match(text, self.i)
+        if number and self.state() != "key":
+            self.before_value()
+            self.out.append(number.group(0))
+            self.i = number.end()
+            self.after_value()
+            return
+
+        word = _WORD.match(text, self.i)
+        if word:
+            token = word.group(0)
+            if self.state() in ("key", "comma") and self.stack and self.stack[-1][0] == "{" and token not in LITERALS:
+                self.before_value()
+                self.out.append(json.dumps(token))
+                self.note("unquoted_key")
+                self.after_value(is_key=True)
+            elif token in LITERALS:
+                if LITERALS[token] != token:
+                    self.note("python_literals")
+                self.before_value()
+                self.out.append(LITERALS[token])
+                self.after_value()
+            elif word.end() == len(text) and any(lit.startswith(token) for lit in ("true", "false", "null")):
+                completed = next(lit for lit in ("true", "false", "null") if lit.startswith(token))
+                self.before_value()
+                self.out.append(completed)
+                self.note("truncated_literal")
+                self.after_value()
+            else:
+                self.note("stray_text")
+            self.i = word.end()
+            return
+
+        self.note("stray_text")
+        self.i += 1
+
+    def close_dangling(self):
+        # Key with no value yet ("summary": <end>) becomes null
+        state = self.state()
+        if state == "colon":
+            self.out.append(": null")
+            self.note("dangling_key")
+        elif state == "value" and self.stack[-1][0] == "{":
+            self.out.append("null")
+            self.note("dangling_key")
+        if self.stack and self.stack[-1][0] == "{" and state in ("colon", "value"):
+            self.set_state("comma")
+
+    def finish(self):
+        while self.stack:
+            self.close_dangling()
+            self.out.append(CLOSERS[self.stack.pop()[0]])
+        return "".join(self.out)
+
+
+def _object_starts(text, limit=5):
+    start = text.find("{")
+    while start != -1 and limit:
+        yield start
+        start = text.find("{", start + 1)
+        limit -= 1
+
+
+def repair_json(raw):
+
+    # -> (dict, [repairs applied]); raises ValueError when nothing usable
+    text = raw.strip()
+    if not text:
+        raise ValueError("Model returned an empty response")
+
+    # Fast path: first '{' that decodes cleanly, anything after it is ignored.
+    # Later braces are only tried while the prefix still looks like prose, so
+    # an inner object of a truncated document is never mistaken for the root.
+    for start in _object_starts(text):
+        if '"' in text[:start]:
+            break
+        try:
+            obj, end = _decoder.raw_decode(text, start)
+        except ValueError:
+            continue
+        repairs = []
+        if start and text[:start].strip().strip("`").strip().lower() not in ("", "json"):
+            repairs.append("leading_text")
+        if text[end:].strip().strip("`").strip():
+            repairs.append("trailing_text")
+        return obj, repairs
+
+    start = text.find("{")
+    if start == -1:
+        raise ValueError("Model did not return JSON:\n" + raw)
+
+    scanner = _Scanner(text, start)
+    scanner.stack.append(["{", "key"])
+    scanner.out.append("{")
+    scanner.i = start + 1
+    scanner.scan()
+    fixed = scanner.finish()
+
+    try:
+        obj = json.loads(fixed)
+    except ValueError as e:
+        raise ValueError(f"Could not repair model JSON ({e}):\n" + raw) from e
+
+    if scanner.i < len(text) and text[scanner.i:].strip().strip("`").strip():
+        scanner.note("trailing_text")
+
+    return obj, scanner.repairs
@@ -0,0 +1,121 @@
+import json
+
+WHITESPACE = " \t\r\n"
+
+
+# ================= STREAMING SECTION PARSER =================
+# Feed completion chunks as they arrive; every call returns the (key, value)
+# pairs of top-level sections that finished inside that chunk, so the preview
+# can show "header", "summary", ... before the rest of the JSON exists.
+class SectionStreamParser:
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.result = {}
+        self.started = False
+        self.done = False
+        self.failed = False       # a section wasn't valid JSON; caller re-parses the whole text
+
+        self._state = "key"       # key -> colon -> value -> comma
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._token_start = None
+        self._key = None
+
+    def feed(self, chunk):
+        if self.done or not chunk:
+            return []
+
+        self.buffer += chunk
+        if self.failed:
+            return []
+
+        emitted = []
+        try:
+            self._scan(emitted)
+        except ValueError:
+            # Near-valid output (trailing comma, smart quotes...) is left to
+            # the repair pass once the stream ends; stop emitting here
+            self.failed = True
+        return emitted
+
+    def _scan(self, emitted):
+        buf = self.buffer
+        i = self.pos
+
+        while i < len(buf):
+            ch = buf[i]
+
+            # ================= INSIDE STRING =================
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._state == "key":
+                            self._key = json.loads(buf[self._token_start:i + 1])
+                            self._token_start = None
+                            self._state = "colon"
+                        elif self._state == "value":
+                            self._emit(buf, i + 1, emitted)
+                i += 1
+                continue
+
+            # ================= BEFORE OBJECT =================
+            if not self.started:
+                # skips markdown fences / prose before the first brace
+                if ch == "{":
+                    self.started = True
+                    self._depth = 1
+                i += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._state in ("key", "value") and self._token_start is None:
+                    self._token_start = i
+
+            elif ch in "{[":
+                if self._depth == 1 and self._state == "value" and self._token_start is None:
+                    self._token_start = i
+                self._depth += 1
+
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._state == "value":
+                    self._emit(buf, i + 1, emitted)
+                elif self._depth == 0:
+                    # scalar values (numbers, true/false/null) end at the brace
+                    if self._state == "value" and self._token_start is not None:
+                        self._emit(buf, i, emitted)
+                    self.done = True
+                    i += 1
+                    break
+
+            elif self._depth == 1:
+                if ch == ":" and self._state == "colon":
+                    self._state = "value"
+                elif ch == ",":
+                    if self._state == "value" and self._token_start is not None:
+                        self._emit(buf, i, emitted)
+                    self._state = "key"
+                elif ch not in WHITESPACE and self._state == "value" and self._token_start is None:
+                    self._token_start = i
+
+            i += 1
+
+        self.pos = i
+
+    def _emit(self, buf, end, emitted):
+        value = json.loads(buf[self._token_start:end])
+        self.result[self._key] = value
+        emitted.append((self._key, value))
+
+        self._key = None
+        self._token_start = None
+        self._state = "comma"
@@ -1,35 +1,301 @@
 import os
 import json
-import re
-from openai import OpenAI
-from dotenv import load_dotenv
-
-load_dotenv()
+import time
+import random
+import threading
+import upstream
+from metrics import (
+    Histogram, LATENCY_BUCKETS, TOKEN_BUCKETS, span, current,
+    record_stage, record_cache, record_ttft, record_usage, record_json_repairs, record_fallback,
+)
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from llm_cache import response_cache, make_cache_key
+from json_stream import SectionStreamParser
+from json_patch import apply_patch
+from json_repair import repair_json
+from resume_rules import check_resume, score_resume, apply_local_fixes, build_fixup_request, apply_fixup
+from resume_schema import SECTION_ORDER, RESPONSE_FORMAT, validate_resume, invalid_sections, format_errors
+
+# Point at a local stand-in (benchmarks/mock_openrouter.py) for offline load tests
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+
+# ================= CLIENT (LAZY) =================
+# openai/httpx and .env loading are deferred to the first model call so
+# importing this module is cheap and works without a key.
+MAX_CONNECTIONS = int(os.getenv("RESUMEGENIE_MAX_CONNECTIONS", "20"))
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-if OPENROUTER_API_KEY is None:
-    raise RuntimeError("OPENROUTER_API_KEY not found")
+    if _client is not None:
+        return _client
 
-client = OpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=OPENROUTER_API_KEY,
-)
+    with _client_lock:
+        if _client is None:
+            from dotenv import load_dotenv
+            import httpx
+            from openai import OpenAI, DefaultHttpxClient
 
-def safe_json_parse(raw):
-    raw = raw.strip()
+            load_dotenv()
 
-    # Remove markdown fences
-    raw = re.sub(r"^```(?:json)?", "", raw)
-    raw = re.sub(r"```$", "", raw)
+            api_key = os.getenv("OPENROUTER_API_KEY")
+            if api_key is None:
+                raise RuntimeError("OPENROUTER_API_KEY not found")
 
-    # Extract first JSON object from text
-    match = re.search(r"\{.*\}", raw, re.DOTALL)
-    if not match:
-        raise ValueError("Model did not return JSON:\n" + raw)
+            # One pooled client per process; keep-alive connections are reused
+            # across generations, batch workers and Streamlit sessions
+            _client = OpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=api_key,
+                http_client=DefaultHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_CONNECTIONS,
+                        keepalive_expiry=60,
+                    )
+                ),
+            )
+
+    return _client
+
+
+MODEL = "google/gemini-2.0-flash-001"
+
+# Bump whenever the prompt text changes so stale cached responses are not reused
+PROMPT_VERSION = 1
+
+# Ask for JSON-schema constrained output; models that reject it are
+# remembered and served the plain prompt from then on
+STRUCTURED_OUTPUT = os.getenv("RESUMEGENIE_STRUCTURED_OUTPUT", "1").lower() not in ("0", "false", "off")
+_no_structured_output = set()
+
+# Print every raw model response (off by default; request log lines carry sizes)
+DEBUG_RAW_OUTPUT = os.getenv("RESUMEGENIE_DEBUG_RAW", "0").lower() in ("1", "true", "on")
+
+# Check bullets/counts against the prompt's hard rules and fix offenders
+ENFORCE_RULES = os.getenv("RESUMEGENIE_ENFORCE_RULES", "1").lower() not in ("0", "false", "off")
+
+# ================= RATE LIMITS / BATCH =================
+# Retries, backoff, deadlines, hedging and model fallback live in upstream.py
+BATCH_MAX_WORKERS = int(os.getenv("RESUMEGENIE_BATCH_WORKERS", "4"))
+
+# Split generation into concurrent per-section requests (see section_gen.py)
+PARALLEL_SECTIONS = os.getenv("RESUMEGENIE_PARALLEL_SECTIONS", "0").lower() in ("1", "true", "on")
+
+
+# ================= MODEL ROUTER =================
+# A full generation, a feedback patch and a one-bullet fix-up differ ~10x in
+# prompt size, so they don't need the same model. Each request is classified,
+# served by the model configured for its class and observed (latency, tokens).
+# Once a class has samples, it moves to the fastest healthy model whose
+# observed cost per request stays under the ceiling.
+#
+#   RESUMEGENIE_ROUTES="generate=google/gemini-2.0-flash-001,fixup=openai/gpt-4o-mini"
+
+GENERATE = "generate"   # full resume, single prompt or per section
+REVISE = "revise"       # feedback applied as a JSON patch
+FIXUP = "fixup"         # schema repair / rule fix-up of a few lines
+
+REQUEST_KINDS = (GENERATE, REVISE, FIXUP)
+
+# USD per 1M (prompt, completion) tokens. Unpriced models are only used for
+# a class they are configured for.
+MODEL_PRICES = {
+    "google/gemini-2.0-flash-001": (0.10, 0.40),
+    "google/gemini-2.0-flash-lite-001": (0.075, 0.30),
+    "openai/gpt-4o-mini": (0.15, 0.60),
+}
+
+DEFAULT_ROUTES = {
+    GENERATE: MODEL,
+    REVISE: "google/gemini-2.0-flash-lite-001",
+    FIXUP: "google/gemini-2.0-flash-lite-001",
+}
+
+COST_CEILING = float(os.getenv("RESUMEGENIE_COST_CEILING", "0.002"))   # USD per request
+ROUTE_MIN_SAMPLES = 10    # observations before a model competes for a class
+ROUTE_EXPLORE = 0.05      # share of requests sent to an under-sampled model
 
-    json_text = match.group(0)
-    return json.loads(json_text)
 
+def parse_routes(spec):
+    # "generate=model-a,revise=model-b" -> {"generate": "model-a", ...}
+    routes = {}
+    for part in spec.split(","):
+        kind, _, model = part.partition("=")
+        if kind.strip() in REQUEST_KINDS and model.strip():
+            routes[kind.strip()] = model.strip()
+    return routes
+
+
+ROUTES = {**DEFAULT_ROUTES, **parse_routes(os.getenv("RESUMEGENIE_ROUTES", ""))}
+
+
+class ModelRouter:
+
+    def __init__(self, routes=None, prices=None, ceiling=COST_CEILING):
+        self.routes = dict(routes or ROUTES)
+        self.prices = dict(prices or MODEL_PRICES)
+        self.ceiling = ceiling
+        self.assigned = dict(self.routes)
+        self.stats = {}             # (kind, model) -> {"latency", "prompt_tokens", "completion_tokens"}
+        self._lock = threading.Lock()
+
+    def _stats(self, kind, model):
+        key = (kind, model)
+        if key not in self.stats:
+            self.stats[key] = {
+                "latency": Histogram(LATENCY_BUCKETS),
+                "prompt_tokens": Histogram(TOKEN_BUCKETS),
+                "completion_tokens": Histogram(TOKEN_BUCKETS),
+            }
+        return self.stats[key]
+
+    def candidates(self, kind):
+        configured = self.routes[kind]
+        models = [configured]
+        for model in list(self.routes.values()) + upstream.MODEL_CHAIN:
+            if model not in models and model in self.prices:
+                models.append(model)
+        return [m for m in models if m == configured or upstream.health(m).snapshot()["state"] != "open"]
+
+    def estimated_cost(self, kind, model):
+
+        # Token use depends on the prompt, not the model, so every model of a
+        # class is priced with the class-wide mean. None = unpriced.
+        price = self.prices.get(model)
+        if price is None:
+            return None
+        samples = [s for (k, _), s in self.stats.items() if k == kind and s["prompt_tokens"].count]
+        if not samples:
+            return 0.0
+        prompt = sum(s["prompt_tokens"].sum for s in samples) / sum(s["prompt_tokens"].count for s in samples)
+        completion = sum(s["completion_tokens"].sum for s in samples) / sum(s["completion_tokens"].count for s in samples)
+        return (prompt * price[0] + completion * price[1]) / 1e6
+
+    def choose(self, kind):
+        with self._lock:
+            configured = self.routes[kind]
+            affordable = []
+            for model in self.candidates(kind):
+                cost = self.estimated_cost(kind, model)
+                if model == configured or (cost is not None and cost <= self.ceiling):
+                    affordable.append(model)
+
+            sampled = [m for m in affordable if self._stats(kind, m)["latency"].count >= ROUTE_MIN_SAMPLES]
+            unsampled = [m for m in affordable if m not in sampled]
+
+            if unsampled and (not sampled or random.random() < ROUTE_EXPLORE):
+                return configured if configured in unsampled else random.choice(unsampled)
+
+            model = min(sampled, key=lambda m: self._stats(kind, m)["latency"].quantile(0.5))
+            self.assigned[kind] = model
+            return model
+
+    def observe(self, kind, model, latency, usage=None):
+        with self._lock:
+            stats = self._stats(kind, model)
+            stats["latency"].observe(latency)
+            if usage is not None:
+                stats["prompt_tokens"].observe(getattr(usage, "prompt_tokens", 0) or 0)
+                stats["completion_tokens"].observe(getattr(usage, "completion_tokens", 0) or 0)
+
+    def snapshot(self):
+        with self._lock:
+            rows = []
+            for (kind, model), stats in sorted(self.stats.items()):
+                rows.append({
+                    "kind": kind,
+                    "model": model,
+                    "assigned": self.assigned.get(kind) == model,
+                    "requests": stats["latency"].count,
+                    "latency_p50": stats["latency"].quantile(0.5),
+                    "latency_p95": stats["latency"].quantile(0.95),
+                    "prompt_tokens": stats["prompt_tokens"].mean(),
+                    "completion_tokens": stats["completion_tokens"].mean(),
+                    "est_cost": self.estimated_cost(kind, model),
+                })
+            return rows
+
+
+router = ModelRouter()
+
+
+def _served_by(response, requested):
+    # A hedge or fallback may have answered; OpenRouter echoes the model id
+    model = getattr(response, "model", None)
+    return model if model in router.prices or model in router.routes.values() else requested
+
+
+def _observe_stream(kind, model, stream, start):
+    # Usage arrives on the final chunk (stream_options.include_usage)
+    usage = None
+    served = model
+    for chunk in stream:
+        served = _served_by(chunk, served)
+        usage = getattr(chunk, "usage", None) or usage
+        yield chunk
+
+    elapsed = time.monotonic() - start
+    router.observe(kind, served, elapsed, usage)
+    record_stage("upstream", elapsed)
+    record_usage(kind, served, usage)
+
+
+def create_completion(kind=GENERATE, validate=None, **kwargs):
+
+    # kwargs["model"] defaults to the router's pick for this kind; slow or
+    # failing calls fall back along RESUMEGENIE_MODELS (upstream.py).
+    # validate(response) may raise to reject a response.
+    kwargs.setdefault("model", router.choose(kind))
+    if kwargs.get("stream"):
+        kwargs.setdefault("stream_options", {"include_usage": True})
+
+    # A streaming call returns once the first chunk is in, so this is TTFT
+    start = time.monotonic()
+    response = upstream.call(get_client().chat.completions.create, kwargs, validate)
+    first_token = time.monotonic() - start
+
+    if kwargs.get("stream"):
+        record_ttft(kind, kwargs["model"], first_token)
+        return _observe_stream(kind, kwargs["model"], response, start)
+
+    served = _served_by(response, kwargs["model"])
+    usage = getattr(response, "usage", None)
+    router.observe(kind, served, first_token, usage)
+    record_ttft(kind, served, first_token)
+    record_stage("upstream", first_token)
+    record_usage(kind, served, usage)
+    return response
+
+
+def _note_response(raw):
+    # Size on the request's log line; the text itself only when debugging
+    ctx = current()
+    if ctx is not None:
+        ctx.note(response_chars=len(raw))
+    if DEBUG_RAW_OUTPUT:
+        print("RAW MODEL OUTPUT:\n", raw)
+
+
+def safe_json_parse(raw, repairs=None):
+
+    # Local repair (fences, prose, trailing commas, truncation, smart quotes...)
+    # instead of asking the user to generate again
+    with span("parse_json"):
+        result, applied = repair_json(raw)
+
+    # Counted and on the request's log line; printed only when debugging
+    record_json_repairs(applied)
+    if applied and DEBUG_RAW_OUTPUT:
+        print("REPAIRED MODEL JSON:", ", ".join(applied))
+    if repairs is not None:
+        repairs.extend(applied)
+
+    return result
 
 
 def clean_json(data):
@@ -46,15 +312,12 @@ def clean_json(data):
     return data
 
 
-def enhance_resume(resume_json, job_description_json, feedback=None):
-
-    cleaned_resume = clean_json(resume_json)
-    cleaned_jd = clean_json(job_description_json)
+def build_prompt(cleaned_resume, cleaned_jd, feedback=None):
 
     resume_string = json.dumps(cleaned_resume, indent=2)
     jd_string = json.dumps(cleaned_jd, indent=2)
 
-    prompt = f"""
+    return f"""
 You are a senior ATS resume optimization engine specialized in technical roles.
 
 OBJECTIVE:
@@ -197,25 +460,437 @@ FEEDBACK FROM USER (if any):
 Return ONLY the ATS freindly json file.
 """
 
-    response = client.chat.completions.create(
-        model="google/gemini-2.0-flash-001",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a deterministic ATS resume generation engine."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-        temperature=0
+
+def build_messages(prompt):
+    return [
+        {
+            "role": "system",
+            "content": "You are a deterministic ATS resume generation engine."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def order_sections(resume):
+    # Same key order as the single-prompt schema
+    return {key: resume[key] for key in SECTION_ORDER if key in resume}
+
+
+def _parseable(response):
+    # An unrepairable answer counts as a failed attempt, so the next model
+    # in the chain gets a turn instead of the caller seeing a ValueError.
+    # The parsed object stays on the response for response_json().
+    response.parsed_json = safe_json_parse(response.choices[0].message.content)
+
+
+def response_json(response):
+    # Parsed once by _parseable; anything it didn't see is parsed here
+    parsed = getattr(response, "parsed_json", None)
+    if parsed is None:
+        parsed = safe_json_parse(response.choices[0].message.content)
+    return parsed
+
+
+def complete_json(prompt, kind=GENERATE):
+    response = create_completion(
+        kind=kind,
+        messages=build_messages(prompt),
+        temperature=0,
+        validate=_parseable
     )
+    return response_json(response)
+
+
+def request_resume(prompt, stream=False):
+    from openai import BadRequestError
+
+    model = router.choose(GENERATE)
+    kwargs = dict(kind=GENERATE, model=model, messages=build_messages(prompt), temperature=0, stream=stream)
+    if not stream:
+        kwargs["validate"] = _parseable
+
+    if STRUCTURED_OUTPUT and model not in _no_structured_output:
+        try:
+            return create_completion(response_format=RESPONSE_FORMAT, **kwargs)
+        except BadRequestError as e:
+            # The model that answered 400, which may be a fallback
+            rejected = getattr(e, "model", model)
+            record_fallback("structured_output", model=rejected, error=f"{type(e).__name__}: {e}")
+            _no_structured_output.add(rejected)
+
+    return create_completion(**kwargs)
+
+
+# ================= SECTION REPAIR =================
+def build_section_repair_prompt(resume, sections, errors, cleaned_resume, cleaned_jd, feedback):
+
+    return f"""
+You are a senior ATS resume optimization engine fixing a generated resume.
+
+These sections failed validation and must be rewritten: {", ".join(sections)}
+
+VALIDATION ERRORS:
+{format_errors(errors)}
+
+Return ONLY a JSON object containing exactly these keys: {", ".join(sections)}.
+Follow the same structure as the rest of the resume below. No markdown, no explanations.
+
+==============================
+GENERATED RESUME (JSON):
+{json.dumps(resume, indent=2)}
+
+RESUME DATA (JSON):
+{json.dumps(cleaned_resume, indent=2)}
+
+JOB DESCRIPTION (JSON):
+{json.dumps(cleaned_jd, indent=2)}
+
+FEEDBACK FROM USER (if any):
+{feedback if feedback else "No additional feedback provided."}
+==============================
+"""
+
+
+def repair_sections(resume, cleaned_resume, cleaned_jd, feedback):
+
+    # Re-requests only the sections that failed the compiled validator.
+    # Returns (resume, repaired_keys).
+    if not isinstance(resume, dict):
+        raise ValueError("Model did not return a JSON object")
+
+    # Stray top-level keys are dropped locally, no need to ask the model
+    resume = order_sections(resume)
+
+    errors = validate_resume(resume)
+    sections = invalid_sections(errors)
+    if not sections:
+        return resume, []
+
+    fixed = complete_json(
+        build_section_repair_prompt(resume, sections, errors, cleaned_resume, cleaned_jd, feedback), kind=FIXUP
+    )
+
+    if not isinstance(fixed, dict):
+        fixed = {}
+
+    repaired = dict(resume)
+    for key in sections:
+        if key in fixed:
+            repaired[key] = fixed[key]
+        else:
+            repaired.pop(key, None)
+
+    # Sections the repair couldn't fix are dropped: rule checks and the
+    # renderers rely on the schema, a missing section they handle
+    remaining = validate_resume(repaired)
+    if remaining:
+        record_fallback("section_repair", dropped=invalid_sections(remaining), errors=format_errors(remaining))
+        for key in invalid_sections(remaining):
+            repaired.pop(key, None)
+
+    return order_sections(repaired), sections
+
+
+# ================= RULE FIX-UP =================
+def build_fixup_prompt(request, cleaned_jd):
+
+    return f"""
+You are a senior ATS resume optimization engine fixing specific resume lines.
+
+Each item below breaks the resume rules. Fix ONLY these items.
+
+RULES:
+- Each bullet ≤ 23 words, metric driven, starts with a strong technical action verb
+- No two bullets in the resume may start with the same verb
+- At most 3 bold spans per bullet using **keyword**
+- New project bullets must fit the project title and existing bullets
+- New skill categories: bold the domain name like **Machine Learning**, list relevant skills
+- New coursework must be relevant to the Job Description
+
+FIX REQUEST (JSON):
+{json.dumps(request, indent=2)}
+
+JOB DESCRIPTION (JSON):
+{json.dumps(cleaned_jd, indent=2)}
+
+Return ONLY JSON, including only the keys you were asked for:
+{{
+  "bullets": {{"<id>": "rewritten bullet"}},
+  "project_bullets": {{"<id>": ["new bullet"]}},
+  "skills": {{"**Category**": ["skill"]}},
+  "coursework": ["course"]
+}}
+"""
+
+
+def enforce_rules(resume, cleaned_jd):
+
+    # Local trims first, then ONE small request for every offending item.
+    # Returns (resume, changed_sections).
+    violations = check_resume(resume)
+    if not violations:
+        return resume, []
+
+    fixed, remaining = apply_local_fixes(resume, violations)
+
+    if remaining:
+        from openai import APIError
+
+        # The fix-up is best effort: a failed request keeps the generated text
+        try:
+            response = complete_json(
+                build_fixup_prompt(build_fixup_request(fixed, remaining), cleaned_jd), kind=FIXUP
+            )
+            fixed = apply_fixup(fixed, response)
+        except (ValueError, upstream.UpstreamError, APIError) as e:
+            record_fallback("rule_fixup", error=f"{type(e).__name__}: {e}")
+
+    # Score on the request's log line; printed only when debugging
+    before, after = score_resume(resume, violations), score_resume(fixed)
+    ctx = current()
+    if ctx is not None:
+        ctx.note(rule_score=before, rule_score_fixed=after)
+    if DEBUG_RAW_OUTPUT:
+        print(f"RULE SCORE: {before} -> {after}")
+
+    changed = [key for key in SECTION_ORDER if fixed.get(key) != resume.get(key)]
+    return fixed, changed
+
+
+def finalize_resume(resume, cleaned_resume, cleaned_jd, feedback):
+
+    # Schema repair, then rule fix-up. Returns (resume, changed_sections).
+    resume, changed = repair_sections(resume, cleaned_resume, cleaned_jd, feedback)
+
+    if ENFORCE_RULES:
+        resume, fixed = enforce_rules(resume, cleaned_jd)
+        changed = [key for key in SECTION_ORDER if key in changed or key in fixed]
+
+    return resume, changed
+
+
+def enhance_resume(resume_json, job_description_json, feedback=None, use_cache=True, stream=False, parallel=None):
+
+    with span("clean_json"):
+        cleaned_resume = clean_json(resume_json)
+        cleaned_jd = clean_json(job_description_json)
+
+    if parallel is None:
+        parallel = PARALLEL_SECTIONS
+    mode = "sections" if parallel else "single"
+
+    cache_key = make_cache_key(PROMPT_VERSION, ROUTES[GENERATE], mode, cleaned_resume, cleaned_jd, feedback or "")
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        record_cache(GENERATE, "miss" if cached is None else "hit")
+        if cached is not None:
+            return _replay(cached) if stream else cached
+    else:
+        record_cache(GENERATE, "off")
+
+    if parallel:
+        sections = _generate_sections(cleaned_resume, cleaned_jd, feedback, cache_key if use_cache else None)
+        return sections if stream else drain(sections)
+
+    with span("build_prompt"):
+        prompt = build_prompt(cleaned_resume, cleaned_jd, feedback)
+
+    if stream:
+        return _stream_sections(prompt, cleaned_resume, cleaned_jd, feedback, cache_key if use_cache else None)
+
+    response = request_resume(prompt)
 
     raw = response.choices[0].message.content
+    _note_response(raw)
+
+    result, _ = finalize_resume(response_json(response), cleaned_resume, cleaned_jd, feedback)
+
+    if use_cache:
+        response_cache.set(cache_key, result)
+
+    return result
+
+
+# ================= FEEDBACK AS JSON PATCH =================
+def build_patch_prompt(current_resume, cleaned_jd, feedback):
+
+    return f"""
+You are a senior ATS resume optimization engine editing an existing resume.
+
+Apply the user's feedback by returning ONLY an RFC 6902 JSON Patch against the
+CURRENT RESUME below, wrapped as:
+{{"patch": [{{"op": "replace", "path": "/projects/1/bullets/0", "value": "..."}}]}}
+
+PATCH RULES:
+- Use only add, remove, replace, move, copy operations with JSON Pointer paths
+- Change only what the feedback asks for; keep everything else untouched
+- Edited bullets must stay ≤ 23 words, start with a strong action verb and
+  bold at most 3 key terms using **keyword**
+- Keep the same key structure; do not add new top-level keys
+- Return ONLY the JSON object. No markdown, no explanations.
+
+==============================
+CURRENT RESUME (JSON):
+{json.dumps(current_resume, indent=2)}
+
+JOB DESCRIPTION (JSON):
+{json.dumps(cleaned_jd, indent=2)}
+
+FEEDBACK FROM USER:
+{feedback}
+==============================
+"""
+
 
-    print("RAW MODEL OUTPUT:\n", raw)   # temporary debug
+def check_resume_shape(resume):
+    if not isinstance(resume, dict) or not resume:
+        raise ValueError("Resume must be a non-empty object")
+
+    errors = validate_resume(resume)
+    if errors:
+        raise ValueError("Invalid resume:\n" + format_errors(errors))
 
-    return safe_json_parse(raw)
 
+def revise_resume(current_resume, feedback, resume_json, job_description_json, use_cache=True):
 
+    # Cheap path: the model returns only the edit; a full regeneration is the
+    # fallback whenever the patch is malformed or produces an invalid resume
+    with span("clean_json"):
+        cleaned_jd = clean_json(job_description_json)
+
+    cache_key = make_cache_key(PROMPT_VERSION, ROUTES[REVISE], "patch", current_resume, cleaned_jd, feedback or "")
+    if use_cache:
+        cached = response_cache.get(cache_key)
+        record_cache(REVISE, "miss" if cached is None else "hit")
+        if cached is not None:
+            return cached
+    else:
+        record_cache(REVISE, "off")
+
+    with span("build_prompt"):
+        messages = build_messages(build_patch_prompt(current_resume, cleaned_jd, feedback))
+
+    try:
+        response = create_completion(
+            kind=REVISE,
+            messages=messages,
+            temperature=0,
+            validate=_parseable
+        )
+        patch = response_json(response).get("patch")
+        result = apply_patch(current_resume, patch)
+        check_resume_shape(result)
+        if ENFORCE_RULES:
+            result, _ = enforce_rules(result, cleaned_jd)
+    except ValueError as e:   # JSON decode, JsonPatchError and shape errors
+        record_fallback("patch", error=f"{type(e).__name__}: {e}")
+        return enhance_resume(resume_json, job_description_json, feedback=feedback, use_cache=use_cache)
+
+    if use_cache:
+        response_cache.set(cache_key, result)
+
+    return result
+
+
+# ================= SECTION STREAMS =================
+# enhance_resume(..., stream=True) yields (key, value) as sections arrive;
+# later events may replace earlier ones. The generator's return value is
+# the finalized resume, which can also drop keys that were already shown,
+# so that (not the events) is the result.
+def drain(sections, on_section=None):
+    while True:
+        try:
+            key, value = next(sections)
+        except StopIteration as done:
+            return done.value
+        if on_section is not None:
+            on_section(key, value)
+
+
+def _replay(resume):
+    yield from resume.items()
+    return resume
+
+
+# ================= PER-SECTION (PARALLEL) =================
+def _generate_sections(cleaned_resume, cleaned_jd, feedback, cache_key):
+    from section_gen import generate_by_section
+
+    result = {}
+    for key, value in generate_by_section(cleaned_resume, cleaned_jd, feedback, complete_json):
+        result[key] = value
+        yield key, value
+
+    result, repaired = finalize_resume(result, cleaned_resume, cleaned_jd, feedback)
+    for key in repaired:
+        if key in result:
+            yield key, result[key]
+
+    result = order_sections(result)
+    if cache_key:
+        response_cache.set(cache_key, result)
+    return result
+
+
+# ================= STREAMING =================
+def _stream_sections(prompt, cleaned_resume, cleaned_jd, feedback, cache_key):
+
+    response = request_resume(prompt, stream=True)
+
+    parser = SectionStreamParser()
+    chunks = []
+
+    for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if not delta:
+            continue
+
+        chunks.append(delta)
+        yield from parser.feed(delta)
+
+    raw = "".join(chunks)
+    _note_response(raw)
+
+    if parser.done:
+        result = parser.result
+    else:
+        # Stream ended mid-object: fall back to the regular parser and
+        # emit whatever sections the incremental pass had not produced yet
+        result = safe_json_parse(raw)
+        for key, value in result.items():
+            if key not in parser.result:
+                yield key, value
+
+    # Invalid sections / rule fixes replace what was already shown
+    result, repaired = finalize_resume(result, cleaned_resume, cleaned_jd, feedback)
+    for key in repaired:
+        if key in result:
+            yield key, result[key]
+
+    if cache_key:
+        response_cache.set(cache_key, result)
+    return result
+
+
+# ================= BATCH (MANY JDs) =================
+def enhance_resume_many(resume_json, job_descriptions, feedback=None, use_cache=True, max_workers=BATCH_MAX_WORKERS):
+
+    # Yields (index, resume, error) in completion order; the shared client
+    # is thread-safe so every worker reuses its connection pool
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(enhance_resume, resume_json, jd, feedback, use_cache): i
+            for i, jd in enumerate(job_descriptions)
+        }
+
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield index, future.result(), None
+            except Exception as e:
+                yield index, None, e
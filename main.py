@@ -1,80 +1,21 @@
 import streamlit as st
 from datetime import datetime
-import json
 import os
+import time
+import functools
+import uuid
+import statistics
 from datetime import date
-from llm import enhance_resume
-from doc_gen import generate_docx_from_template
+from preview import render_resume_preview, render_section
+from resume_schema import SECTION_ORDER
+from llm import PARALLEL_SECTIONS
+from pdf_gen import render_pdf_bytes
+from metrics import span, start_server
 
+# The model client (openai/httpx) and doc_gen (python-docx/lxml) are loaded
+# inside the handlers that need them, so the form renders without either
 
-def render_resume_preview(resume):
-
-    header = resume.get("header", {})
-
-    full_name = header.get("name", "")
-    contact_line = " | ".join(
-        filter(None, [
-            header.get("phone", ""),
-            header.get("email", ""),
-            header.get("linkedin", ""),
-            header.get("github", "")
-        ])
-    )
-
-    # HEADER
-    st.markdown(f"## {full_name}")
-    st.markdown(contact_line)
-    st.divider()
-
-    # SUMMARY
-    if resume.get("summary"):
-        st.markdown("### Summary")
-        st.write(resume["summary"])
-        st.divider()
-
-    # EDUCATION
-    if resume.get("education"):
-        st.markdown("### Education")
-        for edu in resume["education"]:
-            st.markdown(
-                f"**{edu.get('degree','')}**  |  {edu.get('duration','')}"
-            )
-            st.write(
-                f"{edu.get('institution','')}  |  {edu.get('grade','')}"
-            )
-        st.divider()
-
-    # EXPERIENCE
-    if resume.get("experience"):
-        st.markdown("### Experience")
-        for exp in resume["experience"]:
-            st.markdown(
-                f"**{exp.get('role','')} — {exp.get('company','')}**  |  {exp.get('duration','')}"
-            )
-            for bullet in exp.get("bullets", []):
-                st.markdown(f"- {bullet}")
-        st.divider()
-
-    # PROJECTS
-    if resume.get("projects"):
-        st.markdown("### Projects")
-        for proj in resume["projects"]:
-            st.markdown(f"**{proj.get('title','')}**")
-            for bullet in proj.get("bullets", []):
-                st.markdown(f"- {bullet}")
-        st.divider()
-
-    # COURSEWORK
-    if resume.get("coursework"):
-        st.markdown("### Relevant Coursework")
-        st.write(" • ".join(resume["coursework"]))
-        st.divider()
-
-    # SKILLS
-    if resume.get("skills"):
-        st.markdown("### Technical Skills")
-        for category, items in resume["skills"].items():
-            st.write(f"**{category}:** {', '.join(items)}")
+SCRIPT_STARTED = time.perf_counter()
 
 
 def format_date(value):
@@ -88,6 +29,10 @@ DB_DIR = "dB"
 if not os.path.exists(DB_DIR):
     os.makedirs(DB_DIR)
 
+# --- METRICS ENDPOINT ---
+# Prometheus text on 127.0.0.1:$RESUMEGENIE_METRICS_PORT/metrics, once per process
+start_server()
+
 # --- PAGE CONFIG ---
 st.set_page_config(page_title="Resume Genie 🧞", layout="centered")
 
@@ -107,6 +52,75 @@ if "generated_resume" not in st.session_state:
 if "has_generated" not in st.session_state:
     st.session_state.has_generated = False
 
+if "batch_jds" not in st.session_state:
+    st.session_state.batch_jds = []
+
+if "session_id" not in st.session_state:
+    # Fair-queue identity for the shared generation pool
+    st.session_state.session_id = uuid.uuid4().hex
+
+
+# --- JOB RECOVERY ---
+# A refresh starts a new session; ?job=<id> reattaches to work still running
+if not st.session_state.get("active_job") and st.query_params.get("job"):
+    st.session_state.active_job = st.query_params["job"]
+if not st.session_state.get("batch_jobs") and st.query_params.get("batch"):
+    st.session_state.batch_jobs = st.query_params["batch"].split(",")
+
+# --- VERSION RESTORE ---
+# Runs before any widget exists, so the JD fields can be refilled. A fresh
+# session (e.g. after a browser refresh) picks the version up from ?v=<id>.
+restore_id = st.session_state.pop("restore_version", None)
+if restore_id is None and st.session_state.generated_resume is None:
+    restore_id = st.query_params.get("v")
+
+if restore_id is not None:
+    from versions import get_versions
+
+    try:
+        version = get_versions().load(int(restore_id))
+    except ValueError:
+        version = None
+
+    if version:
+        st.session_state.generated_resume = version["resume"]
+        st.session_state.last_payload = version["payload"]
+        st.session_state.has_generated = True
+        st.session_state.version_id = version["id"]
+        st.session_state.jd_title = version["jd"].get("job_title", "")
+        st.session_state.jd_desc = version["jd"].get("description", "")
+        st.session_state.jd_skills = version["jd"].get("skills_required", "")
+        st.query_params["v"] = str(version["id"])
+
+
+# --- RERUN TIMING ---
+# Wall time of every full script run and every fragment rerun, per session,
+# shown in the sidebar. Set RESUMEGENIE_RERUN_TIMINGS=1 to also log them.
+TIMING_WINDOW = 50
+LOG_TIMINGS = os.getenv("RESUMEGENIE_RERUN_TIMINGS", "0").lower() in ("1", "true", "on")
+
+
+def record_timing(scope, elapsed):
+    samples = st.session_state.setdefault("rerun_timings", {}).setdefault(scope, [])
+    samples.append(elapsed)
+    del samples[:-TIMING_WINDOW]
+    if LOG_TIMINGS:
+        print(f"[rerun] {scope} {elapsed * 1000:.1f}ms")
+
+
+def timed(scope):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                # st.rerun() raises, so this also records interrupted runs
+                record_timing(scope, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
 
 # --- VALIDATION ---
 def get_missing_fields(contacts, edu_list, exp_list, proj_list):
@@ -169,6 +183,173 @@ def get_missing_fields(contacts, edu_list, exp_list, proj_list):
     return missing
 
 
+# --- PAYLOAD BUILDERS ---
+def build_resume_payload():
+
+    with span("payload_assembly"):
+        contacts = {
+            "f_name": st.session_state.get("f_name", ""),
+            "m_name": st.session_state.get("m_name", ""),
+            "l_name": st.session_state.get("l_name", ""),
+            "email": st.session_state.get("email", ""),
+            "phone": st.session_state.get("phone", ""),
+            "linked_in": st.session_state.get("linked_in", ""),
+            "github": st.session_state.get("github", "")
+        }
+
+        education = []
+        for i in range(len(st.session_state.resume["education"])):
+            education.append({
+                "degree": st.session_state.get(f"deg_{i}", ""),
+                "institute": st.session_state.get(f"inst_{i}", ""),
+                "start": format_date(st.session_state.get(f"s_ed_{i}")),
+                "end": format_date(st.session_state.get(f"e_ed_{i}"))
+            })
+
+        experience = []
+        for i in range(len(st.session_state.resume["experience"])):
+            is_present = st.session_state.get(f"present_{i}", False)
+
+            end_value = "Present" if is_present else format_date(
+                st.session_state.get(f"e_ex_{i}")
+            )
+
+            experience.append({
+                "company": st.session_state.get(f"comp_{i}", ""),
+                "role": st.session_state.get(f"role_{i}", ""),
+                "start": format_date(st.session_state.get(f"s_ex_{i}")),
+                "end": end_value,
+                "desc": st.session_state.get(f"desc_{i}", "")
+            })
+
+
+        projects = []
+        for i in range(len(st.session_state.resume["projects"])):
+            projects.append({
+                "name": st.session_state.get(f"pj_name_{i}", ""),
+                "url": st.session_state.get(f"pj_url_{i}", ""),
+                "mem": st.session_state.get(f"pj_mem_{i}", ""),
+                "desc": st.session_state.get(f"pj_desc_{i}", "")
+            })
+
+        return {
+            "contacts": contacts,
+            "education": education,
+            "experience": experience,
+            "projects": projects,
+            "skills": st.session_state.resume["skills"],
+            "coursework": st.session_state.resume["coursework"]
+        }
+
+
+def build_jd_payload(i=None):
+
+    # i=None -> main JD fields, otherwise the i-th extra JD in batch mode
+    prefix = "jd" if i is None else "bjd"
+    suffix = "" if i is None else f"_{i}"
+
+    return {
+        "job_title": st.session_state.get(f"{prefix}_title{suffix}", ""),
+        "description": st.session_state.get(f"{prefix}_desc{suffix}", ""),
+        "skills_required": st.session_state.get(f"{prefix}_skills{suffix}", "")
+    }
+
+
+def payload_missing_fields(payload):
+    return get_missing_fields(
+        payload["contacts"], payload["education"], payload["experience"], payload["projects"]
+    )
+
+
+def resume_filename(resume, suffix="Resume.docx"):
+    full_name = resume.get("header", {}).get("name", "User")
+    safe_name = full_name.strip().replace(" ", "_")
+    return f"{safe_name}_{suffix}"
+
+
+# --- BATCH GENERATION ---
+# Each JD is a job on the shared pool, queued fairly with other sessions.
+# The job ids live in session state and ?batch=<id,id,...>, and a fragment
+# polls them, so the script thread never waits on the model.
+def run_batch_generation(payload):
+    from jobs import get_jobs
+
+    jd_payloads = [build_jd_payload()] + [
+        build_jd_payload(i) for i in range(len(st.session_state.batch_jds))
+    ]
+
+    manager = get_jobs()
+    st.session_state.batch_jobs = [
+        manager.submit_generate(
+            st.session_state.session_id, payload, jd,
+            use_cache=st.session_state.get("use_cache", True)
+        )
+        for jd in jd_payloads
+    ]
+    st.session_state.batch_result = None
+    st.query_params["batch"] = ",".join(st.session_state.batch_jobs)
+
+
+def finish_batch(jobs):
+    from jobs import DONE
+    from doc_gen import build_docx_zip
+
+    failures, entries = [], []
+    for i, job in enumerate(jobs):
+        if job is None:
+            failures.append(f"JD #{i+1}: expired")
+        elif job.status != DONE:
+            failures.append(f"JD #{i+1}: {job.error}")
+        else:
+            job_title = job.jd.get("job_title") or f"Job_{i+1}"
+            suffix = f"{i+1:02d}_{job_title.strip().replace(' ', '_')}_Resume.docx"
+            entries.append((resume_filename(job.result, suffix), job.result))
+
+    st.session_state.batch_result = {
+        "total": len(jobs),
+        "generated": len(entries),
+        "failures": failures,
+        "zip": build_docx_zip(entries) if entries else None,
+    }
+
+
+@st.fragment(run_every=1.0)
+def batch_panel():
+    from jobs import get_jobs
+
+    jobs = [get_jobs().get(job_id) for job_id in st.session_state.batch_jobs]
+    total = len(jobs)
+    done = sum(1 for job in jobs if job is None or job.finished)
+
+    if done < total:
+        st.progress(done / total, text=f"🧞 Tailoring your resume to {total} job descriptions... {done}/{total} done")
+        return
+
+    st.session_state.batch_jobs = None
+    st.query_params.pop("batch", None)
+    finish_batch(jobs)
+
+    # Full rerun so the result shows outside the fragment
+    st.rerun()
+
+
+def show_batch_result(result):
+    for failure in result["failures"]:
+        st.error(f"🚫 {failure}")
+
+    if result["zip"] is None:
+        return
+
+    st.success(f"✅ Generated {result['generated']} of {result['total']} resumes!")
+    st.download_button(
+        label="⬇️ Download All Resumes (.zip)",
+        data=result["zip"],
+        file_name="Tailored_Resumes.zip",
+        mime="application/zip",
+        use_container_width=True
+    )
+
+
 # --- HEADER ---
 col_logo, col_actions = st.columns([3, 2])
 with col_logo:
@@ -187,19 +368,112 @@ st.divider()
 
 #Side Bar
 st.sidebar.title("About")
+st.sidebar.toggle("⚡ Reuse cached generations", value=True, key="use_cache")
+st.sidebar.toggle("🚀 Generate sections in parallel", value=PARALLEL_SECTIONS, key="parallel_sections")
+st.sidebar.toggle("🩹 Apply feedback as targeted edits", value=True, key="patch_feedback")
+st.sidebar.text_input("🏷️ Tags for next save", key="save_tags", placeholder="e.g. ml, backend")
+
+with st.sidebar.expander("📈 Generation pool"):
+    from generation_pool import get_pool
+
+    pool_stats = get_pool().metrics()
+    p1, p2 = st.columns(2)
+    p1.metric("Running", f"{pool_stats['running']}/{pool_stats['max_concurrency']}")
+    p2.metric("Queued", pool_stats["queue_depth"])
+    p1.metric("Wait p50", f"{pool_stats['wait_p50']:.1f}s")
+    p2.metric("Wait p95", f"{pool_stats['wait_p95']:.1f}s")
+    st.caption(
+        f"{pool_stats['submitted']} submitted · {pool_stats['coalesced']} coalesced · "
+        f"{pool_stats['completed']} completed · {pool_stats['failed']} failed"
+    )
+
+    from upstream import health_snapshot
+
+    for model_name, model_health in health_snapshot().items():
+        badge = {"closed": "🟢", "half-open": "🟡", "open": "🔴"}[model_health["state"]]
+        st.caption(f"{badge} {model_name} · {model_health['samples']} samples")
+
+with st.sidebar.expander("🧭 Model routing"):
+    from llm import router
+
+    routing = router.snapshot()
+    if not routing:
+        st.caption("No model requests yet.")
+    else:
+        st.dataframe(
+            [
+                {
+                    "class": row["kind"],
+                    "model": ("✅ " if row["assigned"] else "") + row["model"],
+                    "n": row["requests"],
+                    "p50 (s)": round(row["latency_p50"], 2),
+                    "p95 (s)": round(row["latency_p95"], 2),
+                    "tokens in/out": f"{row['prompt_tokens']:.0f}/{row['completion_tokens']:.0f}",
+                }
+                for row in routing
+            ],
+            hide_index=True,
+        )
+
+with st.sidebar.expander("⏱️ Rerun timings"):
+    timings = st.session_state.get("rerun_timings", {})
+    if not timings:
+        st.caption("Interact with the form to collect timings.")
+    else:
+        st.dataframe(
+            [
+                {
+                    "scope": scope,
+                    "runs": len(samples),
+                    "last ms": round(samples[-1] * 1000, 1),
+                    "median ms": round(statistics.median(samples) * 1000, 1),
+                    "max ms": round(max(samples) * 1000, 1),
+                }
+                for scope, samples in sorted(timings.items())
+            ],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption("full_script is a whole-app rerun; the rest are single-section fragment reruns.")
 
 
 # --- HISTORY ---
 if show_history:
+    st.session_state.history_open = not st.session_state.get("history_open", False)
+    st.session_state.history_pages = [None]
+
+if st.session_state.get("history_open"):
+    from store import get_store
+
+    store = get_store()
+    pages = st.session_state.setdefault("history_pages", [None])
+
     with st.expander("📚 Saved Resumes (History)", expanded=True):
-        files = [f for f in os.listdir(DB_DIR) if f.endswith('.json')]
-        if not files:
-            st.info("No saved resumes found in dB folder.")
+        tag_filter = st.selectbox(
+            "🏷️ Filter by tag", [""] + store.all_tags(), key="history_tag",
+            on_change=lambda: st.session_state.update(history_pages=[None])
+        )
+        rows, next_cursor = store.list_resumes(before=pages[-1], tag=tag_filter or None)
+
+        if not rows:
+            st.info("No saved resumes found.")
         else:
-            selected_file = st.selectbox("Select a resume to load:", files)
+            labels = {
+                r["id"]: f"{r['name']} — {datetime.fromtimestamp(r['created_at']):%d %b %Y %H:%M} (#{r['id']})"
+                for r in rows
+            }
+            selected_id = st.selectbox("Select a resume to load:", list(labels), format_func=labels.get)
+
+            nav_prev, nav_next = st.columns(2)
+            if nav_prev.button("⬅️ Newer", disabled=len(pages) == 1, use_container_width=True):
+                pages.pop()
+                st.rerun()
+            if nav_next.button("Older ➡️", disabled=next_cursor is None, use_container_width=True):
+                pages.append(next_cursor)
+                st.rerun()
+
             if st.button("📥 Import Selected Resume"):
-                with open(os.path.join(DB_DIR, selected_file), 'r') as f:
-                    data = json.load(f)
+                data = store.get(selected_id)["payload"]
 
                 # 🔥 FULL RESET (safe version)
                 for key in list(st.session_state.keys()):
@@ -231,76 +505,22 @@ if show_history:
 
 # --- SAVE LOGIC ---
 if save_trigger:
+    from store import get_store
 
-    contacts = {
-        "f_name": st.session_state.get("f_name", ""),
-        "m_name": st.session_state.get("m_name", ""),
-        "l_name": st.session_state.get("l_name", ""),
-        "email": st.session_state.get("email", ""),
-        "phone": st.session_state.get("phone", ""),
-        "linked_in": st.session_state.get("linked_in", ""),
-        "github": st.session_state.get("github", "")
-    }
+    save_payload = build_resume_payload()
+    contacts = save_payload["contacts"]
 
-    education = []
-    for i in range(len(st.session_state.resume["education"])):
-        education.append({
-            "degree": st.session_state.get(f"deg_{i}", ""),
-            "institute": st.session_state.get(f"inst_{i}", ""),
-            "start": format_date(st.session_state.get(f"s_ed_{i}")),
-            "end": format_date(st.session_state.get(f"e_ed_{i}"))
-        })
-
-    experience = []
-    for i in range(len(st.session_state.resume["experience"])):
-        is_present = st.session_state.get(f"present_{i}", False)
-
-        end_value = "Present" if is_present else format_date(
-            st.session_state.get(f"e_ex_{i}")
-        )
-
-        experience.append({
-            "company": st.session_state.get(f"comp_{i}", ""),
-            "role": st.session_state.get(f"role_{i}", ""),
-            "start": format_date(st.session_state.get(f"s_ex_{i}")),
-            "end": end_value,
-            "desc": st.session_state.get(f"desc_{i}", "")
-        })
-
-
-    projects = []
-    for i in range(len(st.session_state.resume["projects"])):
-        projects.append({
-            "name": st.session_state.get(f"pj_name_{i}", ""),
-            "url": st.session_state.get(f"pj_url_{i}", ""),
-            "mem": st.session_state.get(f"pj_mem_{i}", ""),
-            "desc": st.session_state.get(f"pj_desc_{i}", "")
-        })
-
-    save_payload = {
-        "contacts": contacts,
-        "education": education,
-        "experience": experience,
-        "projects": projects,
-        "skills": st.session_state.resume["skills"],
-        "coursework": st.session_state.resume["coursework"]
-    }
-
-    missing = get_missing_fields(contacts, education, experience, projects)
+    missing = payload_missing_fields(save_payload)
 
     if missing:
         st.error(f"🚫 Missing: {', '.join(missing)}")
         st.stop()
 
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{contacts.get('f_name','User')}_{timestamp}.json"
-    filepath = os.path.join(DB_DIR, filename)
+    tags = st.session_state.get("save_tags", "").split(",")
+    resume_id = get_store().save(save_payload, tags=tags)
 
-    with open(filepath, "w") as f:
-        json.dump(save_payload, f, indent=4)
-
-    st.success(f"✅ Resume saved successfully as {filename}")
+    st.success(f"✅ Resume saved successfully as #{resume_id} ({contacts.get('f_name','User')})")
 
 # --- RESET LOGIC ---
 if reset_trigger:
@@ -324,10 +544,19 @@ if reset_trigger:
         "coursework": []
     }
 
+    st.session_state.batch_jds = []
+
     # Clear generated data
     st.session_state.generated_resume = None
     st.session_state.has_generated = False
     st.session_state.last_payload = None
+    st.session_state.version_id = None
+    st.session_state.active_job = None
+    st.session_state.batch_jobs = None
+    st.session_state.batch_result = None
+    st.session_state.downloads = None
+    st.session_state.job_error = None
+    st.query_params.clear()
 
     st.success("✨ Form Reset Successfully!")
     st.rerun()
@@ -339,140 +568,196 @@ if reset_trigger:
 
 
 
-# --- CONTACT ---
-with st.container(border=True):
-    st.subheader("👤 Contact Information")
-    c1, c2 = st.columns(2)
-
-    c1.text_input("First Name *", key="f_name")
-    c2.text_input("Middle Name", key="m_name")
-    c1.text_input("Last Name *", key="l_name")
-    c2.text_input("Email *", key="email")
-    c1.text_input("Phone *", key="phone")
-    c2.text_input("LinkedIn", key="linked_in")
-    st.text_input("GitHub", key="github")
-
-# --- EDUCATION ---
-st.write("##")
-with st.container(border=True):
-    ed_h1, ed_h2 = st.columns([4, 1.2])
-    ed_h1.subheader("🎓 Education")
-
-    if ed_h2.button("➕ Add Edu", key="add_edu"):
-        st.session_state.resume["education"].append({})
-
-    for i in range(len(st.session_state.resume["education"])):
-        with st.container(border=True):
-            e_col1, e_col2 = st.columns(2)
-            e_col1.selectbox("📜 Degree", ["Bachelor's", "Master's", "PhD"], key=f"deg_{i}")
-            e_col2.text_input("🏫 Institute *", key=f"inst_{i}")
-            d_col1, d_col2 = st.columns(2)
-            start_date = d_col1.date_input(
-                "📅 Start Date",
-                value=None,
-                key=f"s_ed_{i}"
-            )
+# --- FORM SECTIONS ---
+# Each section is a fragment: typing, adding or removing an item reruns only
+# that section. Widget values still live in st.session_state, so the
+# generate / save handlers below read them exactly as before.
 
-            end_date = d_col2.date_input(
-                "🏁 End Date",
-                value=None,
-                key=f"e_ed_{i}"
-            )
+@st.fragment
+@timed("contact")
+def contact_section():
+    with st.container(border=True):
+        st.subheader("👤 Contact Information")
+        c1, c2 = st.columns(2)
 
+        c1.text_input("First Name *", key="f_name")
+        c2.text_input("Middle Name", key="m_name")
+        c1.text_input("Last Name *", key="l_name")
+        c2.text_input("Email *", key="email")
+        c1.text_input("Phone *", key="phone")
+        c2.text_input("LinkedIn", key="linked_in")
+        st.text_input("GitHub", key="github")
 
-            if st.button(f"🗑️ Remove Item {i+1}", key=f"rem_ed_{i}"):
-                st.session_state.resume["education"].pop(i)
-                st.rerun()
 
-# --- EXPERIENCE ---
-st.write("##")
-with st.container(border=True):
-    ex_h1, ex_h2 = st.columns([4, 1.2])
-    ex_h1.subheader("💼 Experience")
+@st.fragment
+@timed("education")
+def education_section():
+    with st.container(border=True):
+        ed_h1, ed_h2 = st.columns([4, 1.2])
+        ed_h1.subheader("🎓 Education")
 
-    if ex_h2.button("➕ Add Exp", key="add_exp"):
-        st.session_state.resume["experience"].append({})
+        if ed_h2.button("➕ Add Edu", key="add_edu"):
+            st.session_state.resume["education"].append({})
 
-    for i in range(len(st.session_state.resume["experience"])):
-        with st.container(border=True):
+        for i in range(len(st.session_state.resume["education"])):
+            with st.container(border=True):
+                e_col1, e_col2 = st.columns(2)
+                e_col1.selectbox("📜 Degree", ["Bachelor's", "Master's", "PhD"], key=f"deg_{i}")
+                e_col2.text_input("🏫 Institute *", key=f"inst_{i}")
+                d_col1, d_col2 = st.columns(2)
+                start_date = d_col1.date_input(
+                    "📅 Start Date",
+                    value=None,
+                    key=f"s_ed_{i}"
+                )
 
-            c_col1, c_col2 = st.columns(2)
-            c_col1.text_input("🏢 Company *", key=f"comp_{i}")
-            c_col2.text_input("🛠️ Role", key=f"role_{i}")
+                end_date = d_col2.date_input(
+                    "🏁 End Date",
+                    value=None,
+                    key=f"e_ed_{i}"
+                )
 
-            d_col1, d_col2 = st.columns(2)
 
-            d_col1.date_input(
-                "📅 Start Date",
-                value=None,
-                key=f"s_ex_{i}"
-            )
+                if st.button(f"🗑️ Remove Item {i+1}", key=f"rem_ed_{i}"):
+                    st.session_state.resume["education"].pop(i)
+                    st.rerun(scope="fragment")
 
-            currently_working = d_col2.checkbox(
-                "Currently Working Here",   
-                key=f"present_{i}"
-            )
 
-            if currently_working:
-                st.text_input(
-                    "🏁 End Date",
-                    value="Present",
-                    disabled=True,
-                    key=f"e_ex_{i}"
-                )
-            else:
-                st.date_input(
-                    "🏁 End Date",
+@st.fragment
+@timed("experience")
+def experience_section():
+    with st.container(border=True):
+        ex_h1, ex_h2 = st.columns([4, 1.2])
+        ex_h1.subheader("💼 Experience")
+
+        if ex_h2.button("➕ Add Exp", key="add_exp"):
+            st.session_state.resume["experience"].append({})
+
+        for i in range(len(st.session_state.resume["experience"])):
+            with st.container(border=True):
+
+                c_col1, c_col2 = st.columns(2)
+                c_col1.text_input("🏢 Company *", key=f"comp_{i}")
+                c_col2.text_input("🛠️ Role", key=f"role_{i}")
+
+                d_col1, d_col2 = st.columns(2)
+
+                d_col1.date_input(
+                    "📅 Start Date",
                     value=None,
-                    key=f"e_ex_{i}"
+                    key=f"s_ex_{i}"
                 )
 
-        # 🔥 ADD THIS LINE
-        st.text_area("📝 Description", key=f"desc_{i}")
+                currently_working = d_col2.checkbox(
+                    "Currently Working Here",   
+                    key=f"present_{i}"
+                )
 
-        if st.button(f"🗑️ Remove Job {i+1}", key=f"rem_exp_{i}"):
-            st.session_state.resume["experience"].pop(i)
-            st.rerun()
+                if currently_working:
+                    st.text_input(
+                        "🏁 End Date",
+                        value="Present",
+                        disabled=True,
+                        key=f"e_ex_{i}"
+                    )
+                else:
+                    st.date_input(
+                        "🏁 End Date",
+                        value=None,
+                        key=f"e_ex_{i}"
+                    )
 
+            # 🔥 ADD THIS LINE
+            st.text_area("📝 Description", key=f"desc_{i}")
 
+            if st.button(f"🗑️ Remove Job {i+1}", key=f"rem_exp_{i}"):
+                st.session_state.resume["experience"].pop(i)
+                st.rerun(scope="fragment")
 
-# --- PROJECTS ---
-st.write("##")
-with st.container(border=True):
-    pj_h1, pj_h2 = st.columns([4, 1.2])
-    pj_h1.subheader("🚀 Projects")
-
-    if pj_h2.button("➕ Add Project", key="add_pj"):
-        st.session_state.resume["projects"].append({})
-
-    for i in range(len(st.session_state.resume["projects"])):
-        with st.container(border=True):
-            p_col1, p_col2 = st.columns(2)
-            p_col1.text_input("📛 Project Name *", key=f"pj_name_{i}")
-            p_col2.text_input("🔗 Project URL", key=f"pj_url_{i}")
-            st.text_input("👥 Members", key=f"pj_mem_{i}")
-            st.text_area("📄 Description", key=f"pj_desc_{i}")
-
-            if st.button(f"🗑️ Remove Project {i+1}", key=f"rem_pj_{i}"):
-                st.session_state.resume["projects"].pop(i)
-                st.rerun()
 
-# --- Job Description ---
-st.write("##")
-with st.container(border=True):
-    st.subheader("📄 Job Description")
+@st.fragment
+@timed("projects")
+def projects_section():
+    with st.container(border=True):
+        pj_h1, pj_h2 = st.columns([4, 1.2])
+        pj_h1.subheader("🚀 Projects")
 
-    st.text_input("💼 Job Title", key="jd_title")
-    st.text_area("📝 Job Description", key="jd_desc", height=150)
-    st.text_area("🛠️ Skills Required (comma separated)", key="jd_skills", height=100)
+        if pj_h2.button("➕ Add Project", key="add_pj"):
+            st.session_state.resume["projects"].append({})
 
+        for i in range(len(st.session_state.resume["projects"])):
+            with st.container(border=True):
+                p_col1, p_col2 = st.columns(2)
+                p_col1.text_input("📛 Project Name *", key=f"pj_name_{i}")
+                p_col2.text_input("🔗 Project URL", key=f"pj_url_{i}")
+                st.text_input("👥 Members", key=f"pj_mem_{i}")
+                st.text_area("📄 Description", key=f"pj_desc_{i}")
 
+                if st.button(f"🗑️ Remove Project {i+1}", key=f"rem_pj_{i}"):
+                    st.session_state.resume["projects"].pop(i)
+                    st.rerun(scope="fragment")
 
-# --- SKILLS & COURSEWORK ---
-st.write("##")
-g1, g2 = st.columns(2)
 
-with g1:
+@st.fragment
+@timed("job_description")
+def job_description_section():
+    with st.container(border=True):
+        st.subheader("📄 Job Description")
+
+        st.text_input("💼 Job Title", key="jd_title")
+        st.text_area("📝 Job Description", key="jd_desc", height=150)
+        st.text_area("🛠️ Skills Required (comma separated)", key="jd_skills", height=100)
+
+        if st.button("🔎 Find Best-Matching Saved Profiles", use_container_width=True):
+            from store import get_store
+            from search import match_profiles
+
+            matches = match_profiles(get_store(), build_jd_payload(), limit=10)
+            if not matches:
+                st.info("No saved profile shares a required skill with this job description.")
+            else:
+                st.dataframe(
+                    [
+                        {
+                            "#": m["id"],
+                            "Profile": m["name"],
+                            "Saved": f"{datetime.fromtimestamp(m['created_at']):%d %b %Y}",
+                            "Score": round(m["score"], 2),
+                        }
+                        for m in matches
+                    ],
+                    hide_index=True,
+                    use_container_width=True,
+                )
+                st.caption("📜 Load a profile from History by its # to tailor it.")
+
+        batch_mode = st.toggle("📚 Tailor to multiple job descriptions", key="batch_mode")
+
+        # The generate button's label depends on batch mode, which lives
+        # outside this fragment
+        if batch_mode != st.session_state.get("batch_mode_drawn", False):
+            st.session_state.batch_mode_drawn = batch_mode
+            st.rerun()
+
+        if batch_mode:
+            if st.button("➕ Add Job Description", key="add_bjd"):
+                st.session_state.batch_jds.append({})
+                st.rerun()
+
+            for i in range(len(st.session_state.batch_jds)):
+                with st.container(border=True):
+                    st.text_input(f"💼 Job Title #{i+2}", key=f"bjd_title_{i}")
+                    st.text_area(f"📝 Job Description #{i+2}", key=f"bjd_desc_{i}", height=150)
+                    st.text_area(f"🛠️ Skills Required #{i+2}", key=f"bjd_skills_{i}", height=100)
+
+                    if st.button(f"🗑️ Remove Job Description {i+2}", key=f"rem_bjd_{i}"):
+                        st.session_state.batch_jds.pop(i)
+                        st.rerun()
+
+
+@st.fragment
+@timed("skills")
+def skills_section():
     with st.container(border=True):
         st.subheader("⚡ Skills")
         if st.button("➕ Add Skill"):
@@ -480,7 +765,10 @@ with g1:
         for i in range(len(st.session_state.resume["skills"])):
             st.session_state.resume["skills"][i] = st.text_input(f"S{i}", key=f"sk_{i}", label_visibility="collapsed")
 
-with g2:
+
+@st.fragment
+@timed("coursework")
+def coursework_section():
     with st.container(border=True):
         st.subheader("📚 Coursework")
         if st.button("➕ Add Course"):
@@ -488,123 +776,164 @@ with g2:
         for i in range(len(st.session_state.resume["coursework"])):
             st.session_state.resume["coursework"][i] = st.text_input(f"C{i}", key=f"co_{i}", label_visibility="collapsed")
 
-# --- GENERATE ---
+
+contact_section()
+
 st.write("##")
-with st.container(border=True):
-    st.subheader("🧞 Generate Resume")
+education_section()
 
-    if st.button("✨ Generate ATS Resume", use_container_width=True):
+st.write("##")
+experience_section()
 
-        contacts = {
-            "f_name": st.session_state.get("f_name", ""),
-            "m_name": st.session_state.get("m_name", ""),
-            "l_name": st.session_state.get("l_name", ""),
-            "email": st.session_state.get("email", ""),
-            "phone": st.session_state.get("phone", ""),
-            "linked_in": st.session_state.get("linked_in", ""),
-            "github": st.session_state.get("github", "")
-        }
+st.write("##")
+projects_section()
 
-        education = []
-        for i in range(len(st.session_state.resume["education"])):
-            education.append({
-                "degree": st.session_state.get(f"deg_{i}", ""),
-                "institute": st.session_state.get(f"inst_{i}", ""),
-                "start": format_date(st.session_state.get(f"s_ed_{i}")),
-                "end": format_date(st.session_state.get(f"e_ed_{i}"))
-            })
+st.write("##")
+job_description_section()
 
-        experience = []
-        for i in range(len(st.session_state.resume["experience"])):
-            is_present = st.session_state.get(f"present_{i}", False)
+st.write("##")
+g1, g2 = st.columns(2)
 
-            end_value = "Present" if is_present else format_date(
-                st.session_state.get(f"e_ex_{i}")
-            )
+with g1:
+    skills_section()
 
-            experience.append({
-                "company": st.session_state.get(f"comp_{i}", ""),
-                "role": st.session_state.get(f"role_{i}", ""),
-                "start": format_date(st.session_state.get(f"s_ex_{i}")),
-                "end": end_value,
-                "desc": st.session_state.get(f"desc_{i}", "")
-            })
+with g2:
+    coursework_section()
 
+# --- BACKGROUND JOB ---
+JOB_ICONS = {"queued": "⏳", "calling model": "📡", "parsing": "🧩", "rendering": "🖨️"}
 
-        projects = []
-        for i in range(len(st.session_state.resume["projects"])):
-            projects.append({
-                "name": st.session_state.get(f"pj_name_{i}", ""),
-                "url": st.session_state.get(f"pj_url_{i}", ""),
-                "mem": st.session_state.get(f"pj_mem_{i}", ""),
-                "desc": st.session_state.get(f"pj_desc_{i}", "")
-            })
 
-        
+def start_job(job_id, label):
+    st.session_state.active_job = job_id
+    st.session_state.active_job_label = label
+    st.session_state.downloads = None
+    st.query_params["job"] = job_id
+
+
+@st.fragment(run_every=1.0)
+def job_panel():
+    from jobs import get_jobs, DONE
+
+    job = get_jobs().get(st.session_state.get("active_job"))
+    if job is None:
+        # Expired or from before a server restart
+        st.session_state.active_job = None
+        st.query_params.pop("job", None)
+        return
+
+    state = job.snapshot()
+
+    if not job.finished:
+        st.info(
+            f"{st.session_state.get('active_job_label', '🧞 Working...')} "
+            f"{JOB_ICONS.get(state['status'], '')} {state['status']} · {job.elapsed:.0f}s"
+        )
+        # ✅ Sections show up as soon as the model finishes each one
+        with st.expander("👁️ Resume Preview", expanded=True):
+            with st.container(height=500, border=True):
+                for key in SECTION_ORDER:
+                    render_section(key, state["sections"].get(key))
+        return
+
+    st.session_state.active_job = None
+    st.query_params.pop("job", None)
+
+    if state["status"] != DONE:
+        st.session_state.job_error = state["error"]
+        st.rerun()
+
+    st.session_state.generated_resume = job.result
+    st.session_state.has_generated = True
+    st.session_state.version_id = job.version_id
+    st.session_state.job_error = None
+    st.session_state.downloads = {
+        "docx": job.docx,
+        "pdf": job.pdf,
+        "name": resume_filename(job.result, "Resume"),
+        "improved": job.kind == "revise",
+        "version_id": job.version_id,
+    }
+    st.query_params["v"] = str(job.version_id)
+
+    # Full rerun so the feedback and versions sections pick up the result
+    st.rerun()
+
+
+# --- GENERATE ---
+st.write("##")
+with st.container(border=True):
+    st.subheader("🧞 Generate Resume")
+
+    batch_mode = st.session_state.get("batch_mode", False) and st.session_state.batch_jds
+    generate_label = "✨ Generate for All Job Descriptions" if batch_mode else "✨ Generate ATS Resume"
+
+    if st.button(generate_label, use_container_width=True, disabled=bool(st.session_state.get("active_job") or st.session_state.get("batch_jobs"))):
 
-        missing = get_missing_fields(contacts, education, experience, projects)
+        final_payload = build_resume_payload()
+        missing = payload_missing_fields(final_payload)
 
         if missing:
             st.error(f"🚫 Missing: {', '.join(missing)}")
-        else:
-            
-            final_payload = {
-                "contacts": contacts,
-                "education": education,
-                "experience": experience,
-                "projects": projects,
-                "skills": st.session_state.resume["skills"],
-                "coursework": st.session_state.resume["coursework"]
-                }
+        elif batch_mode:
             st.session_state.last_payload = final_payload
-            
-            # ✅ NEW: Separate JD payload
-            jd_payload = {
-                "job_title": st.session_state.get("jd_title", ""),
-                "description": st.session_state.get("jd_desc", ""),
-                "skills_required": st.session_state.get("jd_skills", "")
-                }
-            
-            # ✅ UPDATED: Pass JD separately
-            generated_resume = enhance_resume(
-                resume_json=final_payload,
-                job_description_json=jd_payload
-                )
-            
-            st.session_state.generated_resume = generated_resume
-            st.session_state.has_generated = True
-
+            run_batch_generation(final_payload)
+        else:
+            from jobs import get_jobs
 
-            st.success("✅ Resume Generated Successfully!")
-            with st.expander("👁️ Resume Preview", expanded=True):
-                with st.container(height=500, border=True):
-                    render_resume_preview(generated_resume)
+            st.session_state.last_payload = final_payload
 
+            # ✅ NEW: Separate JD payload
+            jd_payload = build_jd_payload()
+
+            # Runs in the background; the job panel below polls it
+            start_job(
+                get_jobs().submit_generate(
+                    st.session_state.session_id, final_payload, jd_payload,
+                    use_cache=st.session_state.get("use_cache", True),
+                    parallel=st.session_state.get("parallel_sections", False)
+                ),
+                "🧞 Generating your resume..."
+            )
 
-            # st.json(generated_resume)        for ai generated json preview
 
-            
-            # ✅ Generate DOCX file
-            docx_file = generate_docx_from_template(generated_resume)
+# --- JOB STATUS ---
+if st.session_state.get("active_job"):
+    job_panel()
 
-            
-            # ✅ Provide DOCX download
-            full_name = generated_resume.get("header", {}).get("name", "User")
-            safe_name = full_name.strip().replace(" ", "_")
+if st.session_state.get("batch_jobs"):
+    batch_panel()
+elif st.session_state.get("batch_result"):
+    show_batch_result(st.session_state.batch_result)
 
-            download_filename = f"{safe_name}_Resume.docx"
+if st.session_state.get("job_error"):
+    st.error(f"❌ Generation failed: {st.session_state.job_error}")
 
-            with open(docx_file, "rb") as f:
-                st.download_button(
-                    label="⬇️ Download Resume.docx",
-                    data=f,
-                    file_name=download_filename,
-                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    use_container_width=True
-                    )
+downloads = st.session_state.get("downloads")
+if downloads and not st.session_state.get("active_job"):
+    done_label = "✅ Resume Improved Successfully!" if downloads["improved"] else "✅ Resume Generated Successfully!"
+    st.success(done_label)
 
+    with st.expander("👁️ Resume Preview", expanded=False):
+        render_resume_preview(st.session_state.generated_resume)
 
+    # ✅ Rendered by the job, so downloads are instant
+    if downloads["docx"] is not None:
+        st.download_button(
+            label="📥 Download Improved Resume (.docx)" if downloads["improved"] else "⬇️ Download Resume.docx",
+            data=downloads["docx"],
+            file_name=f"{downloads['name']}.docx",
+            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+            use_container_width=True
+        )
 
+    st.download_button(
+        label="📥 Download Improved Resume (.pdf)" if downloads["improved"] else "⬇️ Download Resume.pdf",
+        data=downloads["pdf"],
+        file_name=f"{downloads['name']}.pdf",
+        mime="application/pdf",
+        use_container_width=True
+    )
 
 
 # --- FEEDBACK SECTION ---
@@ -619,44 +948,105 @@ if st.session_state.has_generated and "last_payload" in st.session_state:
             height=120
         )
 
-        if st.button("🚀 Regenerate with Feedback", use_container_width=True):
+        busy = bool(st.session_state.get("active_job"))
+        if st.button("🚀 Regenerate with Feedback", use_container_width=True, disabled=busy):
+            from jobs import get_jobs
 
+            jd_payload = build_jd_payload()
 
-            jd_payload = {
-                "job_title": st.session_state.get("jd_title", ""),
-                "description": st.session_state.get("jd_desc", ""),
-                "skills_required": st.session_state.get("jd_skills", "")
-            }
+            if st.session_state.get("patch_feedback", True) and st.session_state.generated_resume:
+                # Model returns only the edit; falls back to a full rewrite
+                job_id = get_jobs().submit_revise(
+                    st.session_state.session_id, st.session_state.generated_resume, feedback_text,
+                    st.session_state.last_payload, jd_payload,
+                    parent_id=st.session_state.get("version_id"),
+                    use_cache=st.session_state.get("use_cache", True)
+                )
+            else:
+                job_id = get_jobs().submit_generate(
+                    st.session_state.session_id, st.session_state.last_payload, jd_payload,
+                    feedback=feedback_text,
+                    parent_id=st.session_state.get("version_id"),
+                    use_cache=st.session_state.get("use_cache", True),
+                    parallel=st.session_state.get("parallel_sections", False)
+                )
 
-            improved_resume = enhance_resume(
-                resume_json=st.session_state.last_payload,
-                job_description_json=jd_payload,
-                feedback=feedback_text
-            )
+            start_job(job_id, "🧞 Applying your feedback...")
+            st.rerun()
+
+
+
+# --- VERSIONS ---
+VERSION_FILES_KEEP = 5   # rendered versions kept per session
+
+if st.session_state.get("version_id"):
+    from versions import get_versions
+    from store import owner_of
 
-            st.session_state.generated_resume = improved_resume
+    versions = get_versions()
+    current_id = st.session_state.version_id
 
-            st.success("✅ Resume Improved Successfully!")
+    with st.expander("🕘 Versions", expanded=False):
+        chain = versions.lineage(current_id)
+        others = [
+            v for v in versions.recent(owner_of(st.session_state.last_payload or {}))
+            if v["id"] not in {c["id"] for c in chain}
+        ]
 
-            with st.expander("👁️ Updated Resume Preview", expanded=True):
-                with st.container(height=500, border=True):
-                    render_resume_preview(improved_resume)
+        def version_label(v):
+            marker = "👉 " if v["id"] == current_id else ""
+            what = f"feedback: {v['feedback'][:40]}" if v["feedback"] else "generated"
+            return f"{marker}#{v['id']} · {datetime.fromtimestamp(v['created_at']):%d %b %H:%M} · {what}"
 
+        options = {v["id"]: v for v in chain[::-1] + others}
+        selected_id = st.selectbox(
+            "Feedback rounds (newest first), then other versions of this profile",
+            list(options), format_func=lambda vid: version_label(options[vid])
+        )
 
+        selected = versions.load(selected_id)
+        if st.toggle("👁️ Preview selected version"):
+            render_resume_preview(selected["resume"])
 
+        col_restore, col_docx, col_pdf = st.columns(3)
+        if col_restore.button("♻️ Restore", disabled=selected_id == current_id, use_container_width=True):
+            st.session_state.restore_version = selected_id
+            st.rerun()
 
-            # 👇 NEW DOWNLOAD
-            docx_file = generate_docx_from_template(improved_resume)
+        # Files are rendered on demand and kept per version id; the version
+        # the last job produced reuses the files that job already rendered
+        version_files = st.session_state.setdefault("version_files", {})
+        files = version_files.get(selected_id)
+        if files is None and downloads and downloads.get("version_id") == selected_id:
+            files = {"docx": downloads["docx"], "pdf": downloads["pdf"]}
 
-            full_name = improved_resume.get("header", {}).get("name", "User")
-            safe_name = full_name.strip().replace(" ", "_")
-            download_filename = f"{safe_name}_Resume.docx"
+        if files is None:
+            if col_docx.button("📦 Prepare downloads", use_container_width=True):
+                from doc_gen import render_docx_bytes
 
-            with open(docx_file, "rb") as file:
-                st.download_button(
-                    label="📥 Download Improved Resume (.docx)",
-                    data=file,
-                    file_name=download_filename,
+                version_files[selected_id] = {
+                    "docx": render_docx_bytes(selected["resume"]),
+                    "pdf": render_pdf_bytes(selected["resume"]),
+                }
+                while len(version_files) > VERSION_FILES_KEEP:
+                    version_files.pop(next(iter(version_files)))
+                st.rerun()
+        else:
+            if files["docx"] is not None:
+                col_docx.download_button(
+                    label="⬇️ .docx",
+                    data=files["docx"],
+                    file_name=resume_filename(selected["resume"], f"Resume_v{selected_id}.docx"),
                     mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
                     use_container_width=True
                 )
+            col_pdf.download_button(
+                label="⬇️ .pdf",
+                data=files["pdf"],
+                file_name=resume_filename(selected["resume"], f"Resume_v{selected_id}.pdf"),
+                mime="application/pdf",
+                use_container_width=True
+            )
+
+
+record_timing("full_script", time.perf_counter() - SCRIPT_STARTED)
@@ -0,0 +1,387 @@
+import os
+import json
+import time
+import uuid
+import bisect
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ================= METRICS =================
+# Spans time each stage (payload assembly, clean_json, prompt build, upstream
+# call, JSON parse, preview, DOCX/PDF render, save) into process-wide
+# histograms. A request context (one generation or revision) also collects
+# its own stage times, tokens, TTFT and cache status, and is written out as
+# one JSON log line when it finishes.
+#
+#   with request("generate") as ctx:
+#       with span("clean_json"):
+#           ...
+#
+# Everything, plus pool, breaker and router stats, is served in Prometheus
+# text format from http://127.0.0.1:$RESUMEGENIE_METRICS_PORT/metrics.
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = int(os.getenv("RESUMEGENIE_METRICS_PORT", "9464"))     # 0 disables the endpoint
+REQUEST_LOG = os.getenv("RESUMEGENIE_REQUEST_LOG", "1").lower() not in ("0", "false", "off")
+
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000)
+
+HELP = {
+    "resumegenie_stage_seconds": "Time spent per pipeline stage",
+    "resumegenie_ttft_seconds": "Time to first token of a model response",
+    "resumegenie_requests_total": "Finished generation / revision requests",
+    "resumegenie_cache_total": "Response cache lookups",
+    "resumegenie_tokens_total": "Tokens reported by the provider",
+    "resumegenie_json_repairs_total": "Local repairs applied to model JSON",
+    "resumegenie_upstream_failures_total": "Failed model attempts that moved on to a retry or the next model",
+    "resumegenie_rejected_responses_total": "Model answers rejected by validation (e.g. unparseable JSON)",
+    "resumegenie_fallbacks_total": "Degraded paths taken (structured output off, patch -> regeneration, ...)",
+    "resumegenie_model_latency_seconds": "Model call latency per request class (router window)",
+    "resumegenie_model_prompt_tokens": "Prompt tokens per model call (router window)",
+    "resumegenie_model_completion_tokens": "Completion tokens per model call (router window)",
+    "resumegenie_model_breaker_state": "Circuit breaker: 0 closed, 1 half-open, 2 open",
+    "resumegenie_pool_running": "Generations running",
+    "resumegenie_pool_queue_depth": "Generations waiting for a worker",
+    "resumegenie_pool_queued_sessions": "Sessions with queued generations",
+    "resumegenie_pool_max_concurrency": "Generation concurrency cap",
+    "resumegenie_pool_jobs_total": "Generation pool tasks by outcome",
+}
+
+
+class Histogram:
+
+    # Fixed buckets (cumulative counts are derived on export) plus a window
+    # of recent values for quantiles
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=200)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+    def mean(self):
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+# ================= REGISTRY =================
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in labels.values())
+    return "{" + ",".join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + "}"
+
+
+def _histogram_lines(name, labels, hist):
+    lines = []
+    cumulative = 0
+    for bound, count in zip(hist.buckets, hist.counts):
+        cumulative += count
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': bound})} {cumulative}")
+    lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {hist.count}")
+    lines.append(f"{name}_sum{_labels(labels)} {hist.sum}")
+    lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+    return lines
+
+
+class Registry:
+
+    def __init__(self):
+        self.histograms = {}        # name -> {label tuple: Histogram}
+        self.counters = {}          # name -> {label tuple: value}
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, buckets=STAGE_BUCKETS, **labels):
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            key = tuple(labels.items())
+            if key not in series:
+                series[key] = Histogram(buckets)
+            series[key].observe(value)
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            key = tuple(labels.items())
+            series[key] = series.get(key, 0) + value
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.histograms.items()):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+                for key, hist in sorted(series.items()):
+                    lines += _histogram_lines(name, dict(key), hist)
+            for name, series in sorted(self.counters.items()):
+                lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_labels(dict(key))} {value}")
+        return lines
+
+
+registry = Registry()
+
+
+# ================= REQUEST CONTEXT =================
+class RequestContext:
+
+    def __init__(self, kind, fields):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.fields = dict(fields)
+        self.started = time.time()
+        self.stages = {}
+        self.models = []
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.ttft = None
+        self.cache = None
+        self.status = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage, elapsed):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+
+    def note(self, **fields):
+        with self._lock:
+            self.fields.update(fields)
+
+    def extend(self, field, values):
+        # List field that several calls within one request add to
+        with self._lock:
+            self.fields.setdefault(field, []).extend(values)
+
+    def record(self):
+        with self._lock:
+            return {
+                "event": "request",
+                "request_id": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "error": self.error,
+                "duration_ms": round((time.time() - self.started) * 1000, 1),
+                "ttft_ms": None if self.ttft is None else round(self.ttft * 1000, 1),
+                "cache": self.cache,
+                "models": self.models,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "stages_ms": {k: round(v * 1000, 2) for k, v in self.stages.items()},
+                **self.fields,
+            }
+
+
+_current = contextvars.ContextVar("resumegenie_request", default=None)
+
+
+def current():
+    return _current.get()
+
+
+@contextmanager
+def request(kind, **fields):
+
+    # One generation / revision; nested spans, tokens and cache status land
+    # on it. Worker threads need contextvars.copy_context() to see it.
+    ctx = RequestContext(kind, fields)
+    token = _current.set(ctx)
+    try:
+        yield ctx
+        ctx.status = "ok"
+    except BaseException as e:
+        ctx.status = "error"
+        ctx.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        registry.inc("resumegenie_requests_total", kind=kind, status=ctx.status)
+        if REQUEST_LOG:
+            print(json.dumps(ctx.record(), default=str), flush=True)
+
+
+def record_stage(stage, elapsed):
+    registry.observe("resumegenie_stage_seconds", elapsed, stage=stage)
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.add_stage(stage, elapsed)
+
+
+@contextmanager
+def span(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - start)
+
+
+def record_cache(kind, result):
+    # result: "hit", "miss" or "off"
+    registry.inc("resumegenie_cache_total", kind=kind, result=result)
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.cache = result
+
+
+def record_ttft(kind, model, seconds):
+    registry.observe("resumegenie_ttft_seconds", seconds, LATENCY_BUCKETS, kind=kind, model=model)
+    ctx = _current.get()
+    if ctx is not None and ctx.ttft is None:
+        ctx.ttft = seconds
+
+
+def record_usage(kind, model, usage):
+    prompt = getattr(usage, "prompt_tokens", None) or 0
+    completion = getattr(usage, "completion_tokens", None) or 0
+    registry.inc("resumegenie_tokens_total", prompt, kind=kind, model=model, type="prompt")
+    registry.inc("resumegenie_tokens_total", completion, kind=kind, model=model, type="completion")
+
+    ctx = _current.get()
+    if ctx is not None:
+        with ctx._lock:
+            ctx.prompt_tokens += prompt
+            ctx.completion_tokens += completion
+            if model not in ctx.models:
+                ctx.models.append(model)
+
+
+def record_json_repairs(applied):
+    for repair in applied:
+        registry.inc("resumegenie_json_repairs_total", repair=repair)
+    ctx = _current.get()
+    if ctx is not None and applied:
+        ctx.extend("json_repairs", applied)
+
+
+def record_upstream_failure(model, error):
+    registry.inc("resumegenie_upstream_failures_total", model=model, error=type(error).__name__)
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.extend("upstream_failures", [{"model": model, "error": f"{type(error).__name__}: {error}"}])
+
+
+def record_rejected_response(model):
+    # Runs on the upstream worker, which carries the caller's context
+    registry.inc("resumegenie_rejected_responses_total", model=model)
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.extend("rejected_responses", [model])
+
+
+def record_fallback(fallback, **details):
+    # fallback: "structured_output", "section_repair", "rule_fixup", "patch"
+    registry.inc("resumegenie_fallbacks_total", fallback=fallback)
+    ctx = _current.get()
+    if ctx is not None:
+        ctx.extend("fallbacks", [{"fallback": fallback, **details}])
+
+
+# ================= EXPORT =================
+def _gauge(name, value, labels=None):
+    return [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} gauge", f"{name}{_labels(labels)} {value}"]
+
+
+def _process_lines():
+
+    # Live state owned by other modules, read at scrape time
+    from generation_pool import get_pool
+    from upstream import health_snapshot
+
+    lines = []
+    pool = get_pool().metrics()
+    for key in ("running", "queue_depth", "queued_sessions", "max_concurrency"):
+        lines += _gauge(f"resumegenie_pool_{key}", pool[key])
+
+    name = "resumegenie_pool_jobs_total"
+    lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} counter"]
+    for key in ("submitted", "coalesced", "completed", "failed"):
+        lines.append(f'{name}{{result="{key}"}} {pool[key]}')
+
+    name = "resumegenie_model_breaker_state"
+    lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} gauge"]
+    for model, health in sorted(health_snapshot().items()):
+        state = {"closed": 0, "half-open": 1, "open": 2}[health["state"]]
+        lines.append(f"{name}{_labels({'model': model})} {state}")
+
+    try:
+        from llm import router
+    except ImportError:
+        return lines
+
+    with router._lock:
+        stats = sorted(router.stats.items())
+    for metric, name in (
+        ("latency", "resumegenie_model_latency_seconds"),
+        ("prompt_tokens", "resumegenie_model_prompt_tokens"),
+        ("completion_tokens", "resumegenie_model_completion_tokens"),
+    ):
+        lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} histogram"]
+        for (kind, model), hists in stats:
+            lines += _histogram_lines(name, {"kind": kind, "model": model}, hists[metric])
+
+    return lines
+
+
+def render():
+    return "\n".join(registry.render() + _process_lines()) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_server(port=METRICS_PORT, host=METRICS_HOST):
+
+    # Once per process, on a daemon thread; a second process on the same
+    # port just goes without an endpoint
+    global _server
+
+    if not port:
+        return None
+
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _Handler)
+            except OSError as e:
+                print(f"Metrics endpoint not started on {host}:{port}: {e}")
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="resumegenie-metrics", daemon=True).start()
+
+    return _server or None
@@ -0,0 +1,304 @@
+import zlib
+from functools import lru_cache
+from inline_markup import parse_inline
+from metrics import span
+
+# ================= PDF BACKEND =================
+# Lays the resume JSON out straight into PDF using the two standard Helvetica
+# faces, so no fonts are embedded and no office suite is involved. Mirrors
+# doc_gen's layout: centered header, divider + blue section titles,
+# right-aligned dates, hanging-indent bullets with bold runs.
+
+PAGE_WIDTH = 612          # US Letter, points
+PAGE_HEIGHT = 792
+MARGIN_LEFT = 36          # 0.5in, as doc_gen.set_margins
+MARGIN_RIGHT = 36
+MARGIN_TOP = 36
+MARGIN_BOTTOM = 72        # 1.0in
+CONTENT_WIDTH = PAGE_WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+
+BULLET_INDENT = 18        # 0.25in hanging indent
+LINE_FACTOR = 1.2 * 1.08  # font size -> baseline-to-baseline distance
+
+BLACK = (0, 0, 0)
+BLUE = (0, 0.4, 0.8)
+GRAY = (0.39, 0.39, 0.39)
+DIVIDER_GRAY = (0.71, 0.71, 0.71)
+
+FONTS = {False: "F1", True: "F2"}   # bold -> resource name
+FONT_NAMES = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+
+# ================= FONT METRICS =================
+# Advance widths (1/1000 em) for ASCII 32..126 from the Adobe core AFMs
+_ASCII_REGULAR = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_ASCII_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+# WinAnsi punctuation models actually emit: ’ ‘ “ ” • – — …
+_EXTRA_REGULAR = {0x92: 222, 0x91: 222, 0x93: 333, 0x94: 333, 0x95: 350, 0x96: 556, 0x97: 1000, 0x85: 1000}
+_EXTRA_BOLD = {0x92: 278, 0x91: 278, 0x93: 500, 0x94: 500, 0x95: 350, 0x96: 556, 0x97: 1000, 0x85: 1000}
+DEFAULT_WIDTH = 556       # accented Latin-1 letters are close to this
+
+
+def _width_table(ascii_widths, extra):
+    table = [DEFAULT_WIDTH] * 256
+    table[32:127] = ascii_widths
+    for code, width in extra.items():
+        table[code] = width
+    table[0xA0] = 278    # no-break space
+    return table
+
+
+WIDTHS = {False: _width_table(_ASCII_REGULAR, _EXTRA_REGULAR), True: _width_table(_ASCII_BOLD, _EXTRA_BOLD)}
+
+
+@lru_cache(maxsize=8192)
+def encode(text):
+    # WinAnsiEncoding is cp1252; anything outside it (emoji, CJK) becomes '?'
+    return text.encode("cp1252", "replace")
+
+
+@lru_cache(maxsize=16384)
+def text_width(text, bold, size):
+    table = WIDTHS[bold]
+    return sum(table[b] for b in encode(text)) * size / 1000
+
+
+def pdf_string(text):
+    data = encode(text).replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + data + b")"
+
+
+# ================= LINE BREAKING =================
+def wrap_runs(runs, size, width):
+
+    # runs: [(text, bold)] -> lines of [(text, bold)], greedy fill. Words keep
+    # their trailing space so a bold/plain boundary inside a word stays glued.
+    words = []
+    for text, bold in runs:
+        start = 0
+        for i, ch in enumerate(text):
+            if ch == " ":
+                words.append((text[start:i + 1], bold))
+                start = i + 1
+        if start < len(text):
+            words.append((text[start:], bold))
+
+    lines, line, used = [], [], 0.0
+    for word, bold in words:
+        w = text_width(word, bold, size)
+        trimmed = w - text_width(" ", bold, size) if word.endswith(" ") else w
+        # A new word only starts after a space; mid-word run changes never break
+        breakable = not line or line[-1][0].endswith(" ")
+        if line and breakable and used + trimmed > width:
+            lines.append(line)
+            line, used = [], 0.0
+        if line and line[-1][1] == bold:
+            line[-1] = (line[-1][0] + word, bold)
+        else:
+            line.append((word, bold))
+        used += w
+    if line:
+        lines.append(line)
+
+    return [[(t.rstrip(" ") if i == len(l) - 1 else t, b) for i, (t, b) in enumerate(l)] for l in lines]
+
+
+# ================= PAGE WRITER =================
+class PdfCanvas:
+
+    def __init__(self):
+        self.pages = []
+        self.new_page()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN_TOP
+
+    def ensure(self, height):
+        # Start a new page unless the block fits (blocks taller than a page
+        # just flow)
+        if self.y - height < MARGIN_BOTTOM and self.y < PAGE_HEIGHT - MARGIN_TOP:
+            self.new_page()
+
+    def skip(self, points):
+        self.y -= points
+
+    def text_line(self, segments, size, x, color=BLACK):
+        # segments: [(text, bold)] drawn left to right from x on the current baseline
+        ops = [b"BT %.3g %.3g %.3g rg 1 0 0 1 %.2f %.2f Tm" % (*color, x, self.y)]
+        for text, bold in segments:
+            if text:
+                ops.append(b"/%s %.3g Tf %s Tj" % (FONTS[bold].encode(), size, pdf_string(text)))
+        ops.append(b"ET")
+        self.ops.append(b" ".join(ops))
+
+    def hline(self, color=DIVIDER_GRAY, width=0.75):
+        self.ops.append(
+            b"%.3g %.3g %.3g RG %.2f w %.2f %.2f m %.2f %.2f l S"
+            % (*color, width, MARGIN_LEFT, self.y, PAGE_WIDTH - MARGIN_RIGHT, self.y)
+        )
+
+    def to_bytes(self, compress=True):
+
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            None,    # page tree, filled in once page ids are known
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        ]
+        resources = b"<< /Font << /F1 3 0 R /F2 4 0 R >> >>"
+
+        page_ids = []
+        for ops in self.pages:
+            content = b"\n".join(ops)
+            if compress:
+                content = zlib.compress(content, 6)
+                header = b"<< /Length %d /Filter /FlateDecode >>" % len(content)
+            else:
+                header = b"<< /Length %d >>" % len(content)
+            objects.append(header + b"\nstream\n" + content + b"\nendstream")
+            content_id = len(objects)
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                % (PAGE_WIDTH, PAGE_HEIGHT, resources, content_id)
+            )
+            page_ids.append(len(objects))
+
+        kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+        objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+        out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for i, obj in enumerate(objects, start=1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+        out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+        return bytes(out)
+
+
+# ================= BLOCKS =================
+def add_paragraph(canvas, runs, size, indent=0, color=BLACK, space_after=0, prefix=None):
+
+    lines = wrap_runs(runs, size, CONTENT_WIDTH - indent)
+    leading = size * LINE_FACTOR
+    canvas.ensure(leading * len(lines))    # keep each paragraph on one page
+
+    for i, line in enumerate(lines):
+        canvas.skip(leading)
+        if prefix and i == 0:
+            canvas.text_line([(prefix, False)], size, MARGIN_LEFT + indent - BULLET_INDENT, color)
+        canvas.text_line(line, size, MARGIN_LEFT + indent, color)
+    canvas.skip(space_after)
+
+
+def add_centered(canvas, text, size, bold=False, color=BLACK, space_after=0):
+    canvas.skip(size * LINE_FACTOR)
+    x = MARGIN_LEFT + max(0.0, (CONTENT_WIDTH - text_width(text, bold, size)) / 2)
+    canvas.text_line([(text, bold)], size, x, color)
+    canvas.skip(space_after)
+
+
+def add_section_title(canvas, title):
+    canvas.ensure(2 + 6 + 12 + 13 * LINE_FACTOR + 6 + 11 * LINE_FACTOR)   # keep with next line
+    canvas.skip(2)
+    canvas.hline()
+    canvas.skip(6 + 12)
+    canvas.skip(13 * LINE_FACTOR)
+    canvas.text_line([(title, True)], 13, MARGIN_LEFT, BLUE)
+    canvas.skip(6)
+
+
+def add_left_right_line(canvas, left_text, right_text, bold_left=False):
+    canvas.ensure(11 * LINE_FACTOR)
+    canvas.skip(11 * LINE_FACTOR)
+    canvas.text_line([(left_text, bold_left)], 11, MARGIN_LEFT)
+    if right_text:
+        x = PAGE_WIDTH - MARGIN_RIGHT - text_width(right_text, False, 10.5)
+        canvas.text_line([(right_text, False)], 10.5, x, GRAY)
+
+
+def add_bullet(canvas, text):
+    add_paragraph(canvas, parse_inline(text), 11, indent=BULLET_INDENT, space_after=3, prefix="•")
+
+
+def add_header(canvas, header):
+    add_centered(canvas, header.get("name", ""), 20, bold=True, space_after=4)
+
+    contact = "  |  ".join(
+        filter(None, [header.get(k, "") for k in ("phone", "email", "linkedin", "github")])
+    )
+    if contact:
+        add_centered(canvas, contact, 10, color=BLUE)
+
+
+# ================= MAIN GENERATOR =================
+def build_pdf(resume):
+
+    canvas = PdfCanvas()
+
+    add_header(canvas, resume.get("header", {}))
+
+    summary = resume.get("summary", "").strip()
+    if summary:
+        add_section_title(canvas, "Summary")
+        add_paragraph(canvas, parse_inline(summary), 10.5, space_after=8)
+
+    education = resume.get("education", [])
+    if education:
+        add_section_title(canvas, "Education")
+        for edu in education:
+            add_left_right_line(canvas, edu.get("degree", ""), edu.get("duration", ""), True)
+            add_left_right_line(canvas, edu.get("institution", ""), edu.get("grade", ""))
+
+    experience = resume.get("experience", [])
+    if experience:
+        add_section_title(canvas, "Experience")
+        for exp in experience:
+            role_company = f"{exp.get('role','')} — {exp.get('company','')}"
+            add_left_right_line(canvas, role_company, exp.get("duration", ""), True)
+            for bullet in exp.get("bullets", []):
+                add_bullet(canvas, bullet)
+
+    projects = resume.get("projects", [])
+    if projects:
+        add_section_title(canvas, "Projects")
+        for proj in projects:
+            add_paragraph(canvas, ((proj.get("title", ""), True),), 11)
+            for bullet in proj.get("bullets", []):
+                add_bullet(canvas, bullet)
+
+    coursework = resume.get("coursework", [])
+    if coursework:
+        add_section_title(canvas, "Relevant Coursework")
+        add_paragraph(canvas, ((" • ".join(coursework), False),), 10.5)
+
+    skills = resume.get("skills", {})
+    if skills:
+        add_section_title(canvas, "Technical Skills")
+        for category, items in skills.items():
+            add_paragraph(canvas, parse_inline(f"{category}: {', '.join(items)}"), 10.5)
+
+    return canvas
+
+
+def render_pdf_bytes(resume):
+    with span("render_pdf"):
+        return build_pdf(resume).to_bytes()
@@ -0,0 +1,91 @@
+import streamlit as st
+from resume_schema import SECTION_ORDER
+from inline_markup import to_markdown
+from metrics import span
+
+
+def render_header(header):
+
+    full_name = header.get("name", "")
+    contact_line = " | ".join(
+        filter(None, [
+            header.get("phone", ""),
+            header.get("email", ""),
+            header.get("linkedin", ""),
+            header.get("github", "")
+        ])
+    )
+
+    st.markdown(f"## {full_name}")
+    st.markdown(contact_line)
+    st.divider()
+
+
+def render_section(key, value):
+
+    if not value:
+        return
+
+    # HEADER
+    if key == "header":
+        render_header(value)
+
+    # SUMMARY
+    elif key == "summary":
+        st.markdown("### Summary")
+        st.markdown(to_markdown(value))
+        st.divider()
+
+    # EDUCATION
+    elif key == "education":
+        st.markdown("### Education")
+        for edu in value:
+            st.markdown(
+                f"**{edu.get('degree','')}**  |  {edu.get('duration','')}"
+            )
+            st.write(
+                f"{edu.get('institution','')}  |  {edu.get('grade','')}"
+            )
+        st.divider()
+
+    # EXPERIENCE
+    elif key == "experience":
+        st.markdown("### Experience")
+        for exp in value:
+            st.markdown(
+                f"**{exp.get('role','')} — {exp.get('company','')}**  |  {exp.get('duration','')}"
+            )
+            for bullet in exp.get("bullets", []):
+                st.markdown(f"- {to_markdown(bullet)}")
+        st.divider()
+
+    # PROJECTS
+    elif key == "projects":
+        st.markdown("### Projects")
+        for proj in value:
+            st.markdown(f"**{proj.get('title','')}**")
+            for bullet in proj.get("bullets", []):
+                st.markdown(f"- {to_markdown(bullet)}")
+        st.divider()
+
+    # COURSEWORK
+    elif key == "coursework":
+        st.markdown("### Relevant Coursework")
+        st.write(" • ".join(value))
+        st.divider()
+
+    # SKILLS
+    elif key == "skills":
+        st.markdown("### Technical Skills")
+        for category, items in value.items():
+            st.markdown(to_markdown(f"{category}: {', '.join(items)}"))
+
+
+def render_resume_preview(resume):
+
+    with span("render_preview"):
+        render_header(resume.get("header", {}))
+
+        for key in SECTION_ORDER[1:]:
+            render_section(key, resume.get(key))
+
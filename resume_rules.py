@@ -0,0 +1,190 @@
+import re
+import copy
+from inline_markup import parse_inline, plain_text
+
+# ================= RULES =================
+# Hard rules from the generation prompt (llm.build_prompt), checked locally
+MAX_BULLET_WORDS = 23
+MAX_BOLD_SPANS = 3
+PROJECT_BULLETS = 2
+SKILL_CATEGORIES = 5
+COURSEWORK_ITEMS = 5
+
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'\-]*")
+
+
+def bullet_paths(resume):
+    for section in ("experience", "projects"):
+        for i, entry in enumerate(resume.get(section, [])):
+            for j, bullet in enumerate(entry.get("bullets", [])):
+                yield (section, i, "bullets", j), bullet
+
+
+def path_id(path):
+    return "/".join(str(p) for p in path)
+
+
+def leading_verb(bullet):
+    match = WORD_PATTERN.search(plain_text(bullet))
+    return match.group(0).lower() if match else ""
+
+
+def word_count(bullet):
+    return len(plain_text(bullet).split())
+
+
+# ================= CHECKER =================
+def check_resume(resume):
+
+    # -> [{"rule", "path", "message"}, ...]
+    violations = []
+
+    def add(rule, path, message):
+        violations.append({"rule": rule, "path": path, "message": message})
+
+    seen_verbs = {}
+    for path, bullet in bullet_paths(resume):
+        words = word_count(bullet)
+        if words > MAX_BULLET_WORDS:
+            add("bullet_words", path, f"{words} words, maximum is {MAX_BULLET_WORDS}")
+
+        bolds = sum(1 for _, bold in parse_inline(bullet) if bold)
+        if bolds > MAX_BOLD_SPANS:
+            add("bold_spans", path, f"{bolds} bold spans, maximum is {MAX_BOLD_SPANS}")
+
+        verb = leading_verb(bullet)
+        if verb in seen_verbs:
+            add("repeated_verb", path, f"starts with '{verb}' like {path_id(seen_verbs[verb])}")
+        elif verb:
+            seen_verbs[verb] = path
+
+    for i, proj in enumerate(resume.get("projects", [])):
+        count = len(proj.get("bullets", []))
+        if count != PROJECT_BULLETS:
+            add("project_bullets", ("projects", i), f"{count} bullets, needs exactly {PROJECT_BULLETS}")
+
+    skills = resume.get("skills", {})
+    if skills and len(skills) != SKILL_CATEGORIES:
+        add("skills_count", ("skills",), f"{len(skills)} skill lines, needs {SKILL_CATEGORIES}")
+
+    coursework = resume.get("coursework", [])
+    if coursework and len(coursework) != COURSEWORK_ITEMS:
+        add("coursework_count", ("coursework",), f"{len(coursework)} courses, needs {COURSEWORK_ITEMS}")
+
+    return violations
+
+
+def score_resume(resume, violations=None):
+    # 100 = every checked rule satisfied
+    if violations is None:
+        violations = check_resume(resume)
+
+    checks = 3 * sum(1 for _ in bullet_paths(resume)) + len(resume.get("projects", [])) + 2
+    return round(100 * max(0.0, 1 - len(violations) / checks), 1)
+
+
+# ================= LOCAL FIXES =================
+def apply_local_fixes(resume, violations):
+
+    # Over-long lists are trimmed here; only shortfalls and bad bullets need
+    # the model. Returns (resume, remaining_violations).
+    resume = copy.deepcopy(resume)
+    remaining = []
+
+    for v in violations:
+        rule, path = v["rule"], v["path"]
+
+        if rule == "project_bullets" and len(resume["projects"][path[1]].get("bullets", [])) > PROJECT_BULLETS:
+            resume["projects"][path[1]]["bullets"] = resume["projects"][path[1]]["bullets"][:PROJECT_BULLETS]
+        elif rule == "skills_count" and len(resume["skills"]) > SKILL_CATEGORIES:
+            resume["skills"] = dict(list(resume["skills"].items())[:SKILL_CATEGORIES])
+        elif rule == "coursework_count" and len(resume["coursework"]) > COURSEWORK_ITEMS:
+            resume["coursework"] = resume["coursework"][:COURSEWORK_ITEMS]
+        else:
+            remaining.append(v)
+
+    # Trimming can drop bullets other violations pointed at
+    live = {path for path, _ in bullet_paths(resume)}
+    remaining = [v for v in remaining if len(v["path"]) < 4 or v["path"] in live]
+
+    return resume, remaining
+
+
+# ================= BATCHED FIX-UP =================
+def build_fixup_request(resume, violations):
+
+    # Everything the model must fix, keyed by stable ids, in one payload
+    request = {"bullets": {}, "add_project_bullets": {}, "add_skill_categories": 0, "add_coursework": 0}
+
+    for v in violations:
+        rule, path = v["rule"], v["path"]
+
+        if len(path) == 4:
+            entry = request["bullets"].setdefault(
+                path_id(path), {"text": resume[path[0]][path[1]]["bullets"][path[3]], "problems": []}
+            )
+            entry["problems"].append(v["message"])
+        elif rule == "project_bullets":
+            proj = resume["projects"][path[1]]
+            request["add_project_bullets"][path_id(path)] = {
+                "title": proj.get("title", ""),
+                "existing": proj.get("bullets", []),
+                "missing": PROJECT_BULLETS - len(proj.get("bullets", [])),
+            }
+        elif rule == "skills_count":
+            request["add_skill_categories"] = SKILL_CATEGORIES - len(resume.get("skills", {}))
+        elif rule == "coursework_count":
+            request["add_coursework"] = COURSEWORK_ITEMS - len(resume.get("coursework", []))
+
+    if request["bullets"]:
+        # So rewritten bullets don't collide with verbs used elsewhere
+        request["verbs_in_use"] = sorted({leading_verb(b) for _, b in bullet_paths(resume)} - {""})
+
+    return {k: v for k, v in request.items() if v}
+
+
+def apply_fixup(resume, response):
+
+    # ValueError on an answer that isn't an object: the caller keeps the
+    # generated text, as for any other failed fix-up
+    if not isinstance(response, dict):
+        raise ValueError(f"Fix-up answer is a {type(response).__name__}, not an object")
+
+    resume = copy.deepcopy(resume)
+
+    rewrites = response.get("bullets")
+    for pid, text in (rewrites if isinstance(rewrites, dict) else {}).items():
+        parts = pid.split("/")
+        if len(parts) != 4 or not isinstance(text, str):
+            continue
+        try:
+            resume[parts[0]][int(parts[1])]["bullets"][int(parts[3])] = text
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+
+    project_bullets = response.get("project_bullets")
+    for pid, bullets in (project_bullets if isinstance(project_bullets, dict) else {}).items():
+        try:
+            proj = resume["projects"][int(pid.split("/")[1])]
+        except (KeyError, IndexError, ValueError):
+            continue
+        if not isinstance(bullets, list):
+            continue
+        proj.setdefault("bullets", []).extend(b for b in bullets if isinstance(b, str))
+        proj["bullets"] = proj["bullets"][:PROJECT_BULLETS]
+
+    skills = response.get("skills")
+    if isinstance(skills, dict):
+        merged = dict(resume.get("skills", {}))
+        for category, items in skills.items():
+            if category not in merged and isinstance(items, list):
+                merged[category] = items
+        resume["skills"] = dict(list(merged.items())[:SKILL_CATEGORIES])
+
+    coursework = response.get("coursework")
+    if isinstance(coursework, list):
+        existing = resume.get("coursework", [])
+        extra = [c for c in coursework if isinstance(c, str) and c not in existing]
+        resume["coursework"] = (existing + extra)[:COURSEWORK_ITEMS]
+
+    return resume
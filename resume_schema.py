@@ -0,0 +1,156 @@
+# ================= RESUME SCHEMA =================
+# Shape of the generated resume that doc_gen / preview consume. Sent to the
+# provider as a structured-output schema and compiled once into a validator.
+
+# Top-level keys of the generated resume, in the order the prompt lists them
+SECTION_ORDER = ["header", "summary", "education", "experience", "projects", "coursework", "skills"]
+
+_STRING = {"type": "string"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+
+RESUME_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "header": {
+            "type": "object",
+            "properties": {
+                "name": _STRING,
+                "phone": _STRING,
+                "email": _STRING,
+                "linkedin": _STRING,
+                "github": _STRING,
+            },
+            "required": ["name"],
+            "additionalProperties": False,
+        },
+        "summary": _STRING,
+        "education": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "degree": _STRING,
+                    "institution": _STRING,
+                    "grade": _STRING,
+                    "duration": _STRING,
+                },
+                "additionalProperties": False,
+            },
+        },
+        "experience": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "role": _STRING,
+                    "company": _STRING,
+                    "duration": _STRING,
+                    "bullets": _STRING_LIST,
+                },
+                "required": ["role", "bullets"],
+                "additionalProperties": False,
+            },
+        },
+        "projects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": _STRING,
+                    "bullets": _STRING_LIST,
+                },
+                "required": ["title", "bullets"],
+                "additionalProperties": False,
+            },
+        },
+        "coursework": _STRING_LIST,
+        "skills": {
+            "type": "object",
+            "additionalProperties": _STRING_LIST,
+        },
+    },
+    "required": ["header"],
+    "additionalProperties": False,
+}
+
+# OpenAI-compatible response_format payload (OpenRouter passes it through)
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "resume", "strict": False, "schema": RESUME_SCHEMA},
+}
+
+
+# ================= SCHEMA COMPILER =================
+_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "boolean": bool,
+    "number": (int, float),
+    "integer": int,
+    "null": type(None),
+}
+
+
+def compile_schema(schema):
+
+    # Turns the schema into nested closures once, so validating a resume is
+    # plain isinstance checks with no schema walking per call
+    expected = schema.get("type")
+    py_type = _TYPES.get(expected)
+
+    properties = {k: compile_schema(v) for k, v in schema.get("properties", {}).items()}
+    required = tuple(schema.get("required", ()))
+    extra = schema.get("additionalProperties", True)
+    extra_check = compile_schema(extra) if isinstance(extra, dict) else None
+    item_check = compile_schema(schema["items"]) if "items" in schema else None
+
+    def validate(value, path, errors):
+        if py_type is not None and (
+            not isinstance(value, py_type) or (expected in ("number", "integer") and isinstance(value, bool))
+        ):
+            errors.append((path, f"expected {expected}, got {type(value).__name__}"))
+            return
+
+        if isinstance(value, dict):
+            for key in required:
+                if key not in value:
+                    errors.append((path + (key,), "missing required key"))
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None:
+                    check(item, path + (key,), errors)
+                elif extra is False:
+                    errors.append((path + (key,), "unexpected key"))
+                elif extra_check is not None:
+                    extra_check(item, path + (key,), errors)
+
+        elif isinstance(value, list) and item_check is not None:
+            for i, item in enumerate(value):
+                item_check(item, path + (i,), errors)
+
+    return validate
+
+
+_validate = compile_schema(RESUME_SCHEMA)
+
+
+def validate_resume(resume):
+    # -> [(path_tuple, message), ...]; empty list means valid
+    errors = []
+    _validate(resume, (), errors)
+    return errors
+
+
+def invalid_sections(errors):
+    # Known top-level sections that need to be re-requested
+    return sorted(
+        {path[0] for path, _ in errors if path and path[0] in SECTION_ORDER},
+        key=SECTION_ORDER.index
+    )
+
+
+def format_errors(errors):
+    return "\n".join(
+        "/" + "/".join(str(p) for p in path) + f": {message}" for path, message in errors
+    )
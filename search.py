@@ -0,0 +1,142 @@
+import re
+import json
+
+# ================= PROFILE SEARCH =================
+# FTS5 index over saved profiles, kept in the store's SQLite file and written
+# inside the same transaction as each save. A JD is turned into an OR query
+# over its required skills and description terms and ranked with BM25, so
+# matching never loads or rescans stored payloads.
+#
+#   matches = match_profiles(get_store(), jd_payload, limit=10)
+
+INDEX_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS resume_fts USING fts5 (
+    skills, coursework, projects, experience,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS resume_fts_delete AFTER DELETE ON resumes BEGIN
+    DELETE FROM resume_fts WHERE rowid = old.id;
+END;
+"""
+
+# bm25() column weights, in INDEX_SCHEMA column order
+COLUMN_WEIGHTS = (3.0, 1.0, 1.5, 1.0)
+
+MAX_QUERY_TERMS = 64
+
+_TERM = re.compile(r"[A-Za-z0-9][A-Za-z0-9+#]*(?:[.\-][A-Za-z0-9+#]+)*")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of", "on",
+    "or", "our", "the", "to", "we", "will", "with", "you", "your", "this", "that", "have", "has",
+    "who", "can", "able", "work", "working", "experience", "years", "strong", "good", "knowledge",
+    "role", "team", "etc",
+}
+
+
+# ================= INDEXING =================
+def index_document(payload):
+
+    # Payload (Save button format) -> one text per indexed column
+    def join(values):
+        return "\n".join(v for v in values if isinstance(v, str) and v.strip())
+
+    projects = payload.get("projects", [])
+    experience = payload.get("experience", [])
+
+    return (
+        join(payload.get("skills", [])),
+        join(payload.get("coursework", [])),
+        join(v for p in projects if isinstance(p, dict) for v in (p.get("name"), p.get("desc"))),
+        join(v for e in experience if isinstance(e, dict) for v in (e.get("role"), e.get("company"), e.get("desc"))),
+    )
+
+
+def index_resume(conn, resume_id, payload):
+    conn.execute("DELETE FROM resume_fts WHERE rowid = ?", (resume_id,))
+    conn.execute(
+        "INSERT INTO resume_fts (rowid, skills, coursework, projects, experience) VALUES (?, ?, ?, ?, ?)",
+        (resume_id, *index_document(payload)),
+    )
+
+
+def attach_index(store):
+
+    # Creates the index, backfills rows saved before it existed, and hooks
+    # every future save
+    conn = store.conn()
+    conn.executescript(INDEX_SCHEMA)
+
+    missing = conn.execute(
+        "SELECT id, payload FROM resumes WHERE id NOT IN (SELECT rowid FROM resume_fts)"
+    ).fetchall()
+    if missing:
+        with store.transaction() as conn:
+            for row in missing:
+                index_resume(conn, row["id"], json.loads(row["payload"]))
+
+    store.add_save_hook(index_resume)
+    return store
+
+
+# ================= QUERYING =================
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_query(jd):
+
+    # Required skills become phrases ("machine learning"); the title and
+    # description contribute single terms. A profile must share at least one
+    # required skill to be a candidate, and skill phrases appear in both
+    # groups, which also weights them above description terms in BM25.
+    seen = set()
+
+    def collect(terms, candidates, limit):
+        for term in candidates:
+            key = term.lower()
+            if key not in seen and key not in STOPWORDS and len(terms) < limit:
+                seen.add(key)
+                terms.append(term)
+        return terms
+
+    phrases = [" ".join(_TERM.findall(p)) for p in re.split(r"[,;\n/|]+", jd.get("skills_required", "") or "")]
+    skill_terms = collect([], [p for p in phrases if p], MAX_QUERY_TERMS // 2)
+
+    # Words of multi-word skills and the free text only affect ranking
+    words = [w for p in phrases for w in p.split(" ") if " " in p]
+    text = f"{jd.get('job_title', '') or ''} {jd.get('description', '') or ''}"
+    words += [w for w in _TERM.findall(text) if len(w) > 1]
+    rank_terms = collect([], words, MAX_QUERY_TERMS - len(skill_terms))
+
+    skills = " OR ".join(_quote(t) for t in skill_terms)
+    everything = " OR ".join(_quote(t) for t in skill_terms + rank_terms)
+
+    if skills and rank_terms:
+        return f"({skills}) AND ({everything})"
+    return everything
+
+
+def match_profiles(store, jd, limit=10, owner=None):
+
+    # -> [{"id", "name", "owner", "created_at", "score"}, ...], best first.
+    # score is -bm25, so higher means a better fit.
+    query = build_query(jd)
+    if not query:
+        return []
+
+    weights = ", ".join(str(w) for w in COLUMN_WEIGHTS)
+    params = [query]
+    owner_clause = ""
+    if owner:
+        owner_clause = "AND r.owner = ?"
+        params.append(owner.strip().lower())
+
+    rows = store.conn().execute(
+        f"SELECT r.id, r.name, r.owner, r.created_at, -bm25(resume_fts, {weights}) AS score "
+        f"FROM resume_fts JOIN resumes r ON r.id = resume_fts.rowid "
+        f"WHERE resume_fts MATCH ? {owner_clause} "
+        f"ORDER BY bm25(resume_fts, {weights}) LIMIT ?",
+        (*params, limit),
+    ).fetchall()
+
+    return [dict(r) for r in rows]
@@ -0,0 +1,175 @@
+import json
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# ================= SHARED RULES =================
+BULLET_RULES = """
+BULLET RULES (CRITICAL):
+- Each bullet ≤ 23 words
+- Force metric driven impact where possible
+- Start with strong technical action verbs
+- No weak phrases, no generic wording, no repetition of verbs
+- Aggressively align wording with Job Description keywords
+
+HIGHLIGHTING RULE:
+- Bold the most important technical keywords, JD-aligned skills and metrics like "15% accuracy"
+- Use markdown bold format: **keyword**
+- Do NOT bold entire sentence
+- Maximum 3 bold words per bullet
+"""
+
+OUTPUT_RULES = """
+OUTPUT RULES:
+- Return ONLY valid JSON with exactly the keys shown. No surrounding text, no markdown fences.
+- Do not return empty fields; omit keys if data unavailable.
+"""
+
+
+def _context(cleaned_resume, cleaned_jd, feedback, keys):
+    subset = {k: cleaned_resume[k] for k in keys if k in cleaned_resume}
+    return f"""
+==============================
+CANDIDATE DATA (JSON):
+{json.dumps(subset, indent=2)}
+
+JOB DESCRIPTION (JSON):
+{json.dumps(cleaned_jd, indent=2)}
+
+FEEDBACK FROM USER (if any):
+{feedback if feedback else "No additional feedback provided."}
+==============================
+"""
+
+
+# ================= SECTION PROMPTS =================
+def experience_prompt(cleaned_resume, cleaned_jd, feedback):
+    return f"""
+You are a senior ATS resume optimization engine. Rewrite ONLY the experience section.
+
+Return:
+{{"experience": [{{"role": "", "company": "", "duration": "", "bullets": []}}]}}
+
+- One entry per given job, in the given order. Do NOT fabricate employment.
+- duration is "start – end" from the data.
+- At least 2, at most 3 bullets per job.
+{BULLET_RULES}{OUTPUT_RULES}{_context(cleaned_resume, cleaned_jd, feedback, ["experience", "skills"])}"""
+
+
+def projects_prompt(cleaned_resume, cleaned_jd, feedback):
+    return f"""
+You are a senior ATS resume optimization engine. Rewrite ONLY the projects section.
+
+Return:
+{{"projects": [{{"title": "", "bullets": []}}]}}
+
+- Exactly 2 bullets per project.
+- If fewer than 3 projects are given, generate realistic, technically credible projects
+  aligned to the Job Description and the candidate's skills until there are 3.
+{BULLET_RULES}{OUTPUT_RULES}{_context(cleaned_resume, cleaned_jd, feedback, ["projects", "skills"])}"""
+
+
+def skills_prompt(cleaned_resume, cleaned_jd, feedback):
+    return f"""
+You are a senior ATS resume optimization engine. Write ONLY the skills and coursework sections.
+
+Return:
+{{"skills": {{"Category": []}}, "coursework": []}}
+
+- 5 skill categories, each a short list of concrete skills, prioritising JD skills.
+- 5 coursework entries relevant to the projects and Job Description.
+- Do not bold anything.
+{OUTPUT_RULES}{_context(cleaned_resume, cleaned_jd, feedback, ["skills", "coursework", "projects", "education"])}"""
+
+
+def summary_prompt(cleaned_jd, feedback, sections):
+    written = {k: sections[k] for k in ("experience", "projects", "skills") if k in sections}
+    return f"""
+You are a senior ATS resume optimization engine. Write ONLY the professional summary.
+
+Return:
+{{"summary": ""}}
+
+- 3 to 5 humanized, ATS friendly sentences aligned with the resume below and the Job Description.
+- Bold at most a few key JD-aligned skills using **keyword**.
+- No irrelevant info.
+{OUTPUT_RULES}
+==============================
+RESUME SECTIONS ALREADY WRITTEN (JSON):
+{json.dumps(written, indent=2)}
+
+JOB DESCRIPTION (JSON):
+{json.dumps(cleaned_jd, indent=2)}
+
+FEEDBACK FROM USER (if any):
+{feedback if feedback else "No additional feedback provided."}
+==============================
+"""
+
+
+# ================= LOCAL SECTIONS =================
+# Header and education are copied from the form, no model call needed
+def build_header(cleaned_resume):
+    contacts = cleaned_resume.get("contacts", {})
+    name = " ".join(
+        filter(None, [contacts.get("f_name"), contacts.get("m_name"), contacts.get("l_name")])
+    )
+
+    header = {
+        "name": name,
+        "phone": contacts.get("phone"),
+        "email": contacts.get("email"),
+        "linkedin": contacts.get("linked_in"),
+        "github": contacts.get("github"),
+    }
+    return {k: v for k, v in header.items() if v}
+
+
+def build_education(cleaned_resume):
+    education = []
+    for edu in cleaned_resume.get("education", []):
+        entry = {
+            "degree": edu.get("degree"),
+            "institution": edu.get("institute"),
+            "grade": edu.get("grade"),
+            "duration": " – ".join(filter(None, [edu.get("start"), edu.get("end")])),
+        }
+        education.append({k: v for k, v in entry.items() if v})
+    return education
+
+
+# ================= PARALLEL GENERATION =================
+GENERATED_SECTIONS = ("experience", "projects", "skills", "coursework")
+
+
+def generate_by_section(cleaned_resume, cleaned_jd, feedback, complete, max_workers=3):
+
+    # complete(prompt) -> parsed JSON dict; yields (section, value) as each lands
+    yield "header", build_header(cleaned_resume)
+
+    education = build_education(cleaned_resume)
+    if education:
+        yield "education", education
+
+    prompts = [
+        projects_prompt(cleaned_resume, cleaned_jd, feedback),
+        skills_prompt(cleaned_resume, cleaned_jd, feedback),
+    ]
+    if cleaned_resume.get("experience"):
+        prompts.append(experience_prompt(cleaned_resume, cleaned_jd, feedback))
+
+    sections = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Each worker runs in a copy of the caller's context, so token counts
+        # and spans land on the caller's metrics request
+        futures = [pool.submit(contextvars.copy_context().run, complete, prompt) for prompt in prompts]
+
+        for future in as_completed(futures):
+            for key, value in future.result().items():
+                if value and key in GENERATED_SECTIONS:
+                    sections[key] = value
+                    yield key, value
+
+    # Summary is conditioned on the finished sections, so it runs last
+    summary = complete(summary_prompt(cleaned_jd, feedback, sections)).get("summary")
+    if summary:
+        yield "summary", summary
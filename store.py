@@ -0,0 +1,276 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from metrics import span
+
+# ================= RESUME STORE =================
+# Saved profiles (the payload the Save button builds) live in one SQLite file
+# in WAL mode instead of one JSON file per save. History is a keyset-paginated
+# index scan, so opening it costs the same with ten rows or a million.
+#
+#   store = get_store()
+#   resume_id = store.save(payload, tags=["ml"])
+#   rows, cursor = store.list_resumes(limit=20)
+#   rows, cursor = store.list_resumes(limit=20, before=cursor)
+
+DB_DIR = "dB"
+STORE_PATH = os.getenv("RESUMEGENIE_STORE", os.path.join(DB_DIR, "resumes.sqlite3"))
+PAGE_SIZE = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id          INTEGER PRIMARY KEY,
+    owner       TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    source      TEXT,
+    payload     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resumes_created ON resumes (created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_resumes_owner ON resumes (owner, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_resumes_name ON resumes (name);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_resumes_source ON resumes (source) WHERE source IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS tags (
+    tag         TEXT NOT NULL,
+    resume_id   INTEGER NOT NULL REFERENCES resumes (id) ON DELETE CASCADE,
+    PRIMARY KEY (tag, resume_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_tags_resume ON tags (resume_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT
+);
+"""
+
+_LEGACY_TIMESTAMP = re.compile(r"_(\d{8}_\d{6})\.json$")
+
+
+def owner_of(payload):
+    # Email identifies a person across saves; name is the fallback
+    contacts = payload.get("contacts", {})
+    email = (contacts.get("email") or "").strip().lower()
+    return email or display_name(payload).lower()
+
+
+def display_name(payload):
+    contacts = payload.get("contacts", {})
+    parts = [contacts.get(k, "") for k in ("f_name", "m_name", "l_name")]
+    return " ".join(p.strip() for p in parts if p and p.strip()) or "User"
+
+
+def normalize_tags(tags):
+    return sorted({t.strip().lower() for t in tags or () if t and t.strip()})
+
+
+class ResumeStore:
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._save_hooks = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self.conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    # ---------- connections ----------
+    def conn(self):
+        # One connection per thread (Streamlit runs each session on its own);
+        # WAL lets readers proceed while a save commits
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def transaction(self):
+        return _Transaction(self.conn())
+
+    def add_save_hook(self, hook):
+        # hook(conn, resume_id, payload) runs inside the save transaction, so
+        # derived tables (e.g. the search index) commit or roll back with it
+        self._save_hooks.append(hook)
+
+    # ---------- writes ----------
+    def save(self, payload, tags=(), created_at=None, source=None):
+
+        # -> new resume id; row, tags and hooks commit atomically
+        with span("save"), self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO resumes (owner, name, created_at, source, payload) VALUES (?, ?, ?, ?, ?)",
+                (
+                    owner_of(payload),
+                    display_name(payload),
+                    created_at if created_at is not None else time.time(),
+                    source,
+                    json.dumps(payload, ensure_ascii=False),
+                ),
+            )
+            resume_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT OR IGNORE INTO tags (tag, resume_id) VALUES (?, ?)",
+                [(tag, resume_id) for tag in normalize_tags(tags)],
+            )
+            for hook in self._save_hooks:
+                hook(conn, resume_id, payload)
+
+        return resume_id
+
+    def set_tags(self, resume_id, tags):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM tags WHERE resume_id = ?", (resume_id,))
+            conn.executemany(
+                "INSERT INTO tags (tag, resume_id) VALUES (?, ?)",
+                [(tag, resume_id) for tag in normalize_tags(tags)],
+            )
+
+    def delete(self, resume_id):
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+
+    # ---------- reads ----------
+    def get(self, resume_id):
+
+        row = self.conn().execute(
+            "SELECT id, owner, name, created_at, payload FROM resumes WHERE id = ?", (resume_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        record = dict(row)
+        record["payload"] = json.loads(record["payload"])
+        record["tags"] = self.tags_for(resume_id)
+        return record
+
+    def tags_for(self, resume_id):
+        rows = self.conn().execute("SELECT tag FROM tags WHERE resume_id = ? ORDER BY tag", (resume_id,))
+        return [r["tag"] for r in rows]
+
+    def list_resumes(self, limit=PAGE_SIZE, before=None, owner=None, tag=None):
+
+        # Keyset pagination on (created_at, id): each page is an index range
+        # scan, no OFFSET. Returns (rows, cursor for the next page or None).
+        clauses, params = [], []
+        if owner:
+            clauses.append("r.owner = ?")
+            params.append(owner.strip().lower())
+        if tag:
+            clauses.append("r.id IN (SELECT resume_id FROM tags WHERE tag = ?)")
+            params.append(tag.strip().lower())
+        if before:
+            clauses.append("(r.created_at, r.id) < (?, ?)")
+            params.extend(before)
+
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        rows = self.conn().execute(
+            f"SELECT r.id, r.owner, r.name, r.created_at FROM resumes r {where} "
+            f"ORDER BY r.created_at DESC, r.id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+
+        page = [dict(r) for r in rows[:limit]]
+        cursor = (page[-1]["created_at"], page[-1]["id"]) if len(rows) > limit else None
+        return page, cursor
+
+    def all_tags(self):
+        return [r["tag"] for r in self.conn().execute("SELECT DISTINCT tag FROM tags ORDER BY tag")]
+
+    # ---------- legacy import ----------
+    def import_legacy(self, directory=DB_DIR):
+
+        # One row per dB/*.json, keyed by filename so re-running is a no-op.
+        # Returns the number of files imported.
+        try:
+            names = sorted(n for n in os.listdir(directory) if n.endswith(".json"))
+        except OSError:
+            return 0
+
+        imported = 0
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    payload = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if not isinstance(payload, dict):
+                continue
+
+            match = _LEGACY_TIMESTAMP.search(name)
+            if match:
+                created_at = datetime.strptime(match.group(1), "%Y%m%d_%H%M%S").timestamp()
+            else:
+                created_at = os.path.getmtime(path)
+
+            exists = self.conn().execute("SELECT 1 FROM resumes WHERE source = ?", (name,)).fetchone()
+            if exists is None:
+                self.save(payload, tags=["imported"], created_at=created_at, source=name)
+                imported += 1
+
+        with self.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_import', ?)", (str(time.time()),))
+
+        return imported
+
+    def import_legacy_once(self, directory=DB_DIR):
+        done = self.conn().execute("SELECT 1 FROM meta WHERE key = 'legacy_import'").fetchone()
+        return 0 if done else self.import_legacy(directory)
+
+
+class _Transaction:
+
+    # BEGIN IMMEDIATE takes the write lock up front, so two concurrent saves
+    # queue on busy_timeout instead of failing mid-transaction
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+# ================= SHARED STORE =================
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+
+    # Opened on first use with the profile search index attached; the first
+    # open also pulls in any legacy dB/*.json
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                from search import attach_index
+
+                store = attach_index(ResumeStore())
+                store.import_legacy_once()
+                _store = store
+
+    return _store
+
+
+if __name__ == "__main__":
+    # python store.py [directory]  ->  (re-)import legacy JSON files
+    import sys
+    count = ResumeStore().import_legacy(sys.argv[1] if len(sys.argv) > 1 else DB_DIR)
+    print(f"Imported {count} resume(s) into {STORE_PATH}")
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import httpx
+import openai
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm
+import upstream
+from metrics import request
+
+# Two bullets with the same leading verb: only the model fix-up can resolve it
+RESUME = {"experience": [{"role": "Engineer", "bullets": ["Built a search service.", "Built a billing API."]}]}
+
+ERRORS = [
+    upstream.UpstreamError("All attempts failed"),
+    openai.APIConnectionError(request=httpx.Request("POST", "http://localhost/chat/completions")),
+    ValueError("unparseable"),
+]
+
+
+@pytest.mark.parametrize("error", ERRORS, ids=lambda e: type(e).__name__)
+def test_failed_fixup_keeps_generated_text(monkeypatch, error):
+    def failing(prompt, kind=None):
+        raise error
+
+    monkeypatch.setattr(llm, "complete_json", failing)
+
+    with request("test") as ctx:
+        fixed, changed = llm.enforce_rules(RESUME, {})
+
+    assert fixed == RESUME
+    assert changed == []
+    assert ctx.fields["rule_score"] == ctx.fields["rule_score_fixed"]
+    assert [f["fallback"] for f in ctx.fields["fallbacks"]] == ["rule_fixup"]
+
+
+@pytest.mark.parametrize("answer", [["Led a search service."], "Led a search service.", {"bullets": ["x"]}])
+def test_malformed_fixup_answer_keeps_generated_text(monkeypatch, answer):
+    monkeypatch.setattr(llm, "complete_json", lambda prompt, kind=None: answer)
+
+    fixed, changed = llm.enforce_rules(RESUME, {})
+
+    assert fixed == RESUME
+    assert changed == []
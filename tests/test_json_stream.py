@@ -0,0 +1,67 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm
+from json_stream import SectionStreamParser
+
+NEAR_VALID = '{"header": {"name": "A B", "email": "a@b.c",}, "summary": "Hi"}'
+
+
+def chunks(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_parser_stops_on_invalid_section_instead_of_raising():
+    parser = SectionStreamParser()
+    emitted = []
+    for chunk in chunks(NEAR_VALID):
+        emitted += parser.feed(chunk)
+
+    assert emitted == []
+    assert parser.failed
+    assert not parser.done
+
+
+def test_parser_keeps_sections_emitted_before_the_failure():
+    parser = SectionStreamParser()
+    emitted = []
+    for chunk in chunks('{"summary": "Hi", "header": {"name": "A",}}'):
+        emitted += parser.feed(chunk)
+
+    assert emitted == [("summary", "Hi")]
+    assert parser.failed
+
+
+def test_stream_sections_falls_back_to_repair(monkeypatch):
+    def fake_stream(prompt, stream=False):
+        for text in chunks(NEAR_VALID):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    monkeypatch.setattr(llm, "request_resume", fake_stream)
+    monkeypatch.setattr(llm, "finalize_resume", lambda resume, *args: (resume, []))
+
+    sections = dict(llm._stream_sections("prompt", {}, {}, None, None))
+
+    assert sections == {"header": {"name": "A B", "email": "a@b.c"}, "summary": "Hi"}
+
+
+def test_stream_result_is_the_finalized_resume(monkeypatch):
+    raw = '{"header": {"name": "A B"}, "summary": "Hi", "extra": "junk", "experience": "oops"}'
+
+    def fake_stream(prompt, stream=False):
+        for text in chunks(raw):
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    monkeypatch.setattr(llm, "request_resume", fake_stream)
+    monkeypatch.setattr(llm, "complete_json", lambda prompt, kind=None: {})
+
+    events = []
+    result = llm.drain(llm._stream_sections("prompt", {}, {}, None, None), lambda k, v: events.append(k))
+
+    assert "extra" in events and "experience" in events
+    assert "extra" not in result
+    assert "experience" not in result
+    assert result["summary"] == "Hi"
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm
+
+RESUME = {"header": {"name": "A B"}, "summary": "Hi", "experience": ["oops"]}
+
+
+@pytest.mark.parametrize("answer", [{"experience": ["still oops"]}, ["not", "an", "object"]], ids=["invalid", "list"])
+def test_unrepairable_sections_are_dropped(monkeypatch, answer):
+    monkeypatch.setattr(llm, "complete_json", lambda prompt, kind=None: answer)
+
+    result, changed = llm.finalize_resume(RESUME, {}, {}, None)
+
+    assert "experience" not in result
+    assert result["summary"] == "Hi"
+    assert changed == ["experience"]
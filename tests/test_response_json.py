@@ -0,0 +1,36 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import llm
+from metrics import request
+
+
+def fake_client(content):
+    def create(**kwargs):
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], model=kwargs["model"], usage=None)
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def test_validated_response_is_parsed_once(monkeypatch):
+    calls = []
+    repair = llm.repair_json
+
+    def counting_repair(raw):
+        calls.append(raw)
+        return repair(raw)
+
+    monkeypatch.setattr(llm, "repair_json", counting_repair)
+    monkeypatch.setattr(llm, "get_client", lambda: fake_client('{"patch": [],}'))
+
+    with request("test") as ctx:
+        result = llm.complete_json("prompt")
+
+    assert result == {"patch": []}
+    assert len(calls) == 1
+    assert "parse_json" in ctx.stages
+    assert ctx.fields["json_repairs"]
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import upstream
+
+
+@pytest.fixture(autouse=True)
+def chain(monkeypatch):
+    monkeypatch.setattr(upstream, "MODEL_CHAIN", ["primary", "fallback"])
+    monkeypatch.setattr(upstream, "HEDGE", False)
+    monkeypatch.setattr(upstream, "BACKOFF_BASE", 0.001)
+    monkeypatch.setattr(upstream, "_health", {})
+
+
+def test_rejected_answers_do_not_open_the_breaker(monkeypatch):
+    monkeypatch.setattr(upstream, "MAX_RETRIES", upstream.BREAKER_FAILURES * 2)
+    answers = iter(range(10))
+
+    def validate(answer):
+        if answer < upstream.BREAKER_FAILURES * 2:
+            raise ValueError("unparseable")
+
+    assert upstream.call(lambda **kwargs: next(answers), {"model": "primary"}, validate) == upstream.BREAKER_FAILURES * 2
+    assert {h["state"] for h in upstream.health_snapshot().values()} == {"closed"}
+
+
+def test_client_error_names_the_model_that_raised_it(monkeypatch):
+    class BadRequest(Exception):
+        status_code = 400
+
+    upstream.health("primary").opened_at = 0.0       # open: the call goes to the fallback
+    upstream.health("primary").probing = True
+
+    def create(model, **kwargs):
+        raise BadRequest(model)
+
+    with pytest.raises(BadRequest) as raised:
+        upstream.call(create, {"model": "primary"})
+    assert raised.value.model == "fallback"
+
+
+def test_structured_output_is_disabled_for_the_model_that_rejected_it(monkeypatch):
+    import httpx
+    import openai
+    import llm
+
+    def create_completion(**kwargs):
+        if "response_format" in kwargs:
+            response = httpx.Response(400, request=httpx.Request("POST", "http://localhost/chat/completions"))
+            error = openai.BadRequestError("response_format unsupported", response=response, body=None)
+            error.model = "fallback"
+            raise error
+        return "plain"
+
+    monkeypatch.setattr(llm, "create_completion", create_completion)
+    monkeypatch.setattr(llm, "_no_structured_output", set())
+    monkeypatch.setattr(llm.router, "choose", lambda kind: "primary")
+
+    assert llm.request_resume("prompt") == "plain"
+    assert llm._no_structured_output == {"fallback"}
@@ -0,0 +1,284 @@
+import os
+import time
+import random
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from metrics import record_upstream_failure, record_rejected_response
+
+# ================= UPSTREAM CALLS =================
+# Every model request goes through call(): a configurable model chain with a
+# per-attempt timeout, an overall deadline, retries with exponential backoff
+# and full jitter, one hedged request to the next model once the primary has
+# been slower than its own p95, and a per-model circuit breaker so a failing
+# model is skipped instead of retried on every request.
+#
+#   response = call(client.chat.completions.create, {"model": ..., "messages": ...})
+
+DEFAULT_CHAIN = "google/gemini-2.0-flash-001,openai/gpt-4o-mini"
+MODEL_CHAIN = [m.strip() for m in os.getenv("RESUMEGENIE_MODELS", DEFAULT_CHAIN).split(",") if m.strip()]
+
+ATTEMPT_TIMEOUT = float(os.getenv("RESUMEGENIE_ATTEMPT_TIMEOUT", "60"))   # seconds per request
+DEADLINE = float(os.getenv("RESUMEGENIE_DEADLINE", "120"))                # seconds for the whole call
+MAX_RETRIES = int(os.getenv("RESUMEGENIE_MAX_RETRIES", "4"))
+BACKOFF_BASE = 1.0       # seconds, doubled per retry
+BACKOFF_MAX = 30.0
+
+HEDGE = os.getenv("RESUMEGENIE_HEDGE", "1").lower() not in ("0", "false", "off")
+HEDGE_QUANTILE = 0.95
+HEDGE_MIN_SAMPLES = 20
+HEDGE_DEFAULT_DELAY = float(os.getenv("RESUMEGENIE_HEDGE_DELAY", "20"))   # until enough samples exist
+HEDGE_MIN_DELAY = 2.0
+
+BREAKER_FAILURES = 3     # consecutive failures that open the breaker
+BREAKER_COOLDOWN = 30.0  # seconds before a half-open probe is allowed
+
+# Client errors a different model or a retry won't fix
+NON_RETRYABLE = (400, 401, 403, 404, 422)
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="resumegenie-upstream")
+
+
+class UpstreamError(RuntimeError):
+    pass
+
+
+# ================= MODEL HEALTH =================
+class ModelHealth:
+
+    def __init__(self):
+        self.latencies = deque(maxlen=200)
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    def _cooled(self):
+        return not self.probing and time.monotonic() - self.opened_at >= BREAKER_COOLDOWN
+
+    def available(self):
+        # No side effects: safe for building chains and routing decisions
+        with self._lock:
+            return self.opened_at is None or self._cooled()
+
+    def allow(self):
+        # Call only when a request is actually sent to this model: after the
+        # cooldown it claims the single half-open probe slot
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._cooled():
+                self.probing = True
+                return True
+            return False
+
+    def release(self):
+        # The attempt ended without a verdict on the model (e.g. a 400)
+        with self._lock:
+            self.probing = False
+
+    def success(self, latency):
+        with self._lock:
+            self.latencies.append(latency)
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= BREAKER_FAILURES:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+    def quantile(self, q):
+        with self._lock:
+            if len(self.latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "state": "closed" if self.opened_at is None else ("half-open" if self.probing else "open"),
+                "consecutive_failures": self.failures,
+                "samples": len(self.latencies),
+            }
+
+
+_health = {}
+_health_lock = threading.Lock()
+
+
+def health(model):
+    with _health_lock:
+        if model not in _health:
+            _health[model] = ModelHealth()
+        return _health[model]
+
+
+def health_snapshot():
+    with _health_lock:
+        models = list(_health.items())
+    return {model: h.snapshot() for model, h in models}
+
+
+def model_chain(primary):
+    # Primary first, then the configured chain; models with an open breaker
+    # are skipped unless nothing else is left
+    chain = [primary] + [m for m in MODEL_CHAIN if m != primary]
+    healthy = [m for m in chain if health(m).available()]
+    return healthy or chain
+
+
+def hedge_delay(model):
+    p = health(model).quantile(HEDGE_QUANTILE)
+    return HEDGE_DEFAULT_DELAY if p is None else max(HEDGE_MIN_DELAY, p)
+
+
+def _retry_after(error):
+    # OpenRouter sends Retry-After (seconds) on most 429s
+    try:
+        return float(error.response.headers.get("retry-after"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def backoff(attempt, error=None):
+    # Exponential with full jitter; a server-provided Retry-After wins
+    hinted = _retry_after(error) if error is not None else None
+    if hinted is not None:
+        return hinted
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+# ================= ATTEMPTS =================
+class PeekedStream:
+
+    # A stream whose first chunk has already arrived (that's what a streaming
+    # attempt races on); iterating yields it again followed by the rest
+    def __init__(self, stream, first):
+        self.stream = stream
+        self.first = first
+
+    def __iter__(self):
+        if self.first is not None:
+            yield self.first
+        yield from self.stream
+
+    def close(self):
+        close = getattr(self.stream, "close", None)
+        if close:
+            close()
+
+
+def _attempt(create, kwargs, model, validate):
+    start = time.monotonic()
+    try:
+        response = create(**{**kwargs, "model": model, "timeout": ATTEMPT_TIMEOUT})
+        if kwargs.get("stream"):
+            response = PeekedStream(response, next(iter(response), None))
+    except Exception as e:
+        if getattr(e, "status_code", None) not in NON_RETRYABLE:
+            health(model).failure()
+        else:
+            health(model).release()
+        raise
+
+    if validate is not None and not kwargs.get("stream"):
+        # A rejected answer still means the model is up: counted on its own,
+        # kept out of the breaker; the call moves on like any failed attempt
+        try:
+            validate(response)
+        except Exception:
+            record_rejected_response(model)
+            health(model).release()
+            raise
+
+    health(model).success(time.monotonic() - start)
+    return response
+
+
+def _discard(future):
+    # Result of a hedge that lost the race: close streams, ignore the rest
+    if not future.cancelled() and future.exception() is None:
+        result = future.result()
+        if isinstance(result, PeekedStream):
+            result.close()
+
+
+def call(create, kwargs, validate=None):
+
+    # kwargs["model"] is the primary. validate(response) may raise to reject
+    # a response (e.g. unparseable JSON), which counts as a failed attempt.
+    chain = model_chain(kwargs["model"])
+    deadline = time.monotonic() + DEADLINE
+
+    pending = {}
+    launched = 0
+    failures = 0
+    last_error = None
+
+    def launch():
+        nonlocal launched
+        # Next model whose breaker lets this request through (claiming the
+        # half-open probe if due); if none does, the next one in turn anyway
+        for offset in range(len(chain)):
+            model = chain[(launched + offset) % len(chain)]
+            if health(model).allow():
+                launched += offset + 1
+                break
+        else:
+            model = chain[launched % len(chain)]
+            launched += 1
+        # Caller's context, so stages recorded by validate land on its request
+        run = contextvars.copy_context().run
+        pending[_executor.submit(run, _attempt, create, kwargs, model, validate)] = model
+
+    launch()
+    hedge_at = time.monotonic() + hedge_delay(chain[0]) if HEDGE and len(chain) > 1 else None
+    retry_at = None
+
+    try:
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                raise UpstreamError(f"No model answered within {DEADLINE:.0f}s (last error: {last_error})")
+
+            wake = min(t for t in (deadline, hedge_at, retry_at) if t is not None)
+            done, _ = wait(list(pending), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                model = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    if getattr(e, "status_code", None) in NON_RETRYABLE:
+                        # Could be a hedge or fallback, not the primary
+                        e.model = model
+                        raise
+                    record_upstream_failure(model, e)
+                    last_error = e
+                    failures += 1
+
+            now = time.monotonic()
+
+            if hedge_at is not None and now >= hedge_at:
+                # Primary is slower than its p95: race the next model
+                hedge_at = None
+                if pending:
+                    launch()
+
+            if not pending and retry_at is None:
+                if failures > MAX_RETRIES:
+                    raise UpstreamError(f"All attempts failed (last error: {last_error})") from last_error
+                retry_at = now + backoff(failures - 1, last_error)
+
+            if retry_at is not None and now >= retry_at:
+                retry_at = None
+                launch()
+    finally:
+        for future in pending:
+            future.add_done_callback(_discard)
@@ -0,0 +1,164 @@
+import json
+import time
+import threading
+from llm_cache import make_cache_key
+from store import get_store, owner_of
+
+# ================= GENERATION VERSIONS =================
+# Every generated or revised resume becomes a version row in the store's
+# SQLite file. Sections, the input payload and the JD are content-addressed
+# blobs (sha256 of canonical JSON), so a feedback round that only touches
+# "summary" adds one new blob and a version row; everything else is shared
+# with its parent. Restoring or re-downloading a version is a local read.
+#
+#   vid = get_versions().record(resume, payload, jd)
+#   vid2 = get_versions().record(revised, payload, jd, feedback="shorter", parent_id=vid)
+#   get_versions().load(vid)["resume"]
+
+VERSION_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    hash        TEXT PRIMARY KEY,
+    body        TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS versions (
+    id          INTEGER PRIMARY KEY,
+    parent_id   INTEGER REFERENCES versions (id),
+    owner       TEXT NOT NULL,
+    name        TEXT NOT NULL,
+    kind        TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    sections    TEXT NOT NULL,
+    payload     TEXT NOT NULL REFERENCES blobs (hash),
+    jd          TEXT NOT NULL REFERENCES blobs (hash),
+    feedback    TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_versions_owner ON versions (owner, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_versions_parent ON versions (parent_id);
+"""
+
+
+def _canonical(obj):
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+class VersionStore:
+
+    def __init__(self, store):
+        self.store = store
+        store.conn().executescript(VERSION_SCHEMA)
+
+    # ---------- blobs ----------
+    def put_blob(self, conn, obj):
+        digest = make_cache_key(obj)
+        conn.execute("INSERT OR IGNORE INTO blobs (hash, body) VALUES (?, ?)", (digest, _canonical(obj)))
+        return digest
+
+    def get_blobs(self, hashes):
+        hashes = list(set(hashes))
+        if not hashes:
+            return {}
+        rows = self.store.conn().execute(
+            f"SELECT hash, body FROM blobs WHERE hash IN ({','.join('?' * len(hashes))})", hashes
+        )
+        return {r["hash"]: json.loads(r["body"]) for r in rows}
+
+    # ---------- writes ----------
+    def record(self, resume, payload, jd, feedback=None, parent_id=None, kind=None):
+
+        # -> version id. Section order is kept in the manifest, so the resume
+        # comes back with the same key order it was generated with.
+        kind = kind or ("revise" if parent_id else "generate")
+        header = resume.get("header", {})
+
+        with self.store.transaction() as conn:
+            manifest = [[key, self.put_blob(conn, value)] for key, value in resume.items()]
+            cursor = conn.execute(
+                "INSERT INTO versions (parent_id, owner, name, kind, created_at, sections, payload, jd, feedback) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    parent_id,
+                    owner_of(payload),
+                    header.get("name") or "User",
+                    kind,
+                    time.time(),
+                    json.dumps(manifest),
+                    self.put_blob(conn, payload),
+                    self.put_blob(conn, jd),
+                    feedback or None,
+                ),
+            )
+            return cursor.lastrowid
+
+    # ---------- reads ----------
+    def load(self, version_id):
+
+        row = self.store.conn().execute("SELECT * FROM versions WHERE id = ?", (version_id,)).fetchone()
+        if row is None:
+            return None
+
+        manifest = json.loads(row["sections"])
+        blobs = self.get_blobs([h for _, h in manifest] + [row["payload"], row["jd"]])
+
+        version = dict(row)
+        version["resume"] = {key: blobs[h] for key, h in manifest}
+        version["payload"] = blobs[row["payload"]]
+        version["jd"] = blobs[row["jd"]]
+        del version["sections"]
+        return version
+
+    def lineage(self, version_id):
+
+        # Root first, ending at version_id: the chain of feedback rounds
+        rows = self.store.conn().execute(
+            """
+            WITH RECURSIVE chain (id, parent_id, depth) AS (
+                SELECT id, parent_id, 0 FROM versions WHERE id = ?
+                UNION ALL
+                SELECT v.id, v.parent_id, chain.depth + 1
+                FROM versions v JOIN chain ON v.id = chain.parent_id
+            )
+            SELECT v.id, v.parent_id, v.kind, v.name, v.created_at, v.feedback
+            FROM chain JOIN versions v ON v.id = chain.id
+            ORDER BY chain.depth DESC
+            """,
+            (version_id,),
+        )
+        return [dict(r) for r in rows]
+
+    def children(self, version_id):
+        rows = self.store.conn().execute(
+            "SELECT id, kind, name, created_at, feedback FROM versions WHERE parent_id = ? ORDER BY id", (version_id,)
+        )
+        return [dict(r) for r in rows]
+
+    def recent(self, owner=None, limit=20):
+        if owner:
+            rows = self.store.conn().execute(
+                "SELECT id, parent_id, kind, name, created_at, feedback FROM versions "
+                "WHERE owner = ? ORDER BY created_at DESC LIMIT ?",
+                (owner, limit),
+            )
+        else:
+            rows = self.store.conn().execute(
+                "SELECT id, parent_id, kind, name, created_at, feedback FROM versions "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (limit,),
+            )
+        return [dict(r) for r in rows]
+
+
+# ================= SHARED STORE =================
+_versions = None
+_versions_lock = threading.Lock()
+
+
+def get_versions():
+    global _versions
+
+    if _versions is None:
+        with _versions_lock:
+            if _versions is None:
+                _versions = VersionStore(get_store())
+
+    return _versions